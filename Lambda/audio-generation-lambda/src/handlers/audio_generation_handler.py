@@ -3,20 +3,22 @@ Audio Generation Lambda Handler
 Processes SQS messages to generate podcast audio using Google TTS
 Updated: 2025-10-27 - Added DeferrableError handling for smart retry
 """
+import atexit
+import concurrent.futures
 import json
+import logging
 import os
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 from shared.clients.supabase_client import SupabaseClient
 from shared.clients.s3_client import S3Client
 from shared.services.google_podcast_generator import GooglePodcastGenerator
-from shared.services.hebrew_niqqud import HebrewNiqqudProcessor
 from shared.services.episode_tracker import EpisodeTracker, ProcessingStage
 from shared.services.tts_client import DeferrableError
 from shared.services.audio_converter import AudioConverter
 from shared.utils.logging import get_logger
-from shared.utils.datetime_utils import now_utc, to_iso_utc
+from shared.utils.datetime_utils import now_utc, to_iso_utc, utc_file_timestamp
 from shared.utils.language_mapper import language_code_to_full
 
 logger = get_logger(__name__)
@@ -24,6 +26,11 @@ logger = get_logger(__name__)
 # Global handler instance for Lambda reuse
 handler_instance = None
 
+# Background pool for completion callbacks - results are only logged, so the
+# request path doesn't wait on them (drained before each invocation returns)
+_callback_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+atexit.register(_callback_executor.shutdown, wait=True)
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """AWS Lambda handler entry point"""
     global handler_instance
@@ -40,6 +47,7 @@ class AudioGenerationHandler:
         self.supabase_client = SupabaseClient()
         self.s3_client = S3Client()
         self.tracker = EpisodeTracker(self.supabase_client)
+        self._pending_callbacks: List[concurrent.futures.Future] = []
 
         # Get API keys from environment
         self.gemini_api_key = os.getenv('GEMINI_API_KEY')
@@ -53,7 +61,8 @@ class AudioGenerationHandler:
         Uses ReportBatchItemFailures pattern for partial batch success.
         Deferred episodes return to SQS for retry, successful ones are deleted.
         """
-        logger.info(f"[AUDIO_GEN] Lambda invoked with event: {json.dumps(event, default=str)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[AUDIO_GEN] Lambda invoked with event: %s", json.dumps(event, default=str))
 
         results = []
         batch_item_failures = []
@@ -66,10 +75,10 @@ class AudioGenerationHandler:
                 message_body = record.get('body', '{}')
                 message = json.loads(message_body)
 
-                logger.info(f"[AUDIO_GEN] Processing message {message_id}: {message}")
+                logger.info("[AUDIO_GEN] Processing message %s: %s", message_id, message)
 
                 if not self.should_process_for_audio(message):
-                    logger.info(f"[AUDIO_GEN] Message {message_id} not relevant for audio generation, skipping")
+                    logger.info("[AUDIO_GEN] Message %s not relevant for audio generation, skipping", message_id)
                     results.append({
                         'status': 'skipped',
                         'message_id': message_id,
@@ -84,10 +93,10 @@ class AudioGenerationHandler:
                 # If deferred, add to batch failures so SQS retries the message
                 if result.get('status') == 'deferred':
                     batch_item_failures.append({'itemIdentifier': message_id})
-                    logger.info(f"[AUDIO_GEN] Message {message_id} deferred - will return to SQS for retry")
+                    logger.info("[AUDIO_GEN] Message %s deferred - will return to SQS for retry", message_id)
 
             except Exception as e:
-                logger.error(f"[AUDIO_GEN] Error processing record: {str(e)}")
+                logger.error("[AUDIO_GEN] Error processing record: %s", e)
                 results.append({
                     'status': 'error',
                     'message_id': message_id,
@@ -96,8 +105,11 @@ class AudioGenerationHandler:
                 # Add to batch failures for retry
                 batch_item_failures.append({'itemIdentifier': message_id})
 
-        logger.info(f"[AUDIO_GEN] Processed {len(records)} messages, results: {results}")
-        logger.info(f"[AUDIO_GEN] Batch item failures (for retry): {len(batch_item_failures)} messages")
+        logger.info("[AUDIO_GEN] Processed %s messages, results: %s", len(records), results)
+        logger.info("[AUDIO_GEN] Batch item failures (for retry): %s messages", len(batch_item_failures))
+
+        # Make sure background callbacks finish before the container is frozen
+        self._drain_callbacks()
 
         # Return response with ReportBatchItemFailures pattern
         return {
@@ -110,13 +122,13 @@ class AudioGenerationHandler:
         podcast_id = message.get('podcast_id')
         
         if not episode_id or not podcast_id:
-            logger.debug(f"[AUDIO_GEN] Missing episode_id or podcast_id, skipping")
+            logger.debug("[AUDIO_GEN] Missing episode_id or podcast_id, skipping")
             return False
         
         try:
             episode = self.supabase_client.get_episode(episode_id)
             if not episode:
-                logger.debug(f"[AUDIO_GEN] Episode {episode_id} not found in database")
+                logger.debug("[AUDIO_GEN] Episode %s not found in database", episode_id)
                 return False
             
             episode_status = episode.get('status')
@@ -124,14 +136,14 @@ class AudioGenerationHandler:
 
             # Allow audio generation for episodes in script_ready or pending status without audio
             if episode_status in ('script_ready', 'pending') and not has_audio:
-                logger.info(f"[AUDIO_GEN] Episode {episode_id} is ready for audio generation (status: {episode_status})")
+                logger.info("[AUDIO_GEN] Episode %s is ready for audio generation (status: %s)", episode_id, episode_status)
                 return True
             else:
-                logger.debug(f"[AUDIO_GEN] Episode {episode_id} status: {episode_status}, has_audio: {bool(has_audio)}")
+                logger.debug("[AUDIO_GEN] Episode %s status: %s, has_audio: %s", episode_id, episode_status, bool(has_audio))
                 return False
                 
         except Exception as e:
-            logger.error(f"[AUDIO_GEN] Error checking episode status: {str(e)}")
+            logger.error("[AUDIO_GEN] Error checking episode status: %s", e)
             return False
 
     def process_audio_generation_request(self, message: Dict[str, Any], request_id: str, context: Any) -> Dict[str, Any]:
@@ -150,16 +162,16 @@ class AudioGenerationHandler:
             # Minimum: 480s + 60s setup + 60s buffer = 600s = 600000ms
             MIN_TIME_REQUIRED_MS = 600000  # 10 minutes minimum to start processing
 
-            logger.info(f"[AUDIO_GEN] [{request_id}] Remaining time: {remaining_time_ms}ms ({remaining_time_ms/1000:.0f}s)")
-            logger.info(f"[AUDIO_GEN] [{request_id}] Required minimum: {MIN_TIME_REQUIRED_MS}ms ({MIN_TIME_REQUIRED_MS/1000:.0f}s)")
+            logger.info("[AUDIO_GEN] [%s] Remaining time: %sms (%.0fs)", request_id, remaining_time_ms, remaining_time_ms / 1000)
+            logger.info("[AUDIO_GEN] [%s] Required minimum: %sms (%.0fs)", request_id, MIN_TIME_REQUIRED_MS, MIN_TIME_REQUIRED_MS / 1000)
 
             if remaining_time_ms < MIN_TIME_REQUIRED_MS:
                 error_msg = f"Insufficient time remaining to process episode ({remaining_time_ms/1000:.0f}s < {MIN_TIME_REQUIRED_MS/1000:.0f}s required). Deferring to prevent timeout."
-                logger.error(f"[AUDIO_GEN] [{request_id}] {error_msg}")
+                logger.error("[AUDIO_GEN] [%s] %s", request_id, error_msg)
                 # Use DeferrableError instead of TimeoutError so episode returns to script_ready
                 raise DeferrableError(error_msg)
 
-            logger.info(f"[AUDIO_GEN] [{request_id}] Processing audio generation for episode {episode_id}")
+            logger.info("[AUDIO_GEN] [%s] Processing audio generation for episode %s", request_id, episode_id)
 
             # Log start of audio processing stage
             self.tracker.log_stage_start(
@@ -198,19 +210,19 @@ class AudioGenerationHandler:
 
             # Validate and log podcast format
             if podcast_format not in ['single-speaker', 'multi-speaker']:
-                logger.warning(f"[AUDIO_GEN] [{request_id}] Invalid format '{podcast_format}', defaulting to 'multi-speaker'")
+                logger.warning("[AUDIO_GEN] [%s] Invalid format '%s', defaulting to 'multi-speaker'", request_id, podcast_format)
                 podcast_format = 'multi-speaker'
 
-            logger.info(f"[AUDIO_GEN] [{request_id}] Episode {episode_id} podcast_format: {podcast_format}")
+            logger.info("[AUDIO_GEN] [%s] Episode %s podcast_format: %s", request_id, episode_id, podcast_format)
 
-            logger.info(f"[AUDIO_GEN] [{request_id}] Reading pre-generated script from S3: {script_url}")
+            logger.info("[AUDIO_GEN] [%s] Reading pre-generated script from S3: %s", request_id, script_url)
             script = self.s3_client.read_from_url(script_url)
-            logger.info(f"[AUDIO_GEN] [{request_id}] Script loaded from S3: {len(script)} characters")
-            logger.info(f"[AUDIO_GEN] [{request_id}] Using dynamic_config with speaker2_role: {dynamic_config.get('speaker2_role')}")
+            logger.info("[AUDIO_GEN] [%s] Script loaded from S3: %s characters", request_id, len(script))
+            logger.info("[AUDIO_GEN] [%s] Using dynamic_config with speaker2_role: %s", request_id, dynamic_config.get('speaker2_role'))
 
             # Get language_code from dynamic_config (ISO code like 'he', 'en')
             language_code = dynamic_config.get('language_code', 'en')
-            logger.info(f"[AUDIO_GEN] [{request_id}] Using language_code: {language_code}")
+            logger.info("[AUDIO_GEN] [%s] Using language_code: %s", request_id, language_code)
 
             # Process Hebrew script with niqqud if needed
             processed_script, niqqud_script = self._process_hebrew_script(
@@ -222,11 +234,11 @@ class AudioGenerationHandler:
             # Need at least one full chunk timeout (480s) + safety buffer (60s)
             MIN_TIME_FOR_AUDIO_MS = 540000  # 9 minutes minimum for audio generation
 
-            logger.info(f"[AUDIO_GEN] [{request_id}] Before audio generation - remaining time: {remaining_time_ms/1000:.0f}s (required: {MIN_TIME_FOR_AUDIO_MS/1000:.0f}s)")
+            logger.info("[AUDIO_GEN] [%s] Before audio generation - remaining time: %.0fs (required: %.0fs)", request_id, remaining_time_ms / 1000, MIN_TIME_FOR_AUDIO_MS / 1000)
 
             if remaining_time_ms < MIN_TIME_FOR_AUDIO_MS:
                 error_msg = f"Insufficient time for audio generation ({remaining_time_ms/1000:.0f}s < {MIN_TIME_FOR_AUDIO_MS/1000:.0f}s required). Deferring to prevent timeout."
-                logger.error(f"[AUDIO_GEN] [{request_id}] {error_msg}")
+                logger.error("[AUDIO_GEN] [%s] %s", request_id, error_msg)
                 # Use DeferrableError instead of TimeoutError so episode returns to script_ready
                 raise DeferrableError(error_msg)
 
@@ -244,17 +256,16 @@ class AudioGenerationHandler:
             )
 
             # Convert WAV to MP3 for storage optimization
-            logger.info(f"[AUDIO_GEN] [{request_id}] Converting audio from WAV to MP3...")
+            logger.info("[AUDIO_GEN] [%s] Converting audio from WAV to MP3...", request_id)
             converter = AudioConverter(bitrate="128k")  # Standard quality (5-6 MB per 30 min)
 
             try:
                 mp3_audio_data, conversion_metadata = converter.wav_to_mp3(audio_data)
 
                 logger.info(
-                    f"[AUDIO_GEN] [{request_id}] Audio compression completed: "
-                    f"{conversion_metadata['original_size_mb']}MB → "
-                    f"{conversion_metadata['compressed_size_mb']}MB "
-                    f"({conversion_metadata['compression_ratio']}% reduction)"
+                    "[AUDIO_GEN] [%s] Audio compression completed: %sMB → %sMB (%s%% reduction)",
+                    request_id, conversion_metadata['original_size_mb'],
+                    conversion_metadata['compressed_size_mb'], conversion_metadata['compression_ratio']
                 )
 
                 # Upload MP3 to S3
@@ -268,8 +279,8 @@ class AudioGenerationHandler:
             except Exception as conversion_error:
                 # Fallback to WAV if conversion fails (don't fail the entire process)
                 logger.error(
-                    f"[AUDIO_GEN] [{request_id}] MP3 conversion failed: {str(conversion_error)}. "
-                    f"Falling back to WAV format."
+                    "[AUDIO_GEN] [%s] MP3 conversion failed: %s. Falling back to WAV format.",
+                    request_id, conversion_error
                 )
 
                 # Upload WAV as fallback
@@ -285,7 +296,7 @@ class AudioGenerationHandler:
                 duration, episode, audio_format
             )
 
-            logger.info(f"[AUDIO_GEN] [{request_id}] Successfully generated audio for episode {episode_id}")
+            logger.info("[AUDIO_GEN] [%s] Successfully generated audio for episode %s", request_id, episode_id)
 
             # Log successful completion of audio processing stage
             self.tracker.log_stage_complete(
@@ -316,8 +327,8 @@ class AudioGenerationHandler:
 
         except DeferrableError as de:
             # Timeout or rate limit - defer episode to script_ready for retry
-            logger.warning(f"[AUDIO_GEN] [{request_id}] DeferrableError: {str(de)}")
-            logger.info(f"[AUDIO_GEN] [{request_id}] Returning episode {episode_id} to script_ready for retry")
+            logger.warning("[AUDIO_GEN] [%s] DeferrableError: %s", request_id, de)
+            logger.info("[AUDIO_GEN] [%s] Returning episode %s to script_ready for retry", request_id, episode_id)
 
             if episode_id:
                 # Log deferral in processing logs
@@ -342,7 +353,7 @@ class AudioGenerationHandler:
             }
 
         except Exception as e:
-            logger.error(f"[AUDIO_GEN] [{request_id}] Error: {str(e)}")
+            logger.error("[AUDIO_GEN] [%s] Error: %s", request_id, e)
 
             # Log audio stage failure
             if episode_id:
@@ -370,7 +381,7 @@ class AudioGenerationHandler:
         if podcast_config_id:
             podcast_config = self.supabase_client.get_podcast_config_by_id(podcast_config_id)
             if not podcast_config:
-                logger.warning(f"[AUDIO_GEN] [{request_id}] Podcast config not found by ID {podcast_config_id}, trying podcast_id")
+                logger.warning("[AUDIO_GEN] [%s] Podcast config not found by ID %s, trying podcast_id", request_id, podcast_config_id)
 
         if not podcast_config and podcast_id:
             podcast_config = self.supabase_client.get_podcast_config(podcast_id)
@@ -398,10 +409,10 @@ class AudioGenerationHandler:
         """
         # Check if voices already exist
         if dynamic_config.get('speaker1_voice') and dynamic_config.get('speaker2_voice'):
-            logger.info(f"[AUDIO_GEN] [{request_id}] ✅ Voices already in config: speaker1={dynamic_config['speaker1_voice']}, speaker2={dynamic_config['speaker2_voice']}")
+            logger.info("[AUDIO_GEN] [%s] ✅ Voices already in config: speaker1=%s, speaker2=%s", request_id, dynamic_config['speaker1_voice'], dynamic_config['speaker2_voice'])
             return dynamic_config
 
-        logger.warning(f"[AUDIO_GEN] [{request_id}] ⚠️ Voices missing from dynamic_config! Attempting recovery for episode {episode_id}")
+        logger.warning("[AUDIO_GEN] [%s] ⚠️ Voices missing from dynamic_config! Attempting recovery for episode %s", request_id, episode_id)
 
         # Try to get from episode metadata in database
         episode = self.supabase_client.get_episode(episode_id)
@@ -414,14 +425,14 @@ class AudioGenerationHandler:
                 if metadata.get('speaker1_voice') and metadata.get('speaker2_voice'):
                     dynamic_config['speaker1_voice'] = metadata['speaker1_voice']
                     dynamic_config['speaker2_voice'] = metadata['speaker2_voice']
-                    logger.info(f"[AUDIO_GEN] [{request_id}] ✅ Recovered voices from episode metadata: speaker1={metadata['speaker1_voice']}, speaker2={metadata['speaker2_voice']}")
+                    logger.info("[AUDIO_GEN] [%s] ✅ Recovered voices from episode metadata: speaker1=%s, speaker2=%s", request_id, metadata['speaker1_voice'], metadata['speaker2_voice'])
                     return dynamic_config
             except Exception as e:
-                logger.warning(f"[AUDIO_GEN] [{request_id}] Failed to parse episode metadata: {str(e)}")
+                logger.warning("[AUDIO_GEN] [%s] Failed to parse episode metadata: %s", request_id, e)
 
         # If still missing, regenerate voices deterministically based on episode_id
         # This ensures the same episode always gets the same voices
-        logger.warning(f"[AUDIO_GEN] [{request_id}] Could not recover voices from metadata - regenerating deterministically")
+        logger.warning("[AUDIO_GEN] [%s] Could not recover voices from metadata - regenerating deterministically", request_id)
 
         from shared.services.voice_config import VoiceConfigManager
 
@@ -447,13 +458,13 @@ class AudioGenerationHandler:
 
         dynamic_config['speaker1_voice'] = speaker1_voice
         dynamic_config['speaker2_voice'] = speaker2_voice
-        logger.info(f"[AUDIO_GEN] [{request_id}] ✅ Regenerated voices deterministically: speaker1={speaker1_voice}, speaker2={speaker2_voice}, language={language_full}")
+        logger.info("[AUDIO_GEN] [%s] ✅ Regenerated voices deterministically: speaker1=%s, speaker2=%s, language=%s", request_id, speaker1_voice, speaker2_voice, language_full)
 
         return dynamic_config
 
     def _generate_audio(self, script: str, podcast_config: Dict[str, Any], request_id: str, episode_id: str = None, is_pre_processed: bool = False, podcast_format: str = 'multi-speaker', language_code: str = 'en') -> Tuple[bytes, float]:
         """Generate audio using Google Gemini TTS with pre-selected voices from script-preprocessor"""
-        logger.info(f"[AUDIO_GEN] Generating audio for episode {episode_id}")
+        logger.info("[AUDIO_GEN] Generating audio for episode %s", episode_id)
 
         generator = GooglePodcastGenerator()
 
@@ -468,11 +479,11 @@ class AudioGenerationHandler:
         speaker1_voice = podcast_config.get('speaker1_voice')
         speaker2_voice = podcast_config.get('speaker2_voice')
 
-        logger.info(f"[AUDIO_GEN] Language: {language_code} -> {language_full}")
-        logger.info(f"[AUDIO_GEN] Format: {podcast_format}")
-        logger.info(f"[AUDIO_GEN] Speakers: {speaker1_role} ({speaker1_gender}), {speaker2_role} ({speaker2_gender})")
-        logger.info(f"[AUDIO_GEN] Using pre-selected voices: {speaker1_role}={speaker1_voice}, {speaker2_role}={speaker2_voice}")
-        logger.info(f"[AUDIO_GEN] Using pre-processed script: {is_pre_processed}")
+        logger.info("[AUDIO_GEN] Language: %s -> %s", language_code, language_full)
+        logger.info("[AUDIO_GEN] Format: %s", podcast_format)
+        logger.info("[AUDIO_GEN] Speakers: %s (%s), %s (%s)", speaker1_role, speaker1_gender, speaker2_role, speaker2_gender)
+        logger.info("[AUDIO_GEN] Using pre-selected voices: %s=%s, %s=%s", speaker1_role, speaker1_voice, speaker2_role, speaker2_voice)
+        logger.info("[AUDIO_GEN] Using pre-processed script: %s", is_pre_processed)
 
         # Get content type from dynamic config (preprocessed by script-preprocessor)
         content_info = podcast_config.get('content_analysis', {})
@@ -494,7 +505,7 @@ class AudioGenerationHandler:
                 podcast_format=podcast_format
             )
         except Exception as e:
-            logger.error(f"[AUDIO_GEN] Audio generation failed: {str(e)}")
+            logger.error("[AUDIO_GEN] Audio generation failed: %s", e)
             raise
 
         return audio_data, duration
@@ -519,8 +530,16 @@ class AudioGenerationHandler:
             'audio_format': audio_format
         })
 
-        # Send completion callback to trigger immediate post-processing
-        self._send_completion_callback(episode_id, audio_url, duration)
+        # Send completion callback to trigger immediate post-processing (in background)
+        self._pending_callbacks.append(
+            _callback_executor.submit(self._send_completion_callback, episode_id, audio_url, duration)
+        )
+
+    def _drain_callbacks(self):
+        """Wait for in-flight completion callbacks submitted during this invocation"""
+        if self._pending_callbacks:
+            concurrent.futures.wait(self._pending_callbacks)
+            self._pending_callbacks.clear()
 
     def _process_hebrew_script(self, script: str, language: str, request_id: str) -> Tuple[str, Optional[str]]:
         """
@@ -536,31 +555,34 @@ class AudioGenerationHandler:
         """
         # Only process Hebrew text
         if language.lower() not in ['he', 'hebrew', 'heb', 'עברית']:
-            logger.info(f"[AUDIO_GEN] [{request_id}] Non-Hebrew language ({language}), skipping niqqud processing")
+            logger.info("[AUDIO_GEN] [%s] Non-Hebrew language (%s), skipping niqqud processing", request_id, language)
             return script, None
         
         try:
-            logger.info(f"[AUDIO_GEN] [{request_id}] Processing Hebrew script with niqqud")
+            logger.info("[AUDIO_GEN] [%s] Processing Hebrew script with niqqud", request_id)
             
+            # Imported lazily - only Hebrew episodes need the niqqud processor
+            from shared.services.hebrew_niqqud import HebrewNiqqudProcessor
+
             # Initialize niqqud processor
             niqqud_processor = HebrewNiqqudProcessor()
             
             # Check if text contains Hebrew characters
             if not niqqud_processor.is_hebrew_text(script):
-                logger.info(f"[AUDIO_GEN] [{request_id}] No Hebrew text detected, skipping niqqud processing")
+                logger.info("[AUDIO_GEN] [%s] No Hebrew text detected, skipping niqqud processing", request_id)
                 return script, None
             
             # Process the entire script with niqqud once
             niqqud_script = niqqud_processor.process_script_for_tts(script, language)
             
-            logger.info(f"[AUDIO_GEN] [{request_id}] Successfully processed Hebrew script with niqqud")
-            logger.info(f"[AUDIO_GEN] [{request_id}] Original: {len(script)} chars -> Niqqud: {len(niqqud_script)} chars")
+            logger.info("[AUDIO_GEN] [%s] Successfully processed Hebrew script with niqqud", request_id)
+            logger.info("[AUDIO_GEN] [%s] Original: %s chars -> Niqqud: %s chars", request_id, len(script), len(niqqud_script))
             
             return niqqud_script, niqqud_script
             
         except Exception as e:
-            logger.error(f"[AUDIO_GEN] [{request_id}] Error processing Hebrew script: {str(e)}")
-            logger.info(f"[AUDIO_GEN] [{request_id}] Falling back to original script")
+            logger.error("[AUDIO_GEN] [%s] Error processing Hebrew script: %s", request_id, e)
+            logger.info("[AUDIO_GEN] [%s] Falling back to original script", request_id)
             return script, None
 
     def _upload_script_as_transcript(self, episode_id: str, podcast_id: str, original_script: str, 
@@ -568,33 +590,32 @@ class AudioGenerationHandler:
         """Upload both original and niqqud scripts as transcript files to S3"""
         try:
             # Create timestamp for filenames
-            timestamp = now_utc().strftime('%Y%m%d_%H%M%S')
-            
-            # Upload original script as transcript
-            original_filename = f"transcript_{timestamp}.txt"
-            original_url = self.s3_client.upload_transcript(
-                original_script, podcast_id, episode_id, original_filename
-            )
+            timestamp = utc_file_timestamp()
             
-            if original_url:
-                logger.info(f"[AUDIO_GEN] [{request_id}] Successfully uploaded original transcript: {original_url}")
-            else:
-                logger.warning(f"[AUDIO_GEN] [{request_id}] Failed to upload original transcript")
-            
-            # Upload niqqud script if available
+            # Original script always, niqqud script if available
+            transcripts = {'original': (original_script, f"transcript_{timestamp}.txt")}
             if niqqud_script and language.lower() in ['he', 'hebrew', 'heb', 'עברית']:
-                niqqud_filename = f"transcript_niqqud_{timestamp}.txt"
-                niqqud_url = self.s3_client.upload_transcript(
-                    niqqud_script, podcast_id, episode_id, niqqud_filename
-                )
-                
-                if niqqud_url:
-                    logger.info(f"[AUDIO_GEN] [{request_id}] Successfully uploaded niqqud transcript: {niqqud_url}")
-                else:
-                    logger.warning(f"[AUDIO_GEN] [{request_id}] Failed to upload niqqud transcript")
+                transcripts['niqqud'] = (niqqud_script, f"transcript_niqqud_{timestamp}.txt")
+            
+            # Uploads are independent network calls - run them concurrently
+            # (the boto3 client inside S3Client is thread-safe)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(transcripts)) as executor:
+                futures = {
+                    executor.submit(
+                        self.s3_client.upload_transcript, content, podcast_id, episode_id, filename
+                    ): label
+                    for label, (content, filename) in transcripts.items()
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    label = futures[future]
+                    url = future.result()
+                    if url:
+                        logger.info("[AUDIO_GEN] [%s] Successfully uploaded %s transcript: %s", request_id, label, url)
+                    else:
+                        logger.warning("[AUDIO_GEN] [%s] Failed to upload %s transcript", request_id, label)
                 
         except Exception as e:
-            logger.warning(f"[AUDIO_GEN] [{request_id}] Error uploading transcripts: {str(e)}")
+            logger.warning("[AUDIO_GEN] [%s] Error uploading transcripts: %s", request_id, e)
             # Don't fail the entire process if transcript upload fails
 
     def _send_completion_callback(self, episode_id: str, audio_url: str, duration: float):
@@ -606,7 +627,7 @@ class AudioGenerationHandler:
             lambda_secret = os.getenv('LAMBDA_CALLBACK_SECRET')
             
             if not api_base_url or not lambda_secret:
-                logger.warning(f"[AUDIO_GEN] Missing callback configuration - API_BASE_URL: {bool(api_base_url)}, LAMBDA_CALLBACK_SECRET: {bool(lambda_secret)}")
+                logger.warning("[AUDIO_GEN] Missing callback configuration - API_BASE_URL: %s, LAMBDA_CALLBACK_SECRET: %s", bool(api_base_url), bool(lambda_secret))
                 return
             
             callback_url = f"{api_base_url}/api/episodes/{episode_id}/completed"
@@ -623,7 +644,7 @@ class AudioGenerationHandler:
                 'Content-Type': 'application/json'
             }
             
-            logger.info(f"[AUDIO_GEN] Sending completion callback for episode {episode_id} to {callback_url}")
+            logger.info("[AUDIO_GEN] Sending completion callback for episode %s to %s", episode_id, callback_url)
             
             response = requests.post(
                 callback_url,
@@ -633,12 +654,12 @@ class AudioGenerationHandler:
             )
             
             if response.status_code == 200:
-                logger.info(f"[AUDIO_GEN] Completion callback successful for episode {episode_id}")
+                logger.info("[AUDIO_GEN] Completion callback successful for episode %s", episode_id)
             else:
-                logger.warning(f"[AUDIO_GEN] Completion callback failed for episode {episode_id}: {response.status_code} - {response.text}")
+                logger.warning("[AUDIO_GEN] Completion callback failed for episode %s: %s - %s", episode_id, response.status_code, response.text)
                 
         except Exception as e:
-            logger.warning(f"[AUDIO_GEN] Failed to send completion callback for episode {episode_id}: {str(e)}")
+            logger.warning("[AUDIO_GEN] Failed to send completion callback for episode %s: %s", episode_id, e)
             # Don't fail the entire process if callback fails - episode is still completed
 
     def update_episode_status(self, episode_id: str, status: str, error_message: Optional[str] = None):
@@ -653,9 +674,9 @@ class AudioGenerationHandler:
                 })
             
             self.supabase_client.update_episode(episode_id, update_data)
-            logger.info(f"[AUDIO_GEN] Updated episode {episode_id} status to {status}")
+            logger.info("[AUDIO_GEN] Updated episode %s status to %s", episode_id, status)
             
         except Exception as e:
-            logger.error(f"[AUDIO_GEN] Failed to update episode status: {str(e)}")
+            logger.error("[AUDIO_GEN] Failed to update episode status: %s", e)
 
  
\ No newline at end of file
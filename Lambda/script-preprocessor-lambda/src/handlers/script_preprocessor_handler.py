@@ -11,8 +11,16 @@ Audio-Generation SQS queue so that the Audio Lambda can handle TTS only.
 
 import json
 import os
-from datetime import datetime
-from typing import Any, Dict, List
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import boto3
+import orjson
+from botocore.config import Config
 
 # Shared layer imports (common across lambdas)
 from shared.clients.supabase_client import SupabaseClient  # type: ignore
@@ -21,20 +29,49 @@ from shared.clients.telegram_data_client import TelegramDataClient  # type: igno
 from shared.services.voice_config import VoiceConfigManager  # type: ignore
 from shared.services.episode_tracker import EpisodeTracker, ProcessingStage  # type: ignore
 from shared.utils.logging import get_logger  # type: ignore
-from shared.utils.datetime_utils import now_utc  # type: ignore
+from shared.utils.datetime_utils import utc_file_timestamp  # type: ignore
 from shared.utils.language_mapper import language_code_to_full  # type: ignore
 
 # Lambda-specific services (unique to script-preprocessor)
+# (Gemini-backed services are imported on first use: google-genai is slow to load)
 from services.telegram_content_extractor import TelegramContentExtractor  # type: ignore
-from services.content_analyzer import ContentAnalyzer, ContentAnalysisResult  # type: ignore
-from services.gemini_script_generator import GeminiScriptGenerator  # type: ignore
 from services.script_validator import ScriptValidator  # type: ignore
 
+if TYPE_CHECKING:
+    from services.content_analyzer import ContentAnalyzer, ContentAnalysisResult  # type: ignore
+    from services.gemini_script_generator import GeminiScriptGenerator  # type: ignore
+
 logger = get_logger(__name__)
 
 # Global instance reuse ‑ Lambda container warm
 _handler_instance: "ScriptPreprocessorHandler | None" = None
 
+# How long a fetched podcast config is reused by a warm container, and how many are kept
+PODCAST_CONFIG_TTL_SECONDS = 300
+PODCAST_CONFIG_CACHE_SIZE = 256
+
+# Artefacts are machine-consumed; indent only when explicitly asked for
+JSON_DUMP_OPTIONS = orjson.OPT_NON_STR_KEYS | (
+    orjson.OPT_INDENT_2 if os.getenv("PODCASTO_PRETTY_JSON") else 0
+)
+
+# Gzip the script artefact on upload. Off by default: the web app reads
+# transcripts/ objects raw, so enable only once its readers handle gzip.
+GZIP_SCRIPT_ARTEFACT = os.getenv("PODCASTO_GZIP_SCRIPT", "false").lower() == "true"
+
+# Upper bound on SQS records processed in parallel (keeps Gemini request rate bounded)
+MAX_CONCURRENT_RECORDS = int(os.getenv("PREPROC_MAX_CONCURRENT_RECORDS", "4"))
+
+# Audio-queue client: pool covers concurrent records, adaptive retries absorb throttling
+SQS_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={"max_attempts": 3, "mode": "adaptive"}
+)
+
+# SendMessageBatch limits: 10 entries and 256 KiB of message bodies per call
+SQS_BATCH_MAX_ENTRIES = 10
+SQS_BATCH_MAX_BYTES = 256 * 1024
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:  # noqa: D401
     """AWS Lambda entry point (re-uses a singleton handler between invocations)."""
     global _handler_instance
@@ -53,53 +90,131 @@ class ScriptPreprocessorHandler:  # noqa: D101
         self.extractor = TelegramContentExtractor()
         self.voice_manager = VoiceConfigManager()
         self.tracker = EpisodeTracker(self.supabase_client)
+        # LRU of (cfg_id, podcast_id) -> (fetched_at, config); survives warm invocations
+        self._config_cache: OrderedDict[Tuple[str | None, str], Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._config_cache_lock = threading.Lock()
 
-        gemini_key = os.getenv("GEMINI_API_KEY")
-        if not gemini_key:
+        self._gemini_key = os.getenv("GEMINI_API_KEY")
+        if not self._gemini_key:
             raise ValueError("GEMINI_API_KEY environment variable is required")
-        self.content_analyzer = ContentAnalyzer(gemini_key)
-        self.script_generator = GeminiScriptGenerator()
 
         self.audio_queue_url = os.getenv("AUDIO_GENERATION_QUEUE_URL")
         if self.audio_queue_url:
-            import boto3
-
-            self.sqs_client = boto3.client("sqs")
+            self.sqs_client = boto3.client("sqs", config=SQS_CLIENT_CONFIG)
         else:
             self.sqs_client = None
             logger.warning("AUDIO_GENERATION_QUEUE_URL not defined – downstream message will be skipped")
 
+    # Gemini clients are built lazily so records that fail early (e.g. missing
+    # Telegram data) never pay for importing and initialising google-genai
+    @cached_property
+    def content_analyzer(self) -> ContentAnalyzer:
+        from services.content_analyzer import ContentAnalyzer  # type: ignore
+
+        return ContentAnalyzer(self._gemini_key, self.extractor)
+
+    @cached_property
+    def script_generator(self) -> GeminiScriptGenerator:
+        from services.gemini_script_generator import GeminiScriptGenerator  # type: ignore
+
+        return GeminiScriptGenerator()
+
+    @cached_property
+    def _record_executor(self) -> ThreadPoolExecutor:
+        # Created on the first multi-record batch and kept for warm invocations
+        return ThreadPoolExecutor(max_workers=MAX_CONCURRENT_RECORDS, thread_name_prefix="preproc-record")
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
     def handle(self, event: Dict[str, Any]) -> Dict[str, Any]:  # noqa: D401
-        results: List[Dict[str, Any]] = []
-        for record in event.get("Records", []):
-            episode_id = None
+        records = event.get("Records", [])
+        outcomes: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]
+        if len(records) <= 1:
+            outcomes = [self._safe_process(record) for record in records]
+        else:
+            # Records are independent episodes - process them concurrently. Resolve the lazy
+            # Gemini services first so worker threads never race to construct them.
+            _ = self.content_analyzer, self.script_generator
+            outcomes = list(self._record_executor.map(self._safe_process, records))
+
+        results = [result for result, _ in outcomes]
+        # Fan-out to Audio Lambda: one SendMessageBatch for the whole event
+        self._send_audio_messages(results, [audio_message for _, audio_message in outcomes])
+        return {"statusCode": 200, "body": json.dumps({"results": results})}
+
+    def _safe_process(self, record: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Process one SQS record, converting failures into an error result."""
+        episode_id = None
+        try:
+            message = json.loads(record.get("body", "{}"))
+            episode_id = message.get("episode_id")
+            res, audio_message = self._process(message)
+            return {"status": "success", **res}, audio_message
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("[PREPROC] Failed to process record: %s", exc)
+
+            # Log script stage failure
+            if episode_id:
+                self.tracker.log_stage_failure(
+                    episode_id,
+                    ProcessingStage.SCRIPT_PROCESSING,
+                    exc,
+                    {'context': 'Exception during script processing'}
+                )
+
+            return {"status": "error", "error": str(exc)}, None
+
+    def _send_audio_messages(self, results: List[Dict[str, Any]], messages: List[Optional[Dict[str, Any]]]) -> None:
+        """Send the audio-queue messages of successful records with SendMessageBatch.
+
+        Entries SQS rejects turn the matching record into an error result and log a
+        script stage failure, as a failed send_message used to.
+        """
+        if not self.audio_queue_url or not self.sqs_client:
+            return
+
+        batches: List[List[Dict[str, str]]] = []
+        batch_bytes = 0
+        for idx, message in enumerate(messages):
+            if message is None:
+                continue
+            body = json.dumps(message)
+            body_bytes = len(body.encode("utf-8"))
+            if not batches or len(batches[-1]) == SQS_BATCH_MAX_ENTRIES or batch_bytes + body_bytes > SQS_BATCH_MAX_BYTES:
+                batches.append([])
+                batch_bytes = 0
+            batches[-1].append({"Id": str(idx), "MessageBody": body})
+            batch_bytes += body_bytes
+
+        for entries in batches:
             try:
-                message = json.loads(record.get("body", "{}"))
-                episode_id = message.get("episode_id")
-                res = self._process(message)
-                results.append({"status": "success", **res})
+                response = self.sqs_client.send_message_batch(QueueUrl=self.audio_queue_url, Entries=entries)
+                failed = {entry["Id"]: entry.get("Message", entry.get("Code", "unknown error")) for entry in response.get("Failed", [])}
             except Exception as exc:  # noqa: BLE001
-                logger.exception("[PREPROC] Failed to process record: %s", exc)
-
-                # Log script stage failure
-                if episode_id:
-                    self.tracker.log_stage_failure(
-                        episode_id,
-                        ProcessingStage.SCRIPT_PROCESSING,
-                        exc,
-                        {'context': 'Exception during script processing'}
-                    )
-
-                results.append({"status": "error", "error": str(exc)})
-        return {"statusCode": 200, "body": json.dumps({"results": results})}
+                logger.exception("[PREPROC] SQS batch send to audio queue failed: %s", exc)
+                failed = {entry["Id"]: str(exc) for entry in entries}
+
+            for entry in entries:
+                idx = int(entry["Id"])
+                episode_id = messages[idx]["episode_id"]
+                if entry["Id"] not in failed:
+                    logger.info("[PREPROC] SQS message sent to audio queue for episode %s", episode_id)
+                    continue
+                error = f"Failed to queue audio generation: {failed[entry['Id']]}"
+                logger.error("[PREPROC] %s (episode %s)", error, episode_id)
+                self.tracker.log_stage_failure(
+                    episode_id,
+                    ProcessingStage.SCRIPT_PROCESSING,
+                    RuntimeError(error),
+                    {'context': 'Audio queue send failed'}
+                )
+                results[idx] = {"status": "error", "error": error}
 
     # ------------------------------------------------------------------
     # Core processing for single message
     # ------------------------------------------------------------------
-    def _process(self, msg: Dict[str, Any]) -> Dict[str, Any]:  # noqa: D401, C901
+    def _process(self, msg: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:  # noqa: D401, C901
         episode_id = msg.get("episode_id")
         podcast_id = msg.get("podcast_id")
         if not episode_id or not podcast_id:
@@ -118,18 +233,16 @@ class ScriptPreprocessorHandler:  # noqa: D101
         if not telegram_data:
             raise ValueError("Telegram data missing in S3")
 
+        # Extract once: the analysis prompt text is derived from the clean content
         clean_content = self.extractor.extract_clean_content(telegram_data)
-        analysis: ContentAnalysisResult = self.content_analyzer.analyze_content(telegram_data)
-
-        # NEW: Analyze topics and conversation structure
-        topic_analysis = self.content_analyzer.analyze_topics_and_structure(telegram_data)
+        content_text = self.extractor.content_text_from_clean(clean_content)
+        analysis: ContentAnalysisResult
+        analysis, topic_analysis = self.content_analyzer.analyze_all(
+            telegram_data, content_text, len(clean_content['messages'])
+        )
 
         analysis_dict = {
-            "content_type": analysis.content_type.value,
-            "specific_role": analysis.specific_role,
-            "role_description": analysis.role_description,
-            "confidence": analysis.confidence,
-            "reasoning": analysis.reasoning,
+            **analysis.to_dict(),
             "topics": topic_analysis.get('topics', []),
             "conversation_structure": topic_analysis.get('conversation_structure', 'linear'),
             "transition_style": topic_analysis.get('transition_style', 'natural')
@@ -179,7 +292,9 @@ class ScriptPreprocessorHandler:  # noqa: D101
         if validation_report.get('recommendations'):
             logger.warning(f"[PREPROC] Recommendations: {', '.join(validation_report['recommendations'])}")
 
-        artefacts = self._upload_artefacts(podcast_id, episode_id, clean_content, analysis_dict, script)
+        # Serialised once: uploaded as the analysis artefact and stored on the episode row
+        analysis_json = self._dump_json(analysis_dict)
+        artefacts = self._upload_artefacts(podcast_id, episode_id, clean_content, analysis_json, script)
 
         # Prepare metadata with voice information for recovery in audio-generation
         episode_metadata = {
@@ -193,41 +308,43 @@ class ScriptPreprocessorHandler:  # noqa: D101
             "podcast_format": podcast_format
         }
 
-        # Update DB state
-        self.supabase_client.update_episode(
-            episode_id,
-            {
-                "status": "script_ready",
-                "script_url": artefacts["script"],
-                "analysis": json.dumps(analysis_dict),
-                "metadata": json.dumps(episode_metadata),
-            },
-        )
-
-        # Fan-out to Audio Lambda
-        if self.audio_queue_url and self.sqs_client:
-            payload = {
-                "episode_id": episode_id,
-                "podcast_id": podcast_id,
-                "podcast_config_id": msg.get("podcast_config_id"),
-                "script_url": artefacts["script"],
-                "dynamic_config": dynamic_config,
-            }
-            self.sqs_client.send_message(QueueUrl=self.audio_queue_url, MessageBody=json.dumps(payload))
-            logger.info("[PREPROC] SQS message sent to audio queue for episode %s", episode_id)
-
-        # Log successful completion of script processing stage
-        self.tracker.log_stage_complete(
-            episode_id,
-            ProcessingStage.SCRIPT_PROCESSING,
-            {
-                'script_chars': len(script),
-                'script_url': artefacts["script"],
-                'validation_score': validation_report.get('quality_score')
-            }
-        )
+        # Update DB state and log completion of the script stage concurrently (independent
+        # writes). Both must land before the fan-out: the Audio Lambda requires status
+        # script_ready and advances current_stage itself.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            update_future = executor.submit(
+                self.supabase_client.update_episode,
+                episode_id,
+                {
+                    "status": "script_ready",
+                    "script_url": artefacts["script"],
+                    "analysis": analysis_json.decode("utf-8"),
+                    "metadata": json.dumps(episode_metadata),
+                },
+            )
+            log_future = executor.submit(
+                self.tracker.log_stage_complete,
+                episode_id,
+                ProcessingStage.SCRIPT_PROCESSING,
+                {
+                    'script_chars': len(script),
+                    'script_url': artefacts["script"],
+                    'validation_score': validation_report.get('quality_score')
+                }
+            )
+        update_future.result()
+        log_future.result()
+
+        # Audio Lambda message; handle() sends the messages of all records in one batch
+        audio_message = {
+            "episode_id": episode_id,
+            "podcast_id": podcast_id,
+            "podcast_config_id": msg.get("podcast_config_id"),
+            "script_url": artefacts["script"],
+            "dynamic_config": dynamic_config,
+        }
 
-        return {"episode_id": episode_id, "script_chars": len(script)}
+        return {"episode_id": episode_id, "script_chars": len(script)}, audio_message
 
     # ------------------------------------------------------------------
     # Helpers
@@ -237,23 +354,39 @@ class ScriptPreprocessorHandler:  # noqa: D101
         podcast_id: str,
         episode_id: str,
         clean_content: Dict[str, Any],
-        analysis_dict: Dict[str, Any],
+        analysis_json: bytes,
         script: str,
     ) -> Dict[str, str]:
-        ts = now_utc().strftime("%Y%m%d_%H%M%S")
-        artefacts: Dict[str, str] = {}
-        artefacts["clean_content"] = self._upload_json(podcast_id, episode_id, clean_content, f"clean_content_{ts}.json")
-        artefacts["analysis"] = self._upload_json(podcast_id, episode_id, analysis_dict, f"analysis_{ts}.json")
-        artefacts["script"] = self._upload_text(podcast_id, episode_id, script, f"script_{ts}.txt")
+        ts = utc_file_timestamp()
+        # Independent S3 PUTs - upload concurrently over the shared S3 client
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {
+                "clean_content": executor.submit(self._upload_json, podcast_id, episode_id, clean_content, f"clean_content_{ts}.json"),
+                "analysis": executor.submit(self.s3_client.upload_transcript, analysis_json, podcast_id, episode_id, f"analysis_{ts}.json"),
+                "script": executor.submit(self._upload_text, podcast_id, episode_id, script, f"script_{ts}.txt"),
+            }
+        artefacts: Dict[str, str] = {name: future.result() for name, future in futures.items()}
         return artefacts
 
+    @staticmethod
+    def _dump_json(obj: Dict[str, Any]) -> bytes:
+        # UTF-8 bytes go straight into the S3 PUT body without a str round trip
+        return orjson.dumps(obj, option=JSON_DUMP_OPTIONS)
+
     def _upload_json(self, pid: str, eid: str, obj: Dict[str, Any], fname: str) -> str:
-        return self.s3_client.upload_transcript(json.dumps(obj, ensure_ascii=False, indent=2), pid, eid, fname)
+        return self.s3_client.upload_transcript(self._dump_json(obj), pid, eid, fname)
 
     def _upload_text(self, pid: str, eid: str, text: str, fname: str) -> str:
-        return self.s3_client.upload_transcript(text, pid, eid, fname)
+        return self.s3_client.upload_transcript(text, pid, eid, fname, compress=GZIP_SCRIPT_ARTEFACT)
 
     def _get_podcast_config(self, cfg_id: str | None, podcast_id: str) -> Dict[str, Any]:
+        cache_key = (cfg_id, podcast_id)
+        with self._config_cache_lock:
+            cached = self._config_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < PODCAST_CONFIG_TTL_SECONDS:
+                self._config_cache.move_to_end(cache_key)
+                return cached[1]
+
         cfg = None
         if cfg_id:
             cfg = self.supabase_client.get_podcast_config_by_id(cfg_id)
@@ -261,6 +394,11 @@ class ScriptPreprocessorHandler:  # noqa: D101
             cfg = self.supabase_client.get_podcast_config(podcast_id)
         if not cfg:
             raise ValueError("Podcast configuration not found")
+        with self._config_cache_lock:
+            self._config_cache[cache_key] = (time.monotonic(), cfg)
+            self._config_cache.move_to_end(cache_key)
+            if len(self._config_cache) > PODCAST_CONFIG_CACHE_SIZE:
+                self._config_cache.popitem(last=False)
         return cfg
 
     def _apply_dynamic_role(self, cfg: Dict[str, Any], analysis: ContentAnalysisResult, episode_id: str, podcast_format: str = 'multi-speaker', language_code: str = 'en') -> Dict[str, Any]:
@@ -270,13 +408,7 @@ class ScriptPreprocessorHandler:  # noqa: D101
         if podcast_format == 'single-speaker':
             new_cfg["speaker2_role"] = None
             new_cfg["speaker2_gender"] = None
-            new_cfg["content_analysis"] = {
-                "content_type": analysis.content_type.value,
-                "specific_role": analysis.specific_role,
-                "role_description": analysis.role_description,
-                "confidence": analysis.confidence,
-                "reasoning": analysis.reasoning,
-            }
+            new_cfg["content_analysis"] = analysis.to_dict()
 
             # Select only speaker1 voice
             # Convert ISO language code to full name for voice manager
@@ -304,13 +436,7 @@ class ScriptPreprocessorHandler:  # noqa: D101
             # Multi-speaker: use dynamic role assignment
             new_cfg["speaker2_role"] = analysis.specific_role
             new_cfg["speaker2_gender"] = self.content_analyzer.get_gender_for_category(analysis.content_type)
-            new_cfg["content_analysis"] = {
-                "content_type": analysis.content_type.value,
-                "specific_role": analysis.specific_role,
-                "role_description": analysis.role_description,
-                "confidence": analysis.confidence,
-                "reasoning": analysis.reasoning,
-            }
+            new_cfg["content_analysis"] = analysis.to_dict()
 
             # Select voices once for the entire episode (ensures consistency across chunks)
             # Convert ISO language code to full name for voice manager
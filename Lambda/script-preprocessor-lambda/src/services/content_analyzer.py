@@ -5,19 +5,65 @@ Analyzes Telegram content and determines appropriate speaker roles
 using AI-powered content analysis with structured output.
 """
 
-import json
-from typing import Dict, Any
+import hashlib
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+import orjson
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
 
 from shared.utils.logging import get_logger
+from shared.utils.rate_limiter import parse_retry_delay
 from services.telegram_content_extractor import TelegramContentExtractor
 
 logger = get_logger(__name__)
 
+# Fixed-schema classification runs on the small/fast tier; script generation keeps its own model
+GEMINI_ANALYSIS_MODEL = os.environ.get('GEMINI_ANALYZER_MODEL', 'gemini-2.5-flash-lite')
+
+# Combined analyses kept per warm container, keyed by a hash of the prompt inputs
+ANALYSIS_CACHE_SIZE = 64
+
+# Transient Gemini errors (429/5xx/timeouts) are retried in-process with jittered
+# exponential backoff instead of failing the whole SQS record
+GEMINI_MAX_RETRIES = 3
+GEMINI_MAX_BACKOFF_SECONDS = 16
+# API errors are classified by their HTTP code / status; only transport errors (which
+# carry neither) fall back to matching the message
+_RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+_RETRYABLE_STATUSES = frozenset({"RESOURCE_EXHAUSTED", "INTERNAL", "UNAVAILABLE", "DEADLINE_EXCEEDED"})
+_TRANSPORT_TIMEOUT_MARKERS = ("timed out", "timeout")
+
+# Caps concurrent Gemini requests per container (records may be processed in parallel)
+_GEMINI_SEMAPHORE = threading.BoundedSemaphore(int(os.environ.get('GEMINI_MAX_CONCURRENCY', '4')))
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Gemini quota / rate-limit rejection (429 RESOURCE_EXHAUSTED)"""
+    return isinstance(error, genai_errors.APIError) and (
+        error.code == 429 or error.status == "RESOURCE_EXHAUSTED"
+    )
+
+
+def _is_retryable_gemini_error(error: Exception) -> bool:
+    """Transient Gemini failure: 429/5xx API errors, or a transport timeout"""
+    if isinstance(error, genai_errors.APIError):
+        return error.code in _RETRYABLE_STATUS_CODES or error.status in _RETRYABLE_STATUSES
+    if "timeout" in type(error).__name__.lower():
+        return True
+    error_str = str(error).lower()
+    return any(marker in error_str for marker in _TRANSPORT_TIMEOUT_MARKERS)
+
 
 class ContentType(str, Enum):
     """Content type categories for role selection"""
@@ -71,6 +117,210 @@ class ContentAnalysisResult:
     topics: list = None  # List[TopicInfo] - identified topics (optional)
     conversation_structure: str = None  # Suggested conversation flow (optional)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable summary of the classification (used in configs and DB rows)"""
+        return {
+            "content_type": self.content_type.value,
+            "specific_role": self.specific_role,
+            "role_description": self.role_description,
+            "confidence": self.confidence,
+            "reasoning": self.reasoning,
+        }
+
+
+# Structured-output schemas (the fused analysis uses the union of both)
+ANALYSIS_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "content_type": {
+            "type": "STRING",
+            "enum": [ct.value for ct in ContentType],
+            "description": "The primary category of the content"
+        },
+        "specific_role": {
+            "type": "STRING", 
+            "description": "Specific, creative role name that fits the content (e.g., 'AI Research Scientist', 'Crypto Market Analyst')"
+        },
+        "role_description": {
+            "type": "STRING",
+            "description": "Brief description of the role's expertise and background"
+        },
+        "confidence": {
+            "type": "NUMBER",
+            "description": "Confidence score for the classification (0.0-1.0)"
+        },
+        "reasoning": {
+            "type": "STRING",
+            "description": "Brief explanation of why this content type and role were selected"
+        }
+    },
+    "required": ["content_type", "specific_role", "role_description", "confidence", "reasoning"]
+}
+
+TOPIC_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "topics": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "topic_name": {
+                        "type": "STRING",
+                        "description": "Brief, catchy topic name (2-5 words)"
+                    },
+                    "importance": {
+                        "type": "STRING",
+                        "enum": ["high", "medium", "low"],
+                        "description": "How central is this topic to the content"
+                    },
+                    "suggested_duration": {
+                        "type": "STRING",
+                        "enum": ["brief", "moderate", "extended"],
+                        "description": "How much time to spend on this topic"
+                    }
+                },
+                "required": ["topic_name", "importance", "suggested_duration"]
+            }
+        },
+        "conversation_structure": {
+            "type": "STRING",
+            "enum": ["single_topic", "linear", "thematic_clusters", "narrative_arc"],
+            "description": "How to structure the conversation flow"
+        },
+        "transition_style": {
+            "type": "STRING",
+            "description": "Recommended style for transitions between topics"
+        }
+    },
+    "required": ["topics", "conversation_structure", "transition_style"]
+}
+
+COMBINED_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {**ANALYSIS_RESPONSE_SCHEMA["properties"], **TOPIC_RESPONSE_SCHEMA["properties"]},
+    "required": ANALYSIS_RESPONSE_SCHEMA["required"] + TOPIC_RESPONSE_SCHEMA["required"]
+}
+
+# Static instructions go first and the variable content last, so every request shares
+# one token prefix that Gemini can serve from its implicit prompt cache
+ANALYSIS_PROMPT_HEADER = """
+You are a content classification expert. Analyze the content given at the end and determine its primary category, then create a specific, engaging speaker role.
+
+AVAILABLE CATEGORIES:
+- news: Breaking news, current events, journalism
+- technology: Tech news, gadgets, software, AI, programming
+- finance: Financial markets, economy, investments, business finance
+- politics: Political news, elections, government, policy
+- sports: Sports news, games, athletes, competitions
+- health: Medical news, wellness, fitness, healthcare
+- science: Scientific discoveries, research, academic content
+- entertainment: Movies, TV, celebrities, music, arts
+- business: Corporate news, entrepreneurship, industry trends
+- education: Learning content, tutorials, academic topics
+- lifestyle: Personal development, travel, food, fashion
+- general: Mixed content or content that doesn't fit other categories
+
+ROLE CREATION GUIDELINES:
+After selecting the category, create a SPECIFIC role that matches the exact content:
+
+For TECHNOLOGY content:
+- Examples: "AI Research Scientist", "Cybersecurity Expert", "Mobile App Developer", "Cloud Computing Specialist"
+- Focus on the specific tech area discussed
+
+For NEWS content:
+- Examples: "Political Correspondent", "International Affairs Reporter", "Economic News Analyst"
+- Match the news domain
+
+For FINANCE content:
+- Examples: "Cryptocurrency Analyst", "Stock Market Expert", "Real Estate Investment Advisor"
+- Specify the financial area
+
+For other categories, follow similar patterns - be specific to the actual content discussed.
+
+INSTRUCTIONS:
+1. Select the primary category from the list above
+2. Create a specific, professional role name that precisely matches the content
+3. Write a brief role description explaining their expertise
+4. Provide confidence score based on how clear the categorization is
+5. Give reasoning for both category and role selection
+
+ROLE NAMING RULES:
+- Use professional, credible titles
+- Be specific to the content's focus area
+- Avoid generic terms when possible
+- Make it sound like a real expert you'd want to hear from
+- Consider Hebrew content context when relevant
+
+Consider the language and cultural context of the content when making your decisions.
+"""
+
+TOPIC_TASK_INSTRUCTIONS = """1. Identify 2-7 distinct topics (don't over-segment - group related items)
+2. Rate each topic's importance (high/medium/low)
+3. Suggest duration for each topic (brief/moderate/extended)
+4. Recommend conversation structure:
+   - single_topic: All content is about one main subject
+   - linear: Topics follow chronological or logical sequence
+   - thematic_clusters: Group related topics together
+   - narrative_arc: Build from intro to climax to conclusion
+5. Suggest transition style (how to move between topics naturally)
+
+GUIDELINES:
+- For NEWS content: Group by category (politics, economy, tech, etc.)
+- For TECH content: Group by product/company or technology area
+- For MIXED content: Find thematic connections
+- Prioritize natural conversation flow over strict categorization
+- Consider: Can these topics be woven together into a story?
+
+TRANSITION STYLE SUGGESTIONS:
+- "seamless" - Topics naturally flow into each other
+- "explicit" - Clear topic changes ("Moving on to...", "Another thing...")
+- "narrative" - Build a story connecting the topics
+- "contrast" - Highlight differences between topics for interest
+"""
+
+# Static part of the fused role + topic analysis prompt, assembled once at import
+COMBINED_PROMPT_HEADER = (
+    f"{ANALYSIS_PROMPT_HEADER}\n"
+    "IN ADDITION, plan the podcast conversation for the content.\n\n"
+    f"TOPIC TASK:\n{TOPIC_TASK_INSTRUCTIONS}\n"
+)
+
+# Very short content is classified by keywords instead of a Gemini round trip, but
+# only when one category clearly wins (beats the runner-up by HEURISTIC_MIN_MARGIN hits)
+SHORT_CONTENT_THRESHOLD = 200
+HEURISTIC_MIN_MARGIN = 3
+
+_CATEGORY_KEYWORDS = {
+    ContentType.TECHNOLOGY: ["AI", "software", "GPU", "chip", "startup", "app", "cyber", "cloud", "OpenAI",
+                             "בינה מלאכותית", "טכנולוגיה", "סטארטאפ", "סייבר"],
+    ContentType.FINANCE: ["stock", "stocks", "crypto", "bitcoin", "market", "inflation", "interest rate", "Nasdaq",
+                          "בורסה", "מניות", "ריבית", "אינפלציה", "ביטקוין"],
+    ContentType.POLITICS: ["election", "government", "parliament", "minister", "Knesset", "coalition",
+                           "בחירות", "ממשלה", "כנסת", "קואליציה"],
+    ContentType.SPORTS: ["match", "league", "goal", "championship", "NBA", "football", "coach",
+                         "ליגה", "שער", "אליפות", "כדורגל", "מאמן"],
+    ContentType.HEALTH: ["health", "medical", "vaccine", "hospital", "disease", "fitness",
+                         "בריאות", "חיסון", "בית חולים", "מחלה", "רפואה"],
+    ContentType.SCIENCE: ["research", "study", "scientists", "physics", "space", "NASA",
+                          "מחקר", "מדענים", "חלל", "פיזיקה"],
+}
+_CATEGORY_PATTERNS = {
+    content_type: re.compile(
+        "|".join(rf"\b{re.escape(kw)}\b" if kw.isascii() else re.escape(kw) for kw in keywords),
+        re.IGNORECASE
+    )
+    for content_type, keywords in _CATEGORY_KEYWORDS.items()
+}
+_CATEGORY_DEFAULT_ROLE = {
+    ContentType.TECHNOLOGY: SpeakerRole.TECH_EXPERT.value,
+    ContentType.FINANCE: SpeakerRole.FINANCIAL_ANALYST.value,
+    ContentType.POLITICS: SpeakerRole.POLITICAL_COMMENTATOR.value,
+    ContentType.SPORTS: SpeakerRole.SPORTS_COMMENTATOR.value,
+    ContentType.HEALTH: SpeakerRole.HEALTH_EXPERT.value,
+    ContentType.SCIENCE: SpeakerRole.SCIENCE_COMMUNICATOR.value,
+}
+
 
 class ContentAnalyzer:
     """Analyzes content and determines appropriate speaker roles using hybrid approach"""
@@ -90,6 +340,8 @@ class ContentAnalyzer:
         ContentType.LIFESTYLE: "female",
         ContentType.GENERAL: "male",
     }
+    # Same mapping keyed by plain value: Enum.__hash__ is Python-level, str hashing is not
+    _GENDER_BY_VALUE = {content_type.value: gender for content_type, gender in CATEGORY_GENDER_MAPPING.items()}
     
     # Role generation guidelines per category
     ROLE_GUIDELINES = {
@@ -107,18 +359,26 @@ class ContentAnalyzer:
         ContentType.GENERAL: "Subject matter expert or knowledgeable analyst",
     }
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, content_extractor: Optional[TelegramContentExtractor] = None):
         """Initialize content analyzer with Gemini API using new google-genai library"""
         self.api_key = api_key
         self.client = genai.Client(api_key=api_key)
-        self.content_extractor = TelegramContentExtractor()
+        self.content_extractor = content_extractor or TelegramContentExtractor()
+        # SQS retries/redrives re-send identical content: LRU of successful analyses
+        self._analysis_cache: OrderedDict = OrderedDict()
+        self._analysis_cache_lock = threading.Lock()
     
-    def analyze_content(self, telegram_data: Dict[str, Any]) -> ContentAnalysisResult:
+    def analyze_content(
+        self,
+        telegram_data: Dict[str, Any],
+        content_text: Optional[str] = None
+    ) -> ContentAnalysisResult:
         """
         Analyze Telegram content and determine appropriate speaker role using hybrid approach
         
         Args:
             telegram_data: Raw Telegram data with messages
+            content_text: Already-extracted content text (extracted from telegram_data if omitted)
             
         Returns:
             ContentAnalysisResult with content type and specific role
@@ -127,7 +387,8 @@ class ContentAnalyzer:
         
         try:
             # Extract content for analysis using shared extractor
-            content_text = self.content_extractor.extract_content_text_only(telegram_data)
+            if content_text is None:
+                content_text = self.content_extractor.extract_content_text_only(telegram_data)
             
             if not content_text:
                 logger.warning("[CONTENT_ANALYZER] No content extracted, using fallback analysis")
@@ -139,25 +400,30 @@ class ContentAnalyzer:
                     reasoning="No content found for analysis, using default role"
                 )
             
+            if len(content_text) < SHORT_CONTENT_THRESHOLD:
+                heuristic_result = self._classify_by_keywords(content_text)
+                if heuristic_result:
+                    logger.info("[CONTENT_ANALYZER] Short content classified by keywords: %s (%s)",
+                                heuristic_result.content_type.value, heuristic_result.specific_role)
+                    return heuristic_result
+            
             # Log content sample for debugging
-            content_sample = content_text[:200] + "..." if len(content_text) > 200 else content_text
-            logger.info(f"[CONTENT_ANALYZER] Content sample: {content_sample}")
-            logger.info(f"[CONTENT_ANALYZER] Total content length: {len(content_text)} characters")
+            if logger.isEnabledFor(logging.INFO):
+                content_sample = content_text[:200] + "..." if len(content_text) > 200 else content_text
+                logger.info("[CONTENT_ANALYZER] Content sample (%d characters): %s", len(content_text), content_sample)
             
             # Analyze content using Gemini with structured output
             analysis_result = self._analyze_with_gemini(content_text)
             
-            logger.info(f"[CONTENT_ANALYZER] Analysis complete:")
-            logger.info(f"[CONTENT_ANALYZER] - Content type: {analysis_result.content_type.value}")
-            logger.info(f"[CONTENT_ANALYZER] - Specific role: {analysis_result.specific_role}")
-            logger.info(f"[CONTENT_ANALYZER] - Confidence: {analysis_result.confidence:.2f}")
-            logger.info(f"[CONTENT_ANALYZER] - Reasoning: {analysis_result.reasoning}")
+            logger.info("[CONTENT_ANALYZER] Analysis complete: type=%s, role=%s, confidence=%.2f, reasoning=%s",
+                        analysis_result.content_type.value, analysis_result.specific_role,
+                        analysis_result.confidence, analysis_result.reasoning)
             
             return analysis_result
             
         except Exception as e:
-            logger.error(f"[CONTENT_ANALYZER] Error analyzing content: {str(e)}")
-            logger.error(f"[CONTENT_ANALYZER] Using fallback default role due to error")
+            logger.error("[CONTENT_ANALYZER] Error analyzing content: %s", e)
+            logger.error("[CONTENT_ANALYZER] Using fallback default role due to error")
             # Return default values on error
             return ContentAnalysisResult(
                 content_type=ContentType.GENERAL,
@@ -169,9 +435,123 @@ class ContentAnalyzer:
     
 
     
+    def analyze_all(
+        self,
+        telegram_data: Dict[str, Any],
+        content_text: Optional[str] = None,
+        message_count: Optional[int] = None
+    ) -> Tuple[ContentAnalysisResult, Dict[str, Any]]:
+        """
+        Run role analysis and topic/structure analysis with a single Gemini call
+        
+        Equivalent to analyze_content() + analyze_topics_and_structure(), but the
+        content is extracted once and sent to Gemini once.
+        
+        Args:
+            telegram_data: Raw Telegram data with messages
+            content_text: Already-extracted content text (extracted from telegram_data if omitted)
+            message_count: Number of extracted messages (counted from telegram_data if omitted)
+            
+        Returns:
+            Tuple of (ContentAnalysisResult, topic analysis dict)
+        """
+        logger.info("[CONTENT_ANALYZER] Starting combined content and topic analysis")
+        
+        try:
+            if content_text is None or message_count is None:
+                # Count messages the way the extractor finds them ('results' per channel,
+                # 'messages', or any message array) rather than only a top-level 'messages' key
+                clean_content = self.content_extractor.extract_clean_content(telegram_data)
+                if content_text is None:
+                    content_text = self.content_extractor.content_text_from_clean(clean_content)
+                if message_count is None:
+                    message_count = len(clean_content['messages'])
+            
+            if not content_text or message_count < 2:
+                # Nothing to segment into topics - only the role analysis needs Gemini
+                logger.info("[CONTENT_ANALYZER] Too few messages for topic analysis")
+                return self.analyze_content(telegram_data, content_text), {
+                    'topics': [],
+                    'conversation_structure': 'single_topic'
+                }
+            
+            if len(content_text) < SHORT_CONTENT_THRESHOLD:
+                # Short multi-message content: a clear keyword winner skips the Gemini call;
+                # topics aren't worth segmenting at this length
+                heuristic_result = self._classify_by_keywords(content_text)
+                if heuristic_result:
+                    logger.info("[CONTENT_ANALYZER] Short content classified by keywords: %s (%s)",
+                                heuristic_result.content_type.value, heuristic_result.specific_role)
+                    return heuristic_result, {
+                        'topics': [],
+                        'conversation_structure': 'linear'
+                    }
+            
+            content_text = self._truncate_content(content_text)
+            cache_key = hashlib.blake2b(
+                f"{GEMINI_ANALYSIS_MODEL}\0{message_count}\0{content_text}".encode('utf-8'),
+                digest_size=16
+            ).hexdigest()
+            with self._analysis_cache_lock:
+                cached = self._analysis_cache.get(cache_key)
+                if cached:
+                    self._analysis_cache.move_to_end(cache_key)
+            if cached:
+                logger.info("[CONTENT_ANALYZER] Reusing cached analysis for identical content (%s)", cache_key)
+                analysis_result, topic_result = cached
+                return analysis_result, dict(topic_result)
+            
+            prompt = f"{COMBINED_PROMPT_HEADER}CONTENT TO ANALYZE ({message_count} messages):\n{content_text}\n"
+            response = self._generate_structured(prompt, COMBINED_RESPONSE_SCHEMA, max_output_tokens=3072)
+            result_data = orjson.loads(response.text)
+            analysis_result = self._parse_analysis(result_data)
+            topic_result = {key: result_data[key] for key in TOPIC_RESPONSE_SCHEMA["required"]}
+            
+            logger.info("[CONTENT_ANALYZER] Analysis complete: type=%s, role=%s, confidence=%.2f, topics=%d, structure=%s",
+                        analysis_result.content_type.value, analysis_result.specific_role, analysis_result.confidence,
+                        len(topic_result['topics']), topic_result['conversation_structure'])
+            
+            with self._analysis_cache_lock:
+                self._analysis_cache[cache_key] = (analysis_result, topic_result)
+                if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                    self._analysis_cache.popitem(last=False)
+            return analysis_result, dict(topic_result)
+            
+        except Exception as e:
+            logger.error("[CONTENT_ANALYZER] Error in combined analysis: %s", e)
+            logger.error("[CONTENT_ANALYZER] Using fallback default role due to error")
+            return ContentAnalysisResult(
+                content_type=ContentType.GENERAL,
+                specific_role="Expert Analyst",
+                role_description="General subject matter expert",
+                confidence=0.5,
+                reasoning=f"Error in analysis ({str(e)}), using default role"
+            ), {
+                'topics': [],
+                'conversation_structure': 'linear'
+            }
+    
+    def _classify_by_keywords(self, content_text: str) -> Optional[ContentAnalysisResult]:
+        """Classify short content by keyword hits; None when no category clearly wins"""
+        hits = sorted(
+            ((len(pattern.findall(content_text)), content_type) for content_type, pattern in _CATEGORY_PATTERNS.items()),
+            key=lambda item: item[0],
+            reverse=True
+        )
+        (best_hits, best_type), (runner_up_hits, _) = hits[0], hits[1]
+        if best_hits - runner_up_hits < HEURISTIC_MIN_MARGIN:
+            return None
+        return ContentAnalysisResult(
+            content_type=best_type,
+            specific_role=_CATEGORY_DEFAULT_ROLE[best_type],
+            role_description=self.ROLE_GUIDELINES[best_type],
+            confidence=0.6,
+            reasoning=f"heuristic: {best_hits} {best_type.value} keyword matches in short content"
+        )
+    
     def get_gender_for_category(self, content_type: ContentType) -> str:
         """Get the default gender for a content category"""
-        return self.CATEGORY_GENDER_MAPPING.get(content_type, "male")
+        return self._GENDER_BY_VALUE.get(getattr(content_type, 'value', content_type), "male")
 
     def analyze_topics_and_structure(self, telegram_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -199,13 +579,13 @@ class ContentAnalyzer:
             # Analyze with Gemini for topic identification
             result = self._analyze_topics_with_gemini(content_text, len(messages))
 
-            logger.info(f"[CONTENT_ANALYZER] Identified {len(result.get('topics', []))} topics")
-            logger.info(f"[CONTENT_ANALYZER] Structure: {result.get('conversation_structure', 'unknown')}")
+            logger.info("[CONTENT_ANALYZER] Identified %d topics, structure: %s",
+                        len(result.get('topics', [])), result.get('conversation_structure', 'unknown'))
 
             return result
 
         except Exception as e:
-            logger.error(f"[CONTENT_ANALYZER] Error in topic analysis: {str(e)}")
+            logger.error("[CONTENT_ANALYZER] Error in topic analysis: %s", e)
             return {
                 'topics': [],
                 'conversation_structure': 'linear'
@@ -214,50 +594,7 @@ class ContentAnalyzer:
     def _analyze_topics_with_gemini(self, content_text: str, message_count: int) -> Dict[str, Any]:
         """Use Gemini to identify topics and suggest conversation structure"""
 
-        # Define schema for topic analysis
-        response_schema = {
-            "type": "OBJECT",
-            "properties": {
-                "topics": {
-                    "type": "ARRAY",
-                    "items": {
-                        "type": "OBJECT",
-                        "properties": {
-                            "topic_name": {
-                                "type": "STRING",
-                                "description": "Brief, catchy topic name (2-5 words)"
-                            },
-                            "importance": {
-                                "type": "STRING",
-                                "enum": ["high", "medium", "low"],
-                                "description": "How central is this topic to the content"
-                            },
-                            "suggested_duration": {
-                                "type": "STRING",
-                                "enum": ["brief", "moderate", "extended"],
-                                "description": "How much time to spend on this topic"
-                            }
-                        },
-                        "required": ["topic_name", "importance", "suggested_duration"]
-                    }
-                },
-                "conversation_structure": {
-                    "type": "STRING",
-                    "enum": ["single_topic", "linear", "thematic_clusters", "narrative_arc"],
-                    "description": "How to structure the conversation flow"
-                },
-                "transition_style": {
-                    "type": "STRING",
-                    "description": "Recommended style for transitions between topics"
-                }
-            },
-            "required": ["topics", "conversation_structure", "transition_style"]
-        }
-
-        # Truncate if too long
-        max_length = 2000
-        if len(content_text) > max_length:
-            content_text = content_text[:max_length] + "..."
+        content_text = self._truncate_content(content_text)
 
         prompt = f"""
 Analyze the following content and identify the main topics for a podcast conversation.
@@ -266,47 +603,16 @@ CONTENT ({message_count} messages):
 {content_text}
 
 TASK:
-1. Identify 2-7 distinct topics (don't over-segment - group related items)
-2. Rate each topic's importance (high/medium/low)
-3. Suggest duration for each topic (brief/moderate/extended)
-4. Recommend conversation structure:
-   - single_topic: All content is about one main subject
-   - linear: Topics follow chronological or logical sequence
-   - thematic_clusters: Group related topics together
-   - narrative_arc: Build from intro to climax to conclusion
-5. Suggest transition style (how to move between topics naturally)
-
-GUIDELINES:
-- For NEWS content: Group by category (politics, economy, tech, etc.)
-- For TECH content: Group by product/company or technology area
-- For MIXED content: Find thematic connections
-- Prioritize natural conversation flow over strict categorization
-- Consider: Can these topics be woven together into a story?
-
-TRANSITION STYLE SUGGESTIONS:
-- "seamless" - Topics naturally flow into each other
-- "explicit" - Clear topic changes ("Moving on to...", "Another thing...")
-- "narrative" - Build a story connecting the topics
-- "contrast" - Highlight differences between topics for interest
-"""
+{TOPIC_TASK_INSTRUCTIONS}"""
 
         try:
-            response = self.client.models.generate_content(
-                model='gemini-2.0-flash-001',
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                    response_schema=response_schema,
-                    temperature=0.3,
-                    max_output_tokens=2048
-                )
-            )
+            response = self._generate_structured(prompt, TOPIC_RESPONSE_SCHEMA, max_output_tokens=2048)
 
-            result = json.loads(response.text)
+            result = orjson.loads(response.text)
             return result
 
         except Exception as e:
-            logger.error(f"[CONTENT_ANALYZER] Gemini topic analysis failed: {str(e)}")
+            logger.error("[CONTENT_ANALYZER] Gemini topic analysis failed: %s", e)
             raise
     
 
@@ -314,129 +620,70 @@ TRANSITION STYLE SUGGESTIONS:
     def _analyze_with_gemini(self, content_text: str) -> ContentAnalysisResult:
         """Analyze content using Gemini with structured output for hybrid approach"""
         
-        # Define the response schema for hybrid approach using new library format
-        response_schema = {
-            "type": "OBJECT",
-            "properties": {
-                "content_type": {
-                    "type": "STRING",
-                    "enum": [ct.value for ct in ContentType],
-                    "description": "The primary category of the content"
-                },
-                "specific_role": {
-                    "type": "STRING", 
-                    "description": "Specific, creative role name that fits the content (e.g., 'AI Research Scientist', 'Crypto Market Analyst')"
-                },
-                "role_description": {
-                    "type": "STRING",
-                    "description": "Brief description of the role's expertise and background"
-                },
-                "confidence": {
-                    "type": "NUMBER",
-                    "description": "Confidence score for the classification (0.0-1.0)"
-                },
-                "reasoning": {
-                    "type": "STRING",
-                    "description": "Brief explanation of why this content type and role were selected"
-                }
-            },
-            "required": ["content_type", "specific_role", "role_description", "confidence", "reasoning"]
-        }
-        
         # Build the analysis prompt
         prompt = self._build_analysis_prompt(content_text)
         
         try:
             # Generate content with structured output using new client-based API
-            response = self.client.models.generate_content(
-                model='gemini-2.0-flash-001',
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                    response_schema=response_schema,
-                    temperature=0.3,
-                    max_output_tokens=1024
-                )
-            )
+            response = self._generate_structured(prompt, ANALYSIS_RESPONSE_SCHEMA, max_output_tokens=1024)
             
             # Parse the response
-            result_data = json.loads(response.text)
-            
-            # Create result with hybrid data
-            content_type = ContentType(result_data['content_type'])
-            
-            return ContentAnalysisResult(
-                content_type=content_type,
-                specific_role=result_data['specific_role'],
-                role_description=result_data['role_description'],
-                confidence=result_data['confidence'],
-                reasoning=result_data['reasoning']
-            )
+            return self._parse_analysis(orjson.loads(response.text))
             
         except Exception as e:
-            logger.error(f"[CONTENT_ANALYZER] Error in Gemini analysis: {str(e)}")
+            logger.error("[CONTENT_ANALYZER] Error in Gemini analysis: %s", e)
             raise
     
-    def _build_analysis_prompt(self, content_text: str) -> str:
-        """Build the content analysis prompt for hybrid approach"""
-        
-        # Truncate content if too long
-        max_content_length = 2000
+    @staticmethod
+    def _parse_analysis(result_data: Dict[str, Any]) -> ContentAnalysisResult:
+        """Create a ContentAnalysisResult from Gemini's structured output"""
+        return ContentAnalysisResult(
+            content_type=ContentType(result_data['content_type']),
+            specific_role=result_data['specific_role'],
+            role_description=result_data['role_description'],
+            confidence=result_data['confidence'],
+            reasoning=result_data['reasoning']
+        )
+    
+    def _generate_structured(self, prompt: str, response_schema: Dict[str, Any], max_output_tokens: int):
+        """Call Gemini with structured JSON output, retrying transient failures"""
+        for attempt in range(GEMINI_MAX_RETRIES + 1):
+            try:
+                with _GEMINI_SEMAPHORE:
+                    return self.client.models.generate_content(
+                        model=GEMINI_ANALYSIS_MODEL,
+                        contents=prompt,
+                        config=types.GenerateContentConfig(
+                            response_mime_type="application/json",
+                            response_schema=response_schema,
+                            temperature=0.3,
+                            max_output_tokens=max_output_tokens
+                        )
+                    )
+            except Exception as e:
+                error_str = str(e)
+                if attempt == GEMINI_MAX_RETRIES or not _is_retryable_gemini_error(e):
+                    raise
+                
+                backoff = min(GEMINI_MAX_BACKOFF_SECONDS, 2 ** attempt)
+                if _is_rate_limit_error(e):
+                    # Respect Google's suggested delay, but don't sit out long quota windows here
+                    backoff = parse_retry_delay(error_str, default_delay=backoff)
+                    if backoff > GEMINI_MAX_BACKOFF_SECONDS:
+                        raise
+                delay = backoff * random.uniform(0.5, 1.0)
+                logger.warning("[CONTENT_ANALYZER] Gemini call failed (attempt %d/%d): %s - retrying in %.1fs",
+                               attempt + 1, GEMINI_MAX_RETRIES + 1, error_str, delay)
+                time.sleep(delay)
+    
+    @staticmethod
+    def _truncate_content(content_text: str, max_content_length: int = 2000) -> str:
+        """Truncate content sent to Gemini if too long"""
         if len(content_text) > max_content_length:
-            content_text = content_text[:max_content_length] + "..."
-        
-        prompt = f"""
-You are a content classification expert. Analyze the following content and determine its primary category, then create a specific, engaging speaker role.
-
-CONTENT TO ANALYZE:
-{content_text}
-
-AVAILABLE CATEGORIES:
-- news: Breaking news, current events, journalism
-- technology: Tech news, gadgets, software, AI, programming
-- finance: Financial markets, economy, investments, business finance
-- politics: Political news, elections, government, policy
-- sports: Sports news, games, athletes, competitions
-- health: Medical news, wellness, fitness, healthcare
-- science: Scientific discoveries, research, academic content
-- entertainment: Movies, TV, celebrities, music, arts
-- business: Corporate news, entrepreneurship, industry trends
-- education: Learning content, tutorials, academic topics
-- lifestyle: Personal development, travel, food, fashion
-- general: Mixed content or content that doesn't fit other categories
-
-ROLE CREATION GUIDELINES:
-After selecting the category, create a SPECIFIC role that matches the exact content:
-
-For TECHNOLOGY content:
-- Examples: "AI Research Scientist", "Cybersecurity Expert", "Mobile App Developer", "Cloud Computing Specialist"
-- Focus on the specific tech area discussed
-
-For NEWS content:
-- Examples: "Political Correspondent", "International Affairs Reporter", "Economic News Analyst"
-- Match the news domain
-
-For FINANCE content:
-- Examples: "Cryptocurrency Analyst", "Stock Market Expert", "Real Estate Investment Advisor"
-- Specify the financial area
-
-For other categories, follow similar patterns - be specific to the actual content discussed.
-
-INSTRUCTIONS:
-1. Select the primary category from the list above
-2. Create a specific, professional role name that precisely matches the content
-3. Write a brief role description explaining their expertise
-4. Provide confidence score based on how clear the categorization is
-5. Give reasoning for both category and role selection
-
-ROLE NAMING RULES:
-- Use professional, credible titles
-- Be specific to the content's focus area
-- Avoid generic terms when possible
-- Make it sound like a real expert you'd want to hear from
-- Consider Hebrew content context when relevant
-
-Consider the language and cultural context of the content when making your decisions.
-"""
-        
-        return prompt 
\ No newline at end of file
+            return content_text[:max_content_length] + "..."
+        return content_text
+    
+    def _build_analysis_prompt(self, content_text: str) -> str:
+        """Build the content analysis prompt for hybrid approach (static header first)"""
+        content_text = self._truncate_content(content_text)
+        return f"{ANALYSIS_PROMPT_HEADER}\nCONTENT TO ANALYZE:\n{content_text}\n"
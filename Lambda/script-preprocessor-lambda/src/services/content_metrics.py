@@ -2,11 +2,22 @@
 Content Metrics Service
 Analyzes content to determine appropriate compression/expansion strategy
 """
+import re
+import unicodedata
+import heapq
+from functools import lru_cache
 from typing import Dict, Any, List, Tuple
+
+import ahocorasick
+
 from shared.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Single C-level scans for the "has numbers" / "has quotes" boosts
+_DIGIT_RE = re.compile(r'\d')
+_QUOTE_RE = re.compile('["\'\u05f4\u05f3]')
+
 
 class ContentMetrics:
     """Analyzes content metrics to guide script generation"""
@@ -35,7 +46,8 @@ class ContentMetrics:
         message_count = len(messages)
 
         # Calculate content volume
-        total_chars = sum(len(msg.get('text', '')) for msg in messages)
+        texts = [msg.get('text', '') for msg in messages]
+        total_chars = sum(map(len, texts))
         avg_chars_per_message = total_chars / message_count if message_count > 0 else 0
 
         # Determine content category
@@ -81,10 +93,10 @@ class ContentMetrics:
             'detail_level': detail_level,
         }
 
-        logger.info(f"[CONTENT_METRICS] Analysis: {message_count} msgs, {total_chars} chars")
-        logger.info(f"[CONTENT_METRICS] Strategy: {strategy} (ratio={target_ratio:.2f})")
-        logger.info(f"[CONTENT_METRICS] Target: {target_script_chars} chars")
-        logger.info(f"[CONTENT_METRICS] Coverage: {coverage_mode}, Detail: {detail_level}")
+        logger.info("[CONTENT_METRICS] Analysis: %d msgs, %d chars; strategy: %s (ratio=%.2f); "
+                    "target: %d chars; coverage: %s, detail: %s",
+                    message_count, total_chars, strategy, target_ratio,
+                    target_script_chars, coverage_mode, detail_level)
 
         return metrics
 
@@ -132,64 +144,47 @@ class ContentPrioritizer:
         ]
     }
 
+    # Score added per matched keyword of each tier
+    TIER_WEIGHTS = {'critical': 100, 'high': 50, 'medium': 20, 'low': 5}
+
+    # Cap on the keyword score: a message reaching it ranks at the top regardless; scanning stops there
+    KEYWORD_SCORE_SATURATION = 300
+
     @staticmethod
-    def prioritize_messages(messages: List[Dict]) -> List[Tuple[Dict, int]]:
+    def score_messages(messages: List[Dict]) -> List[int]:
         """
-        Sort messages by priority based on content importance
+        Score messages by content importance
 
         Args:
             messages: List of message dictionaries
 
         Returns:
-            List of tuples: (message, priority_score)
+            List of priority scores, index-aligned with messages
         """
-        scored_messages = []
-
-        for msg in messages:
-            text = msg.get('text', '').lower()
-            score = 0
-
-            # Score based on keyword matches
-            for keyword in ContentPrioritizer.PRIORITY_KEYWORDS['critical']:
-                if keyword.lower() in text:
-                    score += 100
-
-            for keyword in ContentPrioritizer.PRIORITY_KEYWORDS['high']:
-                if keyword.lower() in text:
-                    score += 50
-
-            for keyword in ContentPrioritizer.PRIORITY_KEYWORDS['medium']:
-                if keyword.lower() in text:
-                    score += 20
-
-            for keyword in ContentPrioritizer.PRIORITY_KEYWORDS['low']:
-                if keyword.lower() in text:
-                    score += 5
-
-            # Boost score for longer messages (usually more substantial)
-            text_length = len(text)
-            if text_length > 200:
-                score += 30
-            elif text_length > 100:
-                score += 15
+        return list(map(_score_text, [msg.get('text', '').lower() for msg in messages]))
 
-            # Boost for messages with numbers (facts, statistics)
-            if any(char.isdigit() for char in text):
-                score += 10
+    @staticmethod
+    def prioritize_messages(messages: List[Dict]) -> List[Tuple[Dict, int]]:
+        """
+        Sort messages by priority based on content importance
 
-            # Boost for messages with quotes (usually important statements)
-            if '"' in text or "'" in text or '״' in text or '׳' in text:
-                score += 15
+        Args:
+            messages: List of message dictionaries
 
-            scored_messages.append((msg, score))
+        Returns:
+            List of tuples: (message, priority_score)
+        """
+        scores = ContentPrioritizer.score_messages(messages)
 
-        # Sort by score (descending)
-        scored_messages.sort(key=lambda x: x[1], reverse=True)
+        # Sort indices by score (descending, stable for equal scores)
+        order = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        scored_messages = [(messages[i], scores[i]) for i in order]
 
-        logger.info(f"[CONTENT_PRIORITIZER] Scored {len(messages)} messages")
         if scored_messages:
-            logger.info(f"[CONTENT_PRIORITIZER] Top score: {scored_messages[0][1]}")
-            logger.info(f"[CONTENT_PRIORITIZER] Lowest score: {scored_messages[-1][1]}")
+            logger.info("[CONTENT_PRIORITIZER] Scored %d messages (top score: %d, lowest score: %d)",
+                        len(messages), scored_messages[0][1], scored_messages[-1][1])
+        else:
+            logger.info("[CONTENT_PRIORITIZER] Scored 0 messages")
 
         return scored_messages
 
@@ -208,21 +203,78 @@ class ContentPrioritizer:
         Returns:
             List of prioritized messages
         """
-        scored_messages = ContentPrioritizer.prioritize_messages(messages)
+        scores = ContentPrioritizer.score_messages(messages)
 
         # Calculate cutoff
-        cutoff_index = max(1, int(len(scored_messages) * target_percentage))
+        cutoff_index = max(1, int(len(scores) * target_percentage))
 
-        # Keep original order for selected messages
-        selected_messages_with_score = scored_messages[:cutoff_index]
-
-        # Get original indices to maintain chronological order
-        selected_messages = [msg for msg, score in selected_messages_with_score]
+        # Top-K by score without sorting the discarded tail (ties keep message order)
+        top_indices = heapq.nlargest(cutoff_index, range(len(scores)), key=scores.__getitem__)
+        selected_messages = [messages[i] for i in top_indices]
 
         # Sort by original order (assuming messages have date field)
         if selected_messages and 'date' in selected_messages[0]:
             selected_messages.sort(key=lambda x: x.get('date', ''))
 
-        logger.info(f"[CONTENT_PRIORITIZER] Selected {len(selected_messages)}/{len(messages)} messages")
+        logger.info("[CONTENT_PRIORITIZER] Scored and selected %d/%d messages", len(selected_messages), len(messages))
 
         return selected_messages
+
+
+def _build_keyword_automaton() -> Tuple[ahocorasick.Automaton, Dict[str, int]]:
+    """Build the Aho-Corasick automaton and per-keyword weights (sum over the tiers it appears in)"""
+    weights: Dict[str, int] = {}
+    for tier, weight in ContentPrioritizer.TIER_WEIGHTS.items():
+        for keyword in ContentPrioritizer.PRIORITY_KEYWORDS[tier]:
+            keyword = unicodedata.normalize('NFC', keyword.lower())
+            weights[keyword] = weights.get(keyword, 0) + weight
+
+    automaton = ahocorasick.Automaton()
+    for keyword in weights:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton, weights
+
+
+_KEYWORD_AUTOMATON, _KEYWORD_WEIGHTS = _build_keyword_automaton()
+
+
+@lru_cache(maxsize=4096)
+def _score_text(text: str) -> int:
+    """
+    Priority score of a lowercased message text
+
+    Memoized: forwards and reposts make identical texts common in Telegram batches.
+    """
+    text = unicodedata.normalize('NFC', text)
+
+    # Score based on keyword matches: one scan for all keywords; each distinct
+    # keyword present scores once per tier it belongs to (substring semantics).
+    # The scan stops early once the keyword score saturates; a saturated score is
+    # clamped to the threshold so it does not depend on which keywords came first.
+    score = 0
+    matched_keywords = set()
+    for _, keyword in _KEYWORD_AUTOMATON.iter(text):
+        if keyword not in matched_keywords:
+            matched_keywords.add(keyword)
+            score += _KEYWORD_WEIGHTS[keyword]
+            if score >= ContentPrioritizer.KEYWORD_SCORE_SATURATION:
+                score = ContentPrioritizer.KEYWORD_SCORE_SATURATION
+                break
+
+    # Boost score for longer messages (usually more substantial)
+    text_length = len(text)
+    if text_length > 200:
+        score += 30
+    elif text_length > 100:
+        score += 15
+
+    # Boost for messages with numbers (facts, statistics)
+    if _DIGIT_RE.search(text):
+        score += 10
+
+    # Boost for messages with quotes (usually important statements)
+    if _QUOTE_RE.search(text):
+        score += 15
+
+    return score
@@ -3,455 +3,87 @@ Gemini Script Generator Service
 Uses Google Gemini to generate natural conversation scripts from Telegram data
 """
 
+import hashlib
 import os
-from typing import Dict, Any, Tuple
-
-from google import genai
-from google.genai import types
-from shared.utils.logging import get_logger
-from services.content_metrics import ContentMetrics, ContentPrioritizer
-
-logger = get_logger(__name__)
-
-
-class GeminiScriptGenerator:
-    """Generates natural conversation scripts using Google Gemini AI"""
-
-    def __init__(self):
-        """Initialize the Google Gemini client"""
-        api_key = os.environ.get("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
-
-        self.client = genai.Client(api_key=api_key)
-        self.model = "gemini-2.0-flash-001"
-
-    def generate_script(
-        self, clean_content: Dict[str, Any], podcast_config: Dict[str, Any] = None, episode_id: str = None, podcast_format: str = 'multi-speaker'
-    ) -> Tuple[str, Dict[str, Any]]:
-        """
-        Generate a natural conversation script from clean content
-
-        Args:
-            clean_content: Clean content with messages and summary
-            podcast_config: Podcast configuration including language and speaker info
-            episode_id: Episode ID for voice-aware script generation
-            podcast_format: 'single-speaker' or 'multi-speaker' (default)
-
-        Returns:
-            Tuple of (generated conversation script as string, content metrics dict)
-        """
-        logger.info(f"[GEMINI_SCRIPT] Starting {podcast_format} script generation")
-
-        # Get configuration
-        config = podcast_config or {}
-        language = config.get("language", "en")
-        speaker1_gender = config.get("speaker1_gender", "male")
-        speaker2_gender = config.get("speaker2_gender", "female")
-
-        # Log clean content info
-        message_count = len(clean_content.get('messages', []))
-        summary = clean_content.get('summary', {})
-
-        logger.info(f"[GEMINI_SCRIPT] Generating script in language: {language}")
-        logger.info(f"[GEMINI_SCRIPT] Format: {podcast_format}")
-        if podcast_format == 'multi-speaker':
-            logger.info(f"[GEMINI_SCRIPT] Speaker genders: Speaker1={speaker1_gender}, Speaker2={speaker2_gender}")
-        else:
-            logger.info(f"[GEMINI_SCRIPT] Speaker gender: {speaker1_gender}")
-        logger.info(f"[GEMINI_SCRIPT] Clean content: {message_count} messages, date range: {summary.get('date_range', 'unknown')}")
-        if episode_id:
-            logger.info(f"[GEMINI_SCRIPT] Episode ID for voice-aware generation: {episode_id}")
-
-        # Analyze content metrics to determine strategy
-        content_metrics = ContentMetrics.analyze_content(clean_content)
-        logger.info(f"[GEMINI_SCRIPT] Content metrics: {content_metrics['strategy']} strategy (ratio={content_metrics['target_ratio']:.2f})")
-
-        # Prioritize messages if high content
-        clean_content_prioritized = clean_content.copy()
-        if content_metrics['category'] == 'high':
-            logger.info(f"[GEMINI_SCRIPT] High content detected - prioritizing messages")
-            prioritized_messages = ContentPrioritizer.select_priority_messages(
-                clean_content['messages'], target_percentage=0.70
-            )
-            clean_content_prioritized['messages'] = prioritized_messages
-            logger.info(f"[GEMINI_SCRIPT] Using top {len(prioritized_messages)}/{len(clean_content['messages'])} priority messages")
-
-        # Generate script based on podcast format
-        if podcast_format == 'single-speaker':
-            script = self._generate_single_speaker_script(clean_content_prioritized, config, episode_id, content_metrics)
-        else:
-            script = self._generate_multi_speaker_script(clean_content_prioritized, config, episode_id, content_metrics)
-
-        logger.info(f"[GEMINI_SCRIPT] Generated script: {len(script)} characters")
-        if content_metrics['total_chars'] > 0:
-            logger.info(f"[GEMINI_SCRIPT] Actual ratio: {len(script) / content_metrics['total_chars']:.2f} (target: {content_metrics['target_ratio']:.2f})")
-        else:
-            logger.warning(f"[GEMINI_SCRIPT] No source content to calculate ratio (generated {len(script)} chars from empty content)")
-
-        return script, content_metrics
-
-    def _generate_single_speaker_script(
-        self, clean_content: Dict[str, Any], podcast_config: Dict[str, Any], episode_id: str = None, content_metrics: Dict[str, Any] = None
-    ) -> str:
-        """Generate natural single-speaker monologue script using Gemini AI with clean content"""
-
-        # Get configuration
-        speaker1_role = podcast_config.get("speaker1_role", "Host")
-        speaker1_gender = podcast_config.get("speaker1_gender", "male")
-        podcast_name = podcast_config.get("podcast_name", "Daily Podcast")
-        target_duration = podcast_config.get("target_duration_minutes", 10)
-        language = podcast_config.get("language", "en")
-        additional_instructions = podcast_config.get("additional_instructions", "")
-
-        # Get content type for TTS markup instructions
-        content_type = 'general'
-        if podcast_config.get('content_analysis'):
-            content_analysis = podcast_config['content_analysis']
-            if hasattr(content_analysis, 'content_type'):
-                content_type = content_analysis.content_type.value
-
-        # Build the prompt for single-speaker script
-        prompt = self._build_single_speaker_prompt(
-            clean_content=clean_content,
-            language=language,
-            speaker1_role=speaker1_role,
-            speaker1_gender=speaker1_gender,
-            podcast_name=podcast_name,
-            target_duration=target_duration,
-            additional_instructions=additional_instructions,
-            episode_id=episode_id,
-            content_analysis=podcast_config.get('content_analysis'),
-            content_type=content_type,
-            content_metrics=content_metrics,
-            podcast_config=podcast_config
-        )
-
-        try:
-            # Generate script using Gemini
-            # Temperature 0.7: Balanced between creativity and coherence
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.7,
-                    max_output_tokens=32768,
-                )
-            )
-
-            if response.text:
-                cleaned_script = response.text.strip()
-                # Validate script doesn't contain placeholders
-                self._validate_script_content(cleaned_script)
-                return cleaned_script
-
-            raise Exception("No script generated by Gemini")
-
-        except Exception as e:
-            logger.error(f"[GEMINI_SCRIPT] Error generating single-speaker script: {str(e)}")
-            raise Exception(f"Failed to generate single-speaker script: {str(e)}")
-
-    def _generate_multi_speaker_script(
-        self, clean_content: Dict[str, Any], podcast_config: Dict[str, Any], episode_id: str = None, content_metrics: Dict[str, Any] = None
-    ) -> str:
-        """Generate natural multi-speaker conversation script using Gemini AI with clean content"""
-
-        # Get configuration
-        speaker1_role = podcast_config.get("speaker1_role", "Host")
-        speaker2_role = podcast_config.get("speaker2_role", "Expert")
-        speaker1_gender = podcast_config.get("speaker1_gender", "male")
-        speaker2_gender = podcast_config.get("speaker2_gender", "female")
-        podcast_name = podcast_config.get("podcast_name", "Daily Podcast")
-        target_duration = podcast_config.get("target_duration_minutes", 10)
-        language = podcast_config.get("language", "en")
-        additional_instructions = podcast_config.get("additional_instructions", "")
-
-        # Get content type for TTS markup instructions
-        content_type = 'general'
-        if podcast_config.get('content_analysis'):
-            content_analysis = podcast_config['content_analysis']
-            if hasattr(content_analysis, 'content_type'):
-                content_type = content_analysis.content_type.value
-
-        # Build the prompt with clean content
-        prompt = self._build_script_prompt(
-            clean_content=clean_content,
-            language=language,
-            speaker1_role=speaker1_role,
-            speaker2_role=speaker2_role,
-            speaker1_gender=speaker1_gender,
-            speaker2_gender=speaker2_gender,
-            podcast_name=podcast_name,
-            target_duration=target_duration,
-            additional_instructions=additional_instructions,
-            episode_id=episode_id,
-            content_analysis=podcast_config.get('content_analysis'),
-            content_type=content_type,
-            content_metrics=content_metrics,
-            podcast_config=podcast_config
-        )
-
-        try:
-            # Generate script using Gemini
-            # Temperature 0.7: Balanced between creativity and coherence
-            # - Lower than 0.9 reduces excessive filler content
-            # - High enough to maintain natural conversational variation
-            # - Helps maintain tighter focus on source material
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.7,  # Reduced from 0.9 to prevent slow, wordy dialogue
-                    max_output_tokens=32768,  # Increased to allow longer scripts
-                )
-            )
-
-            if response.text:
-                cleaned_script = response.text.strip()
-                # Validate script doesn't contain placeholders
-                self._validate_script_content(cleaned_script)
-                return cleaned_script
-
-            raise Exception("No script generated by Gemini")
-
-        except Exception as e:
-            logger.error(f"[GEMINI_SCRIPT] Error generating script: {str(e)}")
-            raise Exception(f"Failed to generate conversation script: {str(e)}")
-
-    def _build_script_prompt(
-        self,
-        clean_content: Dict[str, Any],
-        language: str,
-        speaker1_role: str,
-        speaker2_role: str,
-        speaker1_gender: str,
-        speaker2_gender: str,
-        podcast_name: str,
-        target_duration: int,
-        additional_instructions: str,
-        episode_id: str = None,
-        content_analysis: str = None,
-        content_type: str = 'general',
-        content_metrics: Dict[str, Any] = None,
-        podcast_config: Dict[str, Any] = None
-    ) -> str:
-        """Build the conversation script generation prompt with clean content and adaptive instructions"""
-        
-        # Get voice information for this episode
-        voice_info = ""
-        if episode_id:
-            from shared.services.voice_config import VoiceConfigManager
-            voice_manager = VoiceConfigManager()
-            
-            # Get distinct voices that will be used for both speakers
-            # NOTE: Using generic role names to match TTS client expectations
-            speaker1_voice, speaker2_voice = voice_manager.get_distinct_voices_for_speakers(
-                language=language,
-                speaker1_gender=speaker1_gender,
-                speaker2_gender=speaker2_gender,
-                speaker1_role=speaker1_role,  # Use actual role names for consistency
-                speaker2_role=speaker2_role,  # Use actual role names for consistency
-                episode_id=episode_id,
-                randomize_speaker2=True
-            )
-            
-            voice_info = f"""
-VOICE SELECTION FOR THIS EPISODE:
-- {speaker1_role} will use voice: {speaker1_voice} (consistent across episodes)
-- {speaker2_role} will use voice: {speaker2_voice} (unique to this episode)
-
-This voice information should influence the conversation style and personality traits."""
-
-        # Content analysis information
-        content_info = ""
-        if content_analysis:
-            content_info = f"""
-CONTENT ANALYSIS:
-- Content Type: {content_analysis.get('content_type', 'general')}
-- Specific Speaker Role: {content_analysis.get('specific_role', speaker2_role)}
-- Role Description: {content_analysis.get('role_description', 'Expert in the field')}
-- Analysis Confidence: {content_analysis.get('confidence', 0.5):.2f}
-- Selection Reasoning: {content_analysis.get('reasoning', 'Dynamic role selection based on content')}
-
-The {content_analysis.get('specific_role', speaker2_role)} should demonstrate expertise as: {content_analysis.get('role_description', 'an expert in the field')}.
-Focus on insights and analysis that match this specific expertise area within {content_analysis.get('content_type', 'general')} topics."""
-
-        # Topic analysis and conversation structure
-        topic_structure_info = ""
-        topic_analysis = podcast_config.get('topic_analysis', {}) if podcast_config else {}
-        if topic_analysis and topic_analysis.get('topics'):
-            topics = topic_analysis.get('topics', [])
-            structure = topic_analysis.get('conversation_structure', 'linear')
-            transition_style = topic_analysis.get('transition_style', 'natural')
-
-            topic_list = "\n".join([
-                f"   {i+1}. {t['topic_name']} (importance: {t['importance']}, duration: {t['suggested_duration']})"
-                for i, t in enumerate(topics)
-            ])
-
-            structure_descriptions = {
-                'single_topic': 'Focus deeply on one main subject throughout',
-                'linear': 'Cover topics in chronological or logical order',
-                'thematic_clusters': 'Group related topics together for thematic flow',
-                'narrative_arc': 'Build a story from introduction to climax to conclusion'
-            }
-
-            transition_guidance = {
-                'seamless': 'Make topics flow naturally into each other without explicit announcements',
-                'explicit': 'Use clear transitions like "Moving on to...", "Another interesting topic is..."',
-                'narrative': 'Connect topics with a story thread, showing cause-effect relationships',
-                'contrast': 'Highlight differences between topics for added interest'
-            }
-
-            topic_structure_info = f"""
-CONVERSATION STRUCTURE & TOPICS:
-
-Identified Topics ({len(topics)} topics):
-{topic_list}
-
-Recommended Structure: {structure}
-- {structure_descriptions.get(structure, 'Cover topics naturally')}
-
-Transition Style: {transition_style}
-- {transition_guidance.get(transition_style, 'Use natural transitions')}
-
-TOPIC COVERAGE GUIDELINES:
-1. **High Importance Topics**: Spend 40-50% of conversation time, multiple exchanges, deep dive
-2. **Medium Importance Topics**: Spend 25-35% of time, adequate coverage
-3. **Low Importance Topics**: Spend 10-20% of time, brief mentions or weave into other topics
-
-TRANSITION TECHNIQUES:
-- **Between High Topics**: Use [pause long], build excitement: "Now, here's something really interesting..."
-- **To Medium Topics**: Natural segues: "Speaking of that...", "This reminds me of..."
-- **Brief Topics**: Quick mentions: "By the way, there's also...", "Oh, and..."
-- **Thematic Links**: Find connections: "What's interesting is how this relates to..."
-
-PACING:
-- Start with high-energy opening on most important topic
-- Vary energy levels throughout - don't stay at one intensity
-- Build to exciting moments when appropriate
-- End with strong takeaway or call-to-action
-
-Remember: The conversation should feel like a natural discussion, not a checklist!
-"""
-
-        # Get the specific role from content analysis or fallback to configured role
-        actual_speaker2_role = content_analysis.get('specific_role', speaker2_role) if content_analysis else speaker2_role
-        
-        # Extract channel information for natural naming
-        channels = clean_content.get('summary', {}).get('channels', [])
-        channel_context = f" (discussing content from {', '.join(channels)})" if channels else ""
-
-        # Add adaptive instructions based on content metrics
-        adaptive_instructions = ""
-        if content_metrics:
-            strategy = content_metrics['strategy']
-            target_ratio = content_metrics['target_ratio']
-            message_count = content_metrics['message_count']
-            total_chars = content_metrics['total_chars']
-            target_chars = content_metrics['target_script_chars']
-
-            if strategy == 'compression':
-                adaptive_instructions = f"""
-⚠️ CONTENT VOLUME ALERT: HIGH ({message_count} messages, {total_chars} characters)
-
-**🎯 COMPRESSION STRATEGY REQUIRED:**
-1. Coverage Mode: SELECTIVE
-   - Focus ONLY on main topics (5-7 key topics maximum)
-   - Prioritize: Breaking news, important statements, key facts
-   - SKIP: Minor details, redundant information, less significant events
-
-2. Detail Level: SUMMARY
-   - Each topic: 2-3 exchanges maximum
-   - Use concise summaries, avoid lengthy explanations
-   - Stay focused and direct
-
-3. Target Script Length: ~{target_chars} characters
-   - Source content: {total_chars} characters
-   - Target ratio: {target_ratio:.0%} (compression required - script should be SHORTER than source)
-   - This means: Be MORE CONCISE than the source material
-
-4. Quality Guidelines:
-   ✅ DO: Cover 5-7 main topics thoroughly but briefly
-   ✅ DO: Maintain natural conversation flow
-   ❌ DON'T: Try to mention all {message_count} messages
-   ❌ DON'T: Add filler or unnecessary elaboration
-   ❌ DON'T: Invent details not present in the source
-"""
-            elif strategy == 'expansion':
-                adaptive_instructions = f"""
-📝 CONTENT VOLUME: LOW ({message_count} messages, {total_chars} characters)
-
-**🎯 EXPANSION STRATEGY - STAY GROUNDED:**
-1. Coverage Mode: COMPREHENSIVE
-   - Cover ALL topics from the source material
-   - Don't leave out any of the {message_count} messages
-
-2. Detail Level: DETAILED
-   - Each topic: 3-5 exchanges
-   - Add relevant context from general knowledge
-   - Discuss implications and significance
-   - Include examples when appropriate
-
-3. Target Script Length: ~{target_chars} characters
-   - Source content: {total_chars} characters
-   - Target ratio: {target_ratio:.0%} (moderate expansion allowed)
-   - This means: You can elaborate somewhat on the source material
-
-4. CRITICAL - Avoid "Filler" Content:
-   ✅ DO: Add relevant context that enhances understanding
-   ✅ DO: Discuss implications of the facts presented
-   ✅ DO: Maintain engaging conversation flow
-   ❌ DON'T: Invent facts not in source material
-   ❌ DON'T: Add unrelated tangents
-   ❌ DON'T: Use generic filler phrases just to reach length
-   ❌ DON'T: Fabricate quotes or statistics
-
-**REMEMBER: All facts and core information MUST come from the source material. Only context and implications can be added from general knowledge.**
-"""
-            else:  # balanced
-                adaptive_instructions = f"""
-⚖️ CONTENT VOLUME: BALANCED ({message_count} messages, {total_chars} characters)
-
-**🎯 BALANCED STRATEGY:**
-1. Coverage Mode: NATURAL
-   - Cover all main topics naturally
-   - Include important details
-
-2. Detail Level: MODERATE
-   - Each topic: 3-4 exchanges
-   - Natural level of detail
-
-3. Target Script Length: ~{target_chars} characters
-   - Source content: {total_chars} characters
-   - Target ratio: {target_ratio:.0%} (aim for natural 1:1 ratio)
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+
+import orjson
+from google import genai
+from google.genai import types
+from shared.utils.logging import get_logger
+from shared.services.voice_config import VoiceConfigManager
+from services.content_metrics import ContentMetrics, ContentPrioritizer
 
-4. Guidelines:
-   ✅ DO: Maintain natural conversation flow
-   ✅ DO: Stay faithful to source material
-   ❌ DON'T: Over-compress or over-expand
-"""
+logger = get_logger(__name__)
 
-        # Build comprehensive prompt
-        conversation_prompt = f"""
+# Content metrics + prioritized messages kept per warm container (retries/reprocesses)
+CONTENT_PLAN_CACHE_SIZE = 32
+
+# Reuse a generated script when the exact same prompt is seen again on a warm container
+# (opt-in: a reprocess normally expects a fresh generation)
+GEMINI_SCRIPT_CACHE = os.getenv("GEMINI_SCRIPT_CACHE", "false").lower() == "true"
+SCRIPT_CACHE_SIZE = 16
+
+# Output token budget derived from the longer of the content-based target length and the
+# requested duration (mixed Hebrew/English + markup heuristic). A truncated generation is
+# retried once with the full cap.
+SCRIPT_CHARS_PER_TOKEN = 3.5
+SPOKEN_CHARS_PER_MINUTE = 900
+SCRIPT_TOKEN_OVERHEAD = 512
+SCRIPT_TOKEN_MARGINS = {'compression': 1.5, 'expansion': 2.5}
+DEFAULT_SCRIPT_TOKEN_MARGIN = 2
+MIN_SCRIPT_OUTPUT_TOKENS = 8192
+MAX_SCRIPT_OUTPUT_TOKENS = 32768
+
+# Prompts estimated above this many tokens (~90% of the model's 1M context window) are
+# rebuilt from a smaller priority subset instead of being sent and rejected
+MAX_PROMPT_TOKENS_ESTIMATE = 900_000
+PROMPT_CHARS_PER_TOKEN = 3
+OVERSIZE_PROMPT_PRIORITY_PERCENTAGE = 0.4
+
+
+class ScriptPlaceholderError(Exception):
+    """
+    Generated script contains placeholder text (incomplete generation). Raised while the
+    script is still streaming so the rest of the generation isn't paid for.
+    """
+    pass
+
+
+class ScriptTruncatedError(Exception):
+    """
+    Generation stopped at max_output_tokens, so the script is incomplete and must not be
+    cached or sent to TTS.
+    """
+    pass
+
+
+class _ContentView(NamedTuple):
+    """Messages (possibly prioritized) and summary handed to the prompt builders"""
+    messages: List[Dict[str, Any]]
+    summary: Dict[str, Any]
+
+
+class _PromptParts(NamedTuple):
+    """Prompt split into the per-podcast static scaffold and the episode-specific tail"""
+    static_prefix: str
+    dynamic_suffix: str
+
+
+# Script prompts. Each scaffold depends only on the podcast's language, roles, genders and
+# content type, so it is byte-identical across that podcast's episodes and leads the prompt
+# (a stable prefix for Gemini's implicit caching). The episode-specific sections follow it
+# under EPISODE_PROMPT_HEADER.
+MULTI_SPEAKER_PROMPT_SCAFFOLD = """
 You are an expert podcast script writer specializing in NATURAL, UNSCRIPTED-SOUNDING conversations between two speakers.
 
-{content_info}
-
-{topic_structure_info}
-
-{voice_info}
-
-{adaptive_instructions}
-
 CREATE AN AUTHENTIC, HUMAN-LIKE CONVERSATION SCRIPT with the following specifications:
 
-**PODCAST DETAILS:**
-- Podcast Name: {podcast_name}
-- Language: {language}
-- Target Duration: {target_duration} minutes
-- Episode Context: {channel_context}
-
 **SPEAKER PERSONALITIES:**
 - **{speaker1_role}** ({speaker1_gender} voice):
   * Curious and engaging host persona
@@ -524,10 +156,7 @@ Use markup techniques strategically to enhance natural conversation flow:
    - "אז מה שמעניין זה..." (clean, no unnecessary pauses)
 
 5. **Content-Specific Markup**:
-   {f"- **News Content**: [emphasis] for breaking news, [pause] before major announcements" if content_type == 'news' else ""}
-   {f"- **Technology Content**: [thoughtful] for complex explanations, [excited] for innovations" if content_type == 'technology' else ""}
-   {f"- **Entertainment Content**: [amused] for funny moments, [excited] for dramatic reveals" if content_type == 'entertainment' else ""}
-   {f"- **Finance Content**: [emphasis] on numbers, [pause] before key statistics" if content_type == 'finance' else ""}
+   {content_type_markup}
 
 6. **Conversation Dynamics**:
    - Interruptions: Mid-sentence speaker changes for natural flow
@@ -545,227 +174,404 @@ Use markup techniques strategically to enhance natural conversation flow:
    - Minimal fillers: "you know", "I mean" (maximum 1-2 per speaker turn)
    - Hebrew equivalents: "אז", "בעצם" (use naturally, not in every sentence)
 
-3. **Conversational Dynamics**:
-   - Speakers should interrupt naturally when excited
-   - Build on each other's ideas: "Exactly! And to add to that..."
-   - Ask follow-up questions that show genuine curiosity
-   - Include small talk and banter between topics
-   - React authentically: "Wow!", "No way!", "That's wild!", "באמת?!", "וואו!"
+3. **Conversational Dynamics**:
+   - Speakers should interrupt naturally when excited
+   - Build on each other's ideas: "Exactly! And to add to that..."
+   - Ask follow-up questions that show genuine curiosity
+   - Include small talk and banter between topics
+   - React authentically: "Wow!", "No way!", "That's wild!", "באמת?!", "וואו!"
+
+4. **Pacing and Energy** (maintain dynamic, engaging tempo):
+   - Start with high energy in opening
+   - Keep pace brisk and engaging - avoid slow, plodding explanations
+   - Use [extremely fast] sparingly for listing or excited moments
+   - Use [thoughtful] for complex topics without adding [pause]
+   - Build to exciting moments with energy, not artificial pauses
+
+5. **Personality Consistency**:
+   - {speaker1_role} should sound curious, ask questions, guide the conversation
+   - {actual_speaker2_role} should share knowledge but remain approachable
+   - Each speaker maintains consistent "voice" throughout
+   - Include personal touches: "That reminds me of...", "I recently read..."
+
+6. **Content Integration**:
+   - Weave facts naturally into conversation, don't list them
+   - Use analogies and examples to explain complex ideas
+   - Connect different topics with natural transitions
+   - Reference earlier points: "Like you mentioned earlier..."
+
+7. **TTS Markup Integration** (strategic use for impact):
+   - Apply markup naturally - quality over quantity
+   - Use 1-2 emotion tags per speaker turn (not every sentence)
+   - Prioritize [excited], [thoughtful], [emphasis] for key moments
+   - Use [pause] rarely - only for major topic transitions
+
+**OUTPUT FORMAT:**
+Provide ONLY the conversation script with embedded TTS markup. No explanations or metadata.
+Use this format (the roles are IDENTIFIERS ONLY, not names to be spoken):
+
+{speaker1_role}: [pause short] Opening statement about the topic...
+{actual_speaker2_role}: [pause] Response with [emphasis]key point[/emphasis]...
+{speaker1_role}: That's interesting! Tell me more...
+{actual_speaker2_role}: [pause short] Well, let me explain...
+
+REMEMBER: The script content should NEVER include the speakers' names or invented names. The roles ({speaker1_role}, {actual_speaker2_role}) are only format markers.
+
+---
+
+**EXAMPLES OF NATURAL DIALOGUE PATTERNS:**
+
+Example 1 - Excited Discovery (English):
+{speaker1_role}: [excited] Wait, so you're telling me this actually happened? That's incredible!
+{actual_speaker2_role}: [amused] I know, right? When I first heard about it, I thought, no way this is real.
+{speaker1_role}: [curious] Okay, so walk me through this... how did it all start?
+
+Example 2 - Thoughtful Explanation (English):
+{actual_speaker2_role}: [thoughtful] Well, it's a bit more complex than that. Think of it this way...
+{speaker1_role}: Okay, I think I'm following.
+{actual_speaker2_role}: Right! So basically, what we're seeing is... actually, let me give you an example.
+
+Example 3 - Natural Hebrew Conversation:
+{speaker1_role}: [excited] רגע, אז אתה אומר שזה באמת קרה? זה לא יאומן!
+{actual_speaker2_role}: [amused] כן! גם אני בהתחלה חשבתי, בטח זה לא אמיתי.
+{speaker1_role}: [curious] אוקיי, אז תסביר לי... איך זה התחיל?
+{actual_speaker2_role}: [thoughtful] אז בעצם, זה קצת יותר מסובך. תחשוב על זה ככה...
+
+Example 4 - Building on Each Other:
+{speaker1_role}: That's a really good point about the technology side.
+{actual_speaker2_role}: Exactly! And to add to that, there's also the human factor we need to consider.
+{speaker1_role}: Oh, like the [emphasis]user experience[/emphasis] aspect?
+{actual_speaker2_role}: [excited] Yes! You nailed it. That's exactly what I'm talking about.
+
+Example 5 - Natural Interruption:
+{actual_speaker2_role}: So the main issue here is that the system wasn't designed to—
+{speaker1_role}: [excited] Wait wait wait, before you continue, can you clarify what you mean by "system"?
+{actual_speaker2_role}: Oh, good question! I'm talking about the entire infrastructure that...
+
+KEY PATTERNS TO EMULATE:
+- Start strong with energy and curiosity
+- Layer in emotional markers authentically
+- Use [pause] only for major transitions (1-2 per topic maximum)
+- Build natural back-and-forth rhythm without excessive pauses
+- Keep dialogue tight and focused - avoid filler
+- Vary sentence length and structure
+- Add connective tissue between topics without slowing pace
+
+"""
+
+EPISODE_PROMPT_HEADER = """
+---
+
+**EPISODE-SPECIFIC CONTEXT:**
+"""
+
+MULTI_SPEAKER_PROMPT_EPISODE_BODY = """
+
+**PODCAST DETAILS:**
+- Podcast Name: {podcast_name}
+- Language: {language}
+- Target Duration: {target_duration} minutes
+- Episode Context: {channel_context}
+
+**CONTENT TO DISCUSS:**
+{formatted_content}
+
+{additional_instructions}
+
+Now, create the conversation script following ALL the guidelines above:
+"""
+
+SINGLE_SPEAKER_PROMPT_SCAFFOLD = """
+You are an expert podcast script writer specializing in NATURAL, ENGAGING MONOLOGUE content for solo podcasts.
+
+CREATE AN AUTHENTIC, CONVERSATIONAL MONOLOGUE SCRIPT with the following specifications:
+
+**SPEAKER PERSONALITY:**
+- **{speaker1_role}** ({speaker1_gender} voice):
+  * Engaging, knowledgeable, conversational tone
+  * Talks directly to the audience using "you"
+  * Natural and authentic delivery
+  * Personality: Friendly, authoritative yet approachable, enthusiastic
+
+**MONOLOGUE STRUCTURE:**
+1. **Hook (30-60 sec)**: Grab attention with compelling opening, set the stage
+2. **Introduction**: Preview today's content clearly, explain what the audience will learn
+3. **Main Content**: Deep dive organized into clear sections/topics
+4. **Transitions**: Use natural connectors: "Let me explain...", "Here's what's interesting...", "Now, you might be wondering..."
+5. **Closing**: Summary with key takeaways, strong ending
+
+**NARRATIVE TECHNIQUES FOR SOLO DELIVERY:**
+- **Direct Address**: "You know what I find fascinating?", "If you're like me..."
+- **Rhetorical Questions**: "So what does this mean for us?", "Why is this important?"
+- **Personal Insights**: "In my experience...", "What struck me about this..."
+- **Storytelling**: Present information as a journey, build suspense
+- **Audience Engagement**: "Think about this...", "Imagine if..."
+
+⚠️ **CRITICAL: NO SPEAKER NAMES IN CONTENT**
+- The speaker role "{speaker1_role}" is ONLY for identifying who speaks in the script format
+- DO NOT invent names for the speaker (no "יובל", "רונית", "Michael", "Sarah", etc.)
+- DO NOT include greetings with names (no "שלום יובל", "Hi Michael")
+- DO NOT use placeholder names like "[שם]", "[name]", "___"
+- Keep the delivery natural and direct without personal names
+
+**TTS MARKUP FOR EXPRESSIVE MONOLOGUE DELIVERY:**
+Use markup strategically to enhance natural delivery:
+
+1. **Timing and Rhythm** (use sparingly):
+   - [pause] - For significant topic transitions or dramatic moments
+   - [extremely fast] - For excited lists or rapid-fire facts
+
+   Examples:
+   - "That's incredible! [pause] Let me explain why."
+   - "אז מה שקורה פה זה..." (natural flow, no pause needed)
+
+2. **Emotional Delivery & Tone**:
+   - [excited] - High energy, enthusiastic delivery
+   - [curious] - Inquisitive, exploratory tone
+   - [thoughtful] - Reflective, contemplative pace
+   - [amused] - Light, humorous tone
+
+   Examples:
+   - "{speaker1_role}: [excited] You won't believe what happened next!"
+   - "{speaker1_role}: [thoughtful] Well, when you think about it..."
+   - "[amused] I know, it sounds crazy, right?"
+
+3. **Emphasis and Stress**:
+   - [emphasis]text[/emphasis] - Stress important words
+   - Use for: numbers, key terms, surprising facts
+
+   Examples:
+   - "This affected [emphasis]millions[/emphasis] of users"
+   - "The [emphasis]most important[/emphasis] thing to understand"
+   - "זה השפיע על [emphasis]מיליוני[/emphasis] משתמשים"
+
+4. **Natural Speech Patterns** (use very sparingly):
+   - Occasional filler words: "you know", "I mean" (1-2 per topic maximum)
+   - Conversational connectors: "by the way", "speaking of which"
+
+   Examples:
+   - "So, what I found interesting was..." (direct)
+   - "Yeah, I mean, that's exactly what happened" (minimal filler)
+   - "אז מה שמעניין זה..." (clean)
+
+5. **Content-Specific Markup**:
+   {content_type_markup}
+
+**SCRIPT REQUIREMENTS FOR AUTHENTIC MONOLOGUE:**
+
+1. **Language & Style**: Write entirely in {language} with conversational, unscripted-sounding tone
+
+2. **Natural Imperfections** (use strategically, not excessively):
+   - Occasional self-corrections: "This happened in 2023... no wait, 2024"
+   - Minimal fillers: "you know", "I mean" (1-2 per major section)
+   - Hebrew equivalents: "אז", "בעצם" (use naturally)
+
+3. **Engagement Dynamics**:
+   - Speak TO the audience, not AT them
+   - Use "you" to create connection
+   - Ask rhetorical questions: "What do you think happened?", "How would you react?"
+   - Share personal reactions: "I was surprised...", "This really struck me..."
 
 4. **Pacing and Energy** (maintain dynamic, engaging tempo):
    - Start with high energy in opening
-   - Keep pace brisk and engaging - avoid slow, plodding explanations
-   - Use [extremely fast] sparingly for listing or excited moments
-   - Use [thoughtful] for complex topics without adding [pause]
-   - Build to exciting moments with energy, not artificial pauses
-
-5. **Personality Consistency**:
-   - {speaker1_role} should sound curious, ask questions, guide the conversation
-   - {actual_speaker2_role} should share knowledge but remain approachable
-   - Each speaker maintains consistent "voice" throughout
-   - Include personal touches: "That reminds me of...", "I recently read..."
+   - Keep pace brisk and engaging
+   - Use [extremely fast] sparingly for excited moments
+   - Use [thoughtful] for complex topics
+   - Build to exciting moments with energy
 
-6. **Content Integration**:
-   - Weave facts naturally into conversation, don't list them
-   - Use analogies and examples to explain complex ideas
-   - Connect different topics with natural transitions
-   - Reference earlier points: "Like you mentioned earlier..."
+5. **Content Integration**:
+   - Weave facts naturally, don't list them
+   - Use analogies and examples
+   - Connect topics with natural transitions
+   - Reference earlier points: "As I mentioned earlier..."
 
-7. **TTS Markup Integration** (strategic use for impact):
+6. **TTS Markup Integration** (strategic use):
    - Apply markup naturally - quality over quantity
-   - Use 1-2 emotion tags per speaker turn (not every sentence)
-   - Prioritize [excited], [thoughtful], [emphasis] for key moments
-   - Use [pause] rarely - only for major topic transitions
-
-**CONTENT TO DISCUSS:**
-{self._format_clean_content_for_prompt(clean_content)}
-
-{additional_instructions}
+   - Use 1-2 emotion tags per major thought
+   - Prioritize [excited], [thoughtful], [emphasis]
+   - Use [pause] rarely - only for major transitions
 
 **OUTPUT FORMAT:**
-Provide ONLY the conversation script with embedded TTS markup. No explanations or metadata.
-Use this format (the roles are IDENTIFIERS ONLY, not names to be spoken):
+Provide ONLY the monologue script with embedded TTS markup. No explanations or metadata.
+Use this format (the role is an IDENTIFIER ONLY, not a name to be spoken):
 
-{speaker1_role}: [pause short] Opening statement about the topic...
-{actual_speaker2_role}: [pause] Response with [emphasis]key point[/emphasis]...
-{speaker1_role}: That's interesting! Tell me more...
-{actual_speaker2_role}: [pause short] Well, let me explain...
+{speaker1_role}: [excited] Opening statement that grabs attention...
+{speaker1_role}: [pause] Now, let me explain why this matters...
+{speaker1_role}: [emphasis]Key point[/emphasis] that you need to understand...
+{speaker1_role}: [thoughtful] When you think about it, what's really happening here is...
 
-REMEMBER: The script content should NEVER include the speakers' names or invented names. The roles ({speaker1_role}, {actual_speaker2_role}) are only format markers.
+REMEMBER: The script content should NEVER include the speaker's name or invented names. The role ({speaker1_role}) is only a format marker.
 
 ---
 
-**EXAMPLES OF NATURAL DIALOGUE PATTERNS:**
+**EXAMPLES OF NATURAL MONOLOGUE PATTERNS:**
 
-Example 1 - Excited Discovery (English):
-{speaker1_role}: [excited] Wait, so you're telling me this actually happened? That's incredible!
-{actual_speaker2_role}: [amused] I know, right? When I first heard about it, I thought, no way this is real.
-{speaker1_role}: [curious] Okay, so walk me through this... how did it all start?
+Example 1 - Engaging Opening (English):
+{speaker1_role}: [excited] Okay, so you won't believe what happened today in the tech world!
+{speaker1_role}: [pause] I'm talking about something that's going to change how we think about artificial intelligence.
+{speaker1_role}: [curious] Now, you might be wondering, what makes this so special?
 
 Example 2 - Thoughtful Explanation (English):
-{actual_speaker2_role}: [thoughtful] Well, it's a bit more complex than that. Think of it this way...
-{speaker1_role}: Okay, I think I'm following.
-{actual_speaker2_role}: Right! So basically, what we're seeing is... actually, let me give you an example.
+{speaker1_role}: [thoughtful] Let me break this down for you, because it's actually more interesting than it sounds.
+{speaker1_role}: Think of it this way... imagine you're trying to solve a really complex puzzle.
+{speaker1_role}: [emphasis]The key insight[/emphasis] here is that the traditional approach just doesn't work anymore.
 
-Example 3 - Natural Hebrew Conversation:
-{speaker1_role}: [excited] רגע, אז אתה אומר שזה באמת קרה? זה לא יאומן!
-{actual_speaker2_role}: [amused] כן! גם אני בהתחלה חשבתי, בטח זה לא אמיתי.
-{speaker1_role}: [curious] אוקיי, אז תסביר לי... איך זה התחיל?
-{actual_speaker2_role}: [thoughtful] אז בעצם, זה קצת יותר מסובך. תחשוב על זה ככה...
+Example 3 - Natural Hebrew Monologue:
+{speaker1_role}: [excited] אוקיי, אז לא תאמינו מה קרה היום בעולם הטכנולוגיה!
+{speaker1_role}: [pause] אני מדבר על משהו שעומד לשנות את הדרך שבה אנחנו חושבים על בינה מלאכותית.
+{speaker1_role}: [curious] עכשיו, אתם בטח שואלים את עצמכם, מה כל כך מיוחד בזה?
 
-Example 4 - Building on Each Other:
-{speaker1_role}: That's a really good point about the technology side.
-{actual_speaker2_role}: Exactly! And to add to that, there's also the human factor we need to consider.
-{speaker1_role}: Oh, like the [emphasis]user experience[/emphasis] aspect?
-{actual_speaker2_role}: [excited] Yes! You nailed it. That's exactly what I'm talking about.
+Example 4 - Building Narrative:
+{speaker1_role}: So here's where things get really interesting...
+{speaker1_role}: [pause] Remember what I said earlier about the pattern we were seeing?
+{speaker1_role}: [excited] Well, it turns out that [emphasis]everything[/emphasis] connects back to that!
 
-Example 5 - Natural Interruption:
-{actual_speaker2_role}: So the main issue here is that the system wasn't designed to—
-{speaker1_role}: [excited] Wait wait wait, before you continue, can you clarify what you mean by "system"?
-{actual_speaker2_role}: Oh, good question! I'm talking about the entire infrastructure that...
+Example 5 - Rhetorical Engagement:
+{speaker1_role}: [curious] Now, you might be thinking, "Why should I care about this?"
+{speaker1_role}: Great question! Let me tell you exactly why this matters to you.
+{speaker1_role}: [emphasis]The reality[/emphasis] is that this affects every single one of us.
 
 KEY PATTERNS TO EMULATE:
-- Start strong with energy and curiosity
+- Open with energy and intrigue
+- Speak directly to the audience using "you"
+- Use rhetorical questions for engagement
 - Layer in emotional markers authentically
-- Use [pause] only for major transitions (1-2 per topic maximum)
-- Build natural back-and-forth rhythm without excessive pauses
-- Keep dialogue tight and focused - avoid filler
+- Use [pause] only for major transitions (1-2 per topic)
+- Keep delivery tight and focused - avoid excessive filler
 - Vary sentence length and structure
-- Add connective tissue between topics without slowing pace
+- Build momentum through the narrative
 
-Now, create the conversation script following ALL the guidelines above:
 """
 
-        return conversation_prompt
-
-    def _build_single_speaker_prompt(
-        self,
-        clean_content: Dict[str, Any],
-        language: str,
-        speaker1_role: str,
-        speaker1_gender: str,
-        podcast_name: str,
-        target_duration: int,
-        additional_instructions: str,
-        episode_id: str = None,
-        content_analysis: str = None,
-        content_type: str = 'general',
-        content_metrics: Dict[str, Any] = None,
-        podcast_config: Dict[str, Any] = None
-    ) -> str:
-        """Build the single-speaker monologue script generation prompt with adaptive instructions"""
-
-        # Get voice information for this episode
-        voice_info = ""
-        if episode_id:
-            from shared.services.voice_config import VoiceConfigManager
-            voice_manager = VoiceConfigManager()
+SINGLE_SPEAKER_PROMPT_EPISODE_BODY = """
 
-            # Get voice for speaker1 only
-            speaker1_voice, _ = voice_manager.get_distinct_voices_for_speakers(
-                language=language,
-                speaker1_gender=speaker1_gender,
-                speaker2_gender='male',  # dummy, won't be used
-                speaker1_role=speaker1_role,
-                speaker2_role='Unused',  # dummy
-                episode_id=episode_id,
-                randomize_speaker2=False
-            )
+**PODCAST DETAILS:**
+- Podcast Name: {podcast_name}
+- Language: {language}
+- Target Duration: {target_duration} minutes
+- Episode Context: {channel_context}
 
-            voice_info = f"""
-VOICE SELECTION FOR THIS EPISODE:
-- {speaker1_role} will use voice: {speaker1_voice} (consistent voice)
+**CONTENT TO DISCUSS:**
+{formatted_content}
 
-This voice information should influence the delivery style and personality traits."""
+{additional_instructions}
 
-        # Content analysis information
-        content_info = ""
-        if content_analysis:
-            content_info = f"""
-CONTENT ANALYSIS:
-- Content Type: {content_analysis.get('content_type', 'general')}
-- Role Description: {content_analysis.get('role_description', 'Expert in the field')}
-- Analysis Confidence: {content_analysis.get('confidence', 0.5):.2f}
-- Selection Reasoning: {content_analysis.get('reasoning', 'Dynamic role selection based on content')}
+Now, create the monologue script following ALL the guidelines above:
+"""
 
-The {speaker1_role} should demonstrate expertise as: {content_analysis.get('role_description', 'an expert in the field')}.
-Focus on insights and analysis that match this specific expertise area within {content_analysis.get('content_type', 'general')} topics."""
+# Topic-analysis structure/transition guidance quoted into the episode section
+STRUCTURE_DESCRIPTIONS = {
+    'single_topic': 'Focus deeply on one main subject throughout',
+    'linear': 'Cover topics in chronological or logical order',
+    'thematic_clusters': 'Group related topics together for thematic flow',
+    'narrative_arc': 'Build a story from introduction to climax to conclusion'
+}
+
+MULTI_SPEAKER_TRANSITION_GUIDANCE = {
+    'seamless': 'Make topics flow naturally into each other without explicit announcements',
+    'explicit': 'Use clear transitions like "Moving on to...", "Another interesting topic is..."',
+    'narrative': 'Connect topics with a story thread, showing cause-effect relationships',
+    'contrast': 'Highlight differences between topics for added interest'
+}
+
+SINGLE_SPEAKER_TRANSITION_GUIDANCE = {
+    'seamless': 'Make topics flow naturally into each other',
+    'explicit': 'Use clear transitions like "Moving on to...", "Another interesting point..."',
+    'narrative': 'Connect topics with a story thread, showing cause-effect relationships',
+    'contrast': 'Highlight differences between topics for added interest'
+}
+
+# Content-type-specific TTS markup guidance (one line, only for known content types)
+CONTENT_TYPE_MARKUP = {
+    'news': "- **News Content**: [emphasis] for breaking news, [pause] before major announcements",
+    'technology': "- **Technology Content**: [thoughtful] for complex explanations, [excited] for innovations",
+    'entertainment': "- **Entertainment Content**: [amused] for funny moments, [excited] for dramatic reveals",
+    'finance': "- **Finance Content**: [emphasis] on numbers, [pause] before key statistics",
+}
+
+# Adaptive length/coverage instructions per content strategy (str.format templates)
+MULTI_SPEAKER_ADAPTIVE_TEMPLATES = {
+    'compression': """
+⚠️ CONTENT VOLUME ALERT: HIGH ({message_count} messages, {total_chars} characters)
 
-        # Topic analysis and conversation structure
-        topic_structure_info = ""
-        topic_analysis = podcast_config.get('topic_analysis', {}) if podcast_config else {}
-        if topic_analysis and topic_analysis.get('topics'):
-            topics = topic_analysis.get('topics', [])
-            structure = topic_analysis.get('conversation_structure', 'linear')
-            transition_style = topic_analysis.get('transition_style', 'natural')
+**🎯 COMPRESSION STRATEGY REQUIRED:**
+1. Coverage Mode: SELECTIVE
+   - Focus ONLY on main topics (5-7 key topics maximum)
+   - Prioritize: Breaking news, important statements, key facts
+   - SKIP: Minor details, redundant information, less significant events
 
-            topic_list = "\n".join([
-                f"   {i+1}. {t['topic_name']} (importance: {t['importance']}, duration: {t['suggested_duration']})"
-                for i, t in enumerate(topics)
-            ])
+2. Detail Level: SUMMARY
+   - Each topic: 2-3 exchanges maximum
+   - Use concise summaries, avoid lengthy explanations
+   - Stay focused and direct
 
-            structure_descriptions = {
-                'single_topic': 'Focus deeply on one main subject throughout',
-                'linear': 'Cover topics in chronological or logical order',
-                'thematic_clusters': 'Group related topics together for thematic flow',
-                'narrative_arc': 'Build a story from introduction to climax to conclusion'
-            }
+3. Target Script Length: ~{target_chars} characters
+   - Source content: {total_chars} characters
+   - Target ratio: {target_ratio:.0%} (compression required - script should be SHORTER than source)
+   - This means: Be MORE CONCISE than the source material
 
-            transition_guidance = {
-                'seamless': 'Make topics flow naturally into each other',
-                'explicit': 'Use clear transitions like "Moving on to...", "Another interesting point..."',
-                'narrative': 'Connect topics with a story thread, showing cause-effect relationships',
-                'contrast': 'Highlight differences between topics for added interest'
-            }
+4. Quality Guidelines:
+   ✅ DO: Cover 5-7 main topics thoroughly but briefly
+   ✅ DO: Maintain natural conversation flow
+   ❌ DON'T: Try to mention all {message_count} messages
+   ❌ DON'T: Add filler or unnecessary elaboration
+   ❌ DON'T: Invent details not present in the source
+""",
+    'expansion': """
+📝 CONTENT VOLUME: LOW ({message_count} messages, {total_chars} characters)
 
-            topic_structure_info = f"""
-MONOLOGUE STRUCTURE & TOPICS:
+**🎯 EXPANSION STRATEGY - STAY GROUNDED:**
+1. Coverage Mode: COMPREHENSIVE
+   - Cover ALL topics from the source material
+   - Don't leave out any of the {message_count} messages
 
-Identified Topics ({len(topics)} topics):
-{topic_list}
+2. Detail Level: DETAILED
+   - Each topic: 3-5 exchanges
+   - Add relevant context from general knowledge
+   - Discuss implications and significance
+   - Include examples when appropriate
 
-Recommended Structure: {structure}
-- {structure_descriptions.get(structure, 'Cover topics naturally')}
+3. Target Script Length: ~{target_chars} characters
+   - Source content: {total_chars} characters
+   - Target ratio: {target_ratio:.0%} (moderate expansion allowed)
+   - This means: You can elaborate somewhat on the source material
 
-Transition Style: {transition_style}
-- {transition_guidance.get(transition_style, 'Use natural transitions')}
+4. CRITICAL - Avoid "Filler" Content:
+   ✅ DO: Add relevant context that enhances understanding
+   ✅ DO: Discuss implications of the facts presented
+   ✅ DO: Maintain engaging conversation flow
+   ❌ DON'T: Invent facts not in source material
+   ❌ DON'T: Add unrelated tangents
+   ❌ DON'T: Use generic filler phrases just to reach length
+   ❌ DON'T: Fabricate quotes or statistics
 
-TOPIC COVERAGE GUIDELINES FOR MONOLOGUE:
-1. **High Importance Topics**: Spend 40-50% of time, deep dive with thorough exploration
-2. **Medium Importance Topics**: Spend 25-35% of time, adequate coverage
-3. **Low Importance Topics**: Spend 10-20% of time, brief mentions or weave into other topics
+**REMEMBER: All facts and core information MUST come from the source material. Only context and implications can be added from general knowledge.**
+""",
+    'balanced': """
+⚖️ CONTENT VOLUME: BALANCED ({message_count} messages, {total_chars} characters)
 
-MONOLOGUE TRANSITION TECHNIQUES:
-- **Between High Topics**: Use [pause], build anticipation: "Now, here's something really interesting..."
-- **To Medium Topics**: Natural segues: "This reminds me of...", "Let me explain..."
-- **Brief Topics**: Quick mentions: "By the way...", "Oh, and another thing..."
-- **Thematic Links**: Find connections: "What's interesting is how this relates to..."
+**🎯 BALANCED STRATEGY:**
+1. Coverage Mode: NATURAL
+   - Cover all main topics naturally
+   - Include important details
 
-PACING FOR SOLO DELIVERY:
-- Start with high-energy opening to grab attention
-- Vary energy levels throughout - don't stay at one intensity
-- Use rhetorical questions to engage the audience
-- Build to exciting moments when appropriate
-- End with strong takeaway or call-to-action
+2. Detail Level: MODERATE
+   - Each topic: 3-4 exchanges
+   - Natural level of detail
 
-Remember: Keep the monologue engaging and conversational, as if speaking directly to a friend!
-"""
+3. Target Script Length: ~{target_chars} characters
+   - Source content: {total_chars} characters
+   - Target ratio: {target_ratio:.0%} (aim for natural 1:1 ratio)
 
-        # Extract channel information
-        channels = clean_content.get('summary', {}).get('channels', [])
-        channel_context = f" (discussing content from {', '.join(channels)})" if channels else ""
+4. Guidelines:
+   ✅ DO: Maintain natural conversation flow
+   ✅ DO: Stay faithful to source material
+   ❌ DON'T: Over-compress or over-expand
+""",
+}
 
-        # Add adaptive instructions based on content metrics (CRITICAL - same logic as multi-speaker)
-        adaptive_instructions = ""
-        if content_metrics:
-            strategy = content_metrics['strategy']
-            target_ratio = content_metrics['target_ratio']
-            message_count = content_metrics['message_count']
-            total_chars = content_metrics['total_chars']
-            target_chars = content_metrics['target_script_chars']
-
-            if strategy == 'compression':
-                adaptive_instructions = f"""
+SINGLE_SPEAKER_ADAPTIVE_TEMPLATES = {
+    'compression': """
 ⚠️ CONTENT VOLUME ALERT: HIGH ({message_count} messages, {total_chars} characters)
 
 **🎯 COMPRESSION STRATEGY REQUIRED:**
@@ -790,9 +596,8 @@ Remember: Keep the monologue engaging and conversational, as if speaking directl
    ❌ DON'T: Try to mention all {message_count} messages
    ❌ DON'T: Add filler or unnecessary elaboration
    ❌ DON'T: Invent details not present in the source
-"""
-            elif strategy == 'expansion':
-                adaptive_instructions = f"""
+""",
+    'expansion': """
 📝 CONTENT VOLUME: LOW ({message_count} messages, {total_chars} characters)
 
 **🎯 EXPANSION STRATEGY - STAY GROUNDED:**
@@ -821,9 +626,8 @@ Remember: Keep the monologue engaging and conversational, as if speaking directl
    ❌ DON'T: Fabricate quotes or statistics
 
 **REMEMBER: All facts and core information MUST come from the source material. Only context and implications can be added from general knowledge.**
-"""
-            else:  # balanced
-                adaptive_instructions = f"""
+""",
+    'balanced': """
 ⚖️ CONTENT VOLUME: BALANCED ({message_count} messages, {total_chars} characters)
 
 **🎯 BALANCED STRATEGY:**
@@ -843,284 +647,786 @@ Remember: Keep the monologue engaging and conversational, as if speaking directl
    ✅ DO: Maintain natural monologue flow
    ✅ DO: Stay faithful to source material
    ❌ DON'T: Over-compress or over-expand
-"""
+""",
+}
+
+# Common placeholder patterns in Hebrew and English (generated scripts must not contain them)
+PLACEHOLDER_PATTERNS = (
+    "שם המשפחה",  # family name in Hebrew
+    "שם פרטי",     # first name in Hebrew
+    "[שם האורח]",  # name placeholder
+    "[שם]",        # name placeholder
+    "[insert",     # common bracket placeholders
+    "[name]",      # name placeholder
+    "[family name]", # family name placeholder
+    "[first name]", # first name placeholder
+    "___",         # underscores for filling
+    "וכו'",        # Hebrew etc. (often indicates incomplete content)
+    "TBD",         # To Be Determined
+    "TODO",        # TODO items
+    "<placeholder>", # XML-style placeholders
+    "{name}",      # Template-style placeholders
+    "{family}",    # Template-style placeholders
+)
+
+# One case-insensitive alternation over all patterns (no lowercased copy of the script needed)
+_PLACEHOLDER_RE = re.compile('|'.join(re.escape(pattern) for pattern in PLACEHOLDER_PATTERNS), re.IGNORECASE)
+# Characters carried over between streamed chunks so patterns split across chunks are found
+_PLACEHOLDER_OVERLAP = max(len(pattern) for pattern in PLACEHOLDER_PATTERNS) - 1
+
+
+def _format_adaptive_instructions(templates: Dict[str, str], content_metrics: Optional[Dict[str, Any]]) -> str:
+    """Fill the strategy's template (anything not compression/expansion is balanced)"""
+    if not content_metrics:
+        return ""
+    template = templates.get(content_metrics['strategy'], templates['balanced'])
+    return template.format(
+        message_count=content_metrics['message_count'],
+        total_chars=content_metrics['total_chars'],
+        target_chars=content_metrics['target_script_chars'],
+        target_ratio=content_metrics['target_ratio'],
+    )
+
+
+def _script_output_token_budget(content_metrics: Optional[Dict[str, Any]], target_duration: Any = None) -> int:
+    """max_output_tokens sized to the target script length and duration (full cap without metrics)"""
+    if not content_metrics:
+        return MAX_SCRIPT_OUTPUT_TOKENS
+    try:
+        duration_chars = float(target_duration or 0) * SPOKEN_CHARS_PER_MINUTE
+    except (TypeError, ValueError):
+        duration_chars = 0
+    target_chars = max(content_metrics['target_script_chars'], duration_chars)
+    target_tokens = int(target_chars / SCRIPT_CHARS_PER_TOKEN) + SCRIPT_TOKEN_OVERHEAD
+    margin = SCRIPT_TOKEN_MARGINS.get(content_metrics['strategy'], DEFAULT_SCRIPT_TOKEN_MARGIN)
+    return min(max(int(target_tokens * margin), MIN_SCRIPT_OUTPUT_TOKENS), MAX_SCRIPT_OUTPUT_TOKENS)
+
+
+@lru_cache(maxsize=64)
+def _generation_config(temperature: float, max_output_tokens: int):
+    """Shared GenerateContentConfig per distinct setting (avoids re-validating the model each call)"""
+    return types.GenerateContentConfig(
+        temperature=temperature,
+        max_output_tokens=max_output_tokens,
+    )
+
+
+# One Gemini client (and its HTTP connection pool) per container, shared by every
+# generator instance so warm invocations reuse established connections
+_GEMINI_CLIENT = None
+_GEMINI_CLIENT_LOCK = threading.Lock()
+
+
+def _get_client(api_key: str):
+    """Module-level Gemini client, created on first use"""
+    global _GEMINI_CLIENT
+    with _GEMINI_CLIENT_LOCK:
+        if _GEMINI_CLIENT is None:
+            _GEMINI_CLIENT = genai.Client(api_key=api_key)
+        return _GEMINI_CLIENT
 
-        # Build comprehensive single-speaker prompt
-        monologue_prompt = f"""
-You are an expert podcast script writer specializing in NATURAL, ENGAGING MONOLOGUE content for solo podcasts.
 
-{content_info}
+class GeminiScriptGenerator:
+    """Generates natural conversation scripts using Google Gemini AI"""
 
-{topic_structure_info}
+    def __init__(self):
+        """Initialize the Google Gemini client"""
+        api_key = os.environ.get("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY environment variable is required")
 
-{voice_info}
+        self.client = _get_client(api_key)
+        self.model = "gemini-2.0-flash-001"
+        self._content_plan_cache: OrderedDict = OrderedDict()
+        self._content_plan_cache_lock = threading.Lock()
+        self._script_cache: OrderedDict = OrderedDict()
+        self._script_cache_lock = threading.Lock()
+        self.voice_manager = VoiceConfigManager()
+        # Voice selection is deterministic in its arguments (seeded by episode_id), so
+        # retries of the same episode reuse it
+        self._distinct_voices = lru_cache(maxsize=512)(self.voice_manager.get_distinct_voices_for_speakers)
 
-{adaptive_instructions}
+    def generate_script(
+        self, clean_content: Dict[str, Any], podcast_config: Dict[str, Any] = None, episode_id: str = None, podcast_format: str = 'multi-speaker'
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Generate a natural conversation script from clean content
 
-CREATE AN AUTHENTIC, CONVERSATIONAL MONOLOGUE SCRIPT with the following specifications:
+        Args:
+            clean_content: Clean content with messages and summary
+            podcast_config: Podcast configuration including language and speaker info
+            episode_id: Episode ID for voice-aware script generation
+            podcast_format: 'single-speaker' or 'multi-speaker' (default)
 
-**PODCAST DETAILS:**
-- Podcast Name: {podcast_name}
-- Language: {language}
-- Target Duration: {target_duration} minutes
-- Episode Context: {channel_context}
+        Returns:
+            Tuple of (generated conversation script as string, content metrics dict)
+        """
 
-**SPEAKER PERSONALITY:**
-- **{speaker1_role}** ({speaker1_gender} voice):
-  * Engaging, knowledgeable, conversational tone
-  * Talks directly to the audience using "you"
-  * Natural and authentic delivery
-  * Personality: Friendly, authoritative yet approachable, enthusiastic
+        # Get configuration
+        config = podcast_config or {}
+        language = config.get("language", "en")
+        speaker1_gender = config.get("speaker1_gender", "male")
+        speaker2_gender = config.get("speaker2_gender", "female")
 
-**MONOLOGUE STRUCTURE:**
-1. **Hook (30-60 sec)**: Grab attention with compelling opening, set the stage
-2. **Introduction**: Preview today's content clearly, explain what the audience will learn
-3. **Main Content**: Deep dive organized into clear sections/topics
-4. **Transitions**: Use natural connectors: "Let me explain...", "Here's what's interesting...", "Now, you might be wondering..."
-5. **Closing**: Summary with key takeaways, strong ending
+        # Log clean content info
+        messages = clean_content.get('messages', [])
+        message_count = len(messages)
+        summary = clean_content.get('summary', {})
 
-**NARRATIVE TECHNIQUES FOR SOLO DELIVERY:**
-- **Direct Address**: "You know what I find fascinating?", "If you're like me..."
-- **Rhetorical Questions**: "So what does this mean for us?", "Why is this important?"
-- **Personal Insights**: "In my experience...", "What struck me about this..."
-- **Storytelling**: Present information as a journey, build suspense
-- **Audience Engagement**: "Think about this...", "Imagine if..."
+        logger.info("[GEMINI_SCRIPT] Starting %s script generation: language=%s, speaker1=%s, speaker2=%s, "
+                    "%d messages, date range=%s, episode=%s",
+                    podcast_format, language, speaker1_gender,
+                    speaker2_gender if podcast_format == 'multi-speaker' else None,
+                    message_count, summary.get('date_range', 'unknown'), episode_id)
+
+        # Analyze content metrics to determine strategy (and prioritize messages if high content)
+        content_metrics, prioritized_messages = self._plan_content(clean_content, messages)
+        logger.info("[GEMINI_SCRIPT] Content metrics: %s strategy (ratio=%.2f)",
+                    content_metrics['strategy'], content_metrics['target_ratio'])
+
+        if prioritized_messages is not None:
+            logger.info("[GEMINI_SCRIPT] Using top %d/%d priority messages", len(prioritized_messages), message_count)
+        content_view = _ContentView(
+            prioritized_messages if prioritized_messages is not None else messages,
+            summary
+        )
+
+        # Generate script based on podcast format
+        if podcast_format == 'single-speaker':
+            script = self._generate_single_speaker_script(content_view, config, episode_id, content_metrics)
+        else:
+            script = self._generate_multi_speaker_script(content_view, config, episode_id, content_metrics)
+
+        if content_metrics['total_chars'] > 0:
+            logger.info("[GEMINI_SCRIPT] Generated script: %d characters, actual ratio %.2f (target: %.2f)",
+                        len(script), len(script) / content_metrics['total_chars'], content_metrics['target_ratio'])
+        else:
+            logger.warning("[GEMINI_SCRIPT] No source content to calculate ratio (generated %d chars from empty content)", len(script))
+
+        return script, content_metrics
+
+    def _plan_content(
+        self, clean_content: Dict[str, Any], messages: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]]]:
+        """
+        Compute content metrics and, for high content, the prioritized message subset
+
+        Results are cached by a digest of the clean content so identical inputs on a
+        warm container skip both passes.
+
+        Args:
+            clean_content: Clean content with messages and summary
+            messages: The clean content's messages
+
+        Returns:
+            Tuple of (content metrics dict, prioritized messages or None if not needed)
+        """
+        cache_key = hashlib.blake2b(
+            orjson.dumps(clean_content, option=orjson.OPT_SORT_KEYS), digest_size=16
+        ).hexdigest()
+        with self._content_plan_cache_lock:
+            cached = self._content_plan_cache.get(cache_key)
+            if cached:
+                self._content_plan_cache.move_to_end(cache_key)
+        if cached:
+            logger.info("[GEMINI_SCRIPT] Reusing cached content metrics for identical content (%s)", cache_key)
+            content_metrics, prioritized_messages = cached
+        else:
+            content_metrics = ContentMetrics.analyze_content(clean_content)
+            prioritized_messages = None
+            if content_metrics['category'] == 'high':
+                logger.info("[GEMINI_SCRIPT] High content detected - prioritizing messages")
+                prioritized_messages = ContentPrioritizer.select_priority_messages(
+                    messages, target_percentage=0.70
+                )
+
+            with self._content_plan_cache_lock:
+                self._content_plan_cache[cache_key] = (content_metrics, prioritized_messages)
+                if len(self._content_plan_cache) > CONTENT_PLAN_CACHE_SIZE:
+                    self._content_plan_cache.popitem(last=False)
+
+        # Copies so callers can't mutate the cached entry
+        return dict(content_metrics), list(prioritized_messages) if prioritized_messages is not None else None
+
+    def _generate_single_speaker_script(
+        self, clean_content: _ContentView, podcast_config: Dict[str, Any], episode_id: str = None, content_metrics: Dict[str, Any] = None
+    ) -> str:
+        """Generate natural single-speaker monologue script using Gemini AI with clean content"""
+
+        # Get configuration
+        speaker1_role = podcast_config.get("speaker1_role", "Host")
+        speaker1_gender = podcast_config.get("speaker1_gender", "male")
+        podcast_name = podcast_config.get("podcast_name", "Daily Podcast")
+        target_duration = podcast_config.get("target_duration_minutes", 10)
+        language = podcast_config.get("language", "en")
+        additional_instructions = podcast_config.get("additional_instructions", "")
+
+        # Get content type for TTS markup instructions
+        content_type = 'general'
+        if podcast_config.get('content_analysis'):
+            content_analysis = podcast_config['content_analysis']
+            if hasattr(content_analysis, 'content_type'):
+                content_type = content_analysis.content_type.value
+
+        # Build the prompt for single-speaker script
+        prompt = self._build_prompt_within_budget(
+            self._build_single_speaker_prompt,
+            clean_content=clean_content,
+            language=language,
+            speaker1_role=speaker1_role,
+            speaker1_gender=speaker1_gender,
+            podcast_name=podcast_name,
+            target_duration=target_duration,
+            additional_instructions=additional_instructions,
+            episode_id=episode_id,
+            content_analysis=podcast_config.get('content_analysis'),
+            content_type=content_type,
+            content_metrics=content_metrics,
+            podcast_config=podcast_config
+        )
+
+        cached_script = self._get_cached_script(prompt)
+        if cached_script:
+            return cached_script
+
+        try:
+            # Generate script using Gemini
+            # Temperature 0.7: Balanced between creativity and coherence
+            # (placeholders are checked while the script streams in)
+            script_text = self._generate_script(
+                prompt, temperature=0.7,
+                max_output_tokens=_script_output_token_budget(content_metrics, target_duration)
+            )
+
+            if script_text:
+                cleaned_script = script_text.strip()
+                self._cache_script(prompt, cleaned_script)
+                return cleaned_script
+
+            raise Exception("No script generated by Gemini")
+
+        except Exception as e:
+            logger.error("[GEMINI_SCRIPT] Error generating single-speaker script: %s", e)
+            raise Exception(f"Failed to generate single-speaker script: {str(e)}")
+
+    def _generate_multi_speaker_script(
+        self, clean_content: _ContentView, podcast_config: Dict[str, Any], episode_id: str = None, content_metrics: Dict[str, Any] = None
+    ) -> str:
+        """Generate natural multi-speaker conversation script using Gemini AI with clean content"""
+
+        # Get configuration
+        speaker1_role = podcast_config.get("speaker1_role", "Host")
+        speaker2_role = podcast_config.get("speaker2_role", "Expert")
+        speaker1_gender = podcast_config.get("speaker1_gender", "male")
+        speaker2_gender = podcast_config.get("speaker2_gender", "female")
+        podcast_name = podcast_config.get("podcast_name", "Daily Podcast")
+        target_duration = podcast_config.get("target_duration_minutes", 10)
+        language = podcast_config.get("language", "en")
+        additional_instructions = podcast_config.get("additional_instructions", "")
+
+        # Get content type for TTS markup instructions
+        content_type = 'general'
+        if podcast_config.get('content_analysis'):
+            content_analysis = podcast_config['content_analysis']
+            if hasattr(content_analysis, 'content_type'):
+                content_type = content_analysis.content_type.value
+
+        # Build the prompt with clean content
+        prompt = self._build_prompt_within_budget(
+            self._build_script_prompt,
+            clean_content=clean_content,
+            language=language,
+            speaker1_role=speaker1_role,
+            speaker2_role=speaker2_role,
+            speaker1_gender=speaker1_gender,
+            speaker2_gender=speaker2_gender,
+            podcast_name=podcast_name,
+            target_duration=target_duration,
+            additional_instructions=additional_instructions,
+            episode_id=episode_id,
+            content_analysis=podcast_config.get('content_analysis'),
+            content_type=content_type,
+            content_metrics=content_metrics,
+            podcast_config=podcast_config
+        )
+
+        cached_script = self._get_cached_script(prompt)
+        if cached_script:
+            return cached_script
+
+        try:
+            # Generate script using Gemini
+            # Temperature 0.7: Balanced between creativity and coherence
+            # - Lower than 0.9 reduces excessive filler content
+            # - High enough to maintain natural conversational variation
+            # - Helps maintain tighter focus on source material
+            # (placeholders are checked while the script streams in)
+            script_text = self._generate_script(
+                prompt,
+                temperature=0.7,  # Reduced from 0.9 to prevent slow, wordy dialogue
+                max_output_tokens=_script_output_token_budget(content_metrics, target_duration),  # Sized to the target
+            )
+
+            if script_text:
+                cleaned_script = script_text.strip()
+                self._cache_script(prompt, cleaned_script)
+                return cleaned_script
+
+            raise Exception("No script generated by Gemini")
+
+        except Exception as e:
+            logger.error("[GEMINI_SCRIPT] Error generating script: %s", e)
+            raise Exception(f"Failed to generate conversation script: {str(e)}")
+
+    def _build_prompt_within_budget(self, build_prompt, **prompt_args) -> _PromptParts:
+        """
+        Build a prompt, rebuilding it from a smaller priority subset if it would overflow the context window
+
+        Args:
+            build_prompt: _build_script_prompt or _build_single_speaker_prompt
+            **prompt_args: Arguments for build_prompt (including clean_content)
+
+        Returns:
+            Prompt parts that fit the estimated token budget (as far as prioritization allows)
+        """
+        prompt = build_prompt(**prompt_args)
+        estimated_tokens = (len(prompt.static_prefix) + len(prompt.dynamic_suffix)) // PROMPT_CHARS_PER_TOKEN
+        if estimated_tokens <= MAX_PROMPT_TOKENS_ESTIMATE:
+            return prompt
+
+        logger.warning("[GEMINI_SCRIPT] Prompt oversize (%d tokens est), re-prioritizing", estimated_tokens)
+        clean_content = prompt_args['clean_content']
+        prioritized_messages = ContentPrioritizer.select_priority_messages(
+            clean_content.messages, target_percentage=OVERSIZE_PROMPT_PRIORITY_PERCENTAGE
+        )
+        prompt_args['clean_content'] = clean_content._replace(messages=prioritized_messages)
+        return build_prompt(**prompt_args)
+
+    def _script_cache_key(self, prompt: _PromptParts) -> str:
+        """Stable key for a full prompt under the current model"""
+        return hashlib.blake2b(
+            f"{self.model}\0{prompt.static_prefix}\0{prompt.dynamic_suffix}".encode('utf-8'), digest_size=16
+        ).hexdigest()
+
+    def _get_cached_script(self, prompt: _PromptParts) -> Optional[str]:
+        """Previously generated (and validated) script for this exact prompt, if caching is enabled"""
+        if not GEMINI_SCRIPT_CACHE:
+            return None
+        cache_key = self._script_cache_key(prompt)
+        with self._script_cache_lock:
+            script = self._script_cache.get(cache_key)
+            if script:
+                self._script_cache.move_to_end(cache_key)
+        if script:
+            logger.info("[GEMINI_SCRIPT] Reusing cached script for identical prompt (%s)", cache_key)
+        return script
+
+    def _cache_script(self, prompt: _PromptParts, script: str) -> None:
+        """Remember a validated script for this exact prompt, if caching is enabled"""
+        if not GEMINI_SCRIPT_CACHE:
+            return
+        with self._script_cache_lock:
+            self._script_cache[self._script_cache_key(prompt)] = script
+            if len(self._script_cache) > SCRIPT_CACHE_SIZE:
+                self._script_cache.popitem(last=False)
+
+    def _generate_script(self, prompt: _PromptParts, temperature: float, max_output_tokens: int) -> str:
+        """
+        Stream a complete script from Gemini, regenerating once with the full output cap if the
+        sized budget truncated it
+
+        Returns:
+            Generated script text (already checked for placeholders)
+
+        Raises:
+            ScriptTruncatedError: If the script is truncated even at the full cap
+        """
+        try:
+            return self._generate_script_text(prompt, temperature, max_output_tokens)
+        except ScriptTruncatedError:
+            if max_output_tokens >= MAX_SCRIPT_OUTPUT_TOKENS:
+                raise
+            logger.warning("[GEMINI_SCRIPT] Script truncated at %d output tokens, regenerating with %d",
+                           max_output_tokens, MAX_SCRIPT_OUTPUT_TOKENS)
+            return self._generate_script_text(prompt, temperature, MAX_SCRIPT_OUTPUT_TOKENS)
+
+    def _generate_script_text(self, prompt: _PromptParts, temperature: float, max_output_tokens: int) -> str:
+        """
+        Stream a script from Gemini (scaffold first, so repeat scaffolds hit implicit caching)
+
+        Returns:
+            Generated script text (already checked for placeholders)
+        """
+        script_text, usage = self._stream_script(
+            prompt.static_prefix + prompt.dynamic_suffix,
+            _generation_config(temperature, max_output_tokens)
+        )
+        logger.info("[GEMINI_SCRIPT] Prompt tokens: %s (%s served from implicit cache)",
+                    getattr(usage, 'prompt_token_count', None),
+                    getattr(usage, 'cached_content_token_count', None))
+        return script_text
+
+    def _stream_script(self, contents: str, config: Any) -> Tuple[str, Any]:
+        """
+        Stream a generation, scanning each chunk for placeholders so a bad script aborts early
+
+        Returns:
+            Tuple of (full generated text, usage metadata of the final chunk)
+
+        Raises:
+            ScriptTruncatedError: If generation stopped at max_output_tokens
+        """
+        chunks = []
+        tail = ""
+        usage = None
+        finish_reason = None
+        for chunk in self.client.models.generate_content_stream(model=self.model, contents=contents, config=config):
+            usage = getattr(chunk, 'usage_metadata', None) or usage
+            candidates = getattr(chunk, 'candidates', None)
+            if candidates and candidates[0].finish_reason:
+                finish_reason = candidates[0].finish_reason
+            text = chunk.text
+            if not text:
+                continue
+            window = tail + text
+            self._validate_script_content(window)
+            chunks.append(text)
+            tail = window[-_PLACEHOLDER_OVERLAP:]
+
+        logger.debug("[GEMINI_SCRIPT] Script validation passed - no obvious placeholders detected")
+        output_tokens = getattr(usage, 'candidates_token_count', None)
+        output_budget = getattr(config, 'max_output_tokens', None)
+        logger.info("[GEMINI_SCRIPT] Output tokens: %s used of %s budget (finish reason: %s)",
+                    output_tokens, output_budget, finish_reason)
+        # FinishReason is a str enum, so this also matches types.FinishReason.MAX_TOKENS
+        if finish_reason == "MAX_TOKENS":
+            raise ScriptTruncatedError(f"Script truncated at the output token budget ({output_budget} tokens)")
+        return "".join(chunks), usage
+
+    def _build_script_prompt(
+        self,
+        clean_content: _ContentView,
+        language: str,
+        speaker1_role: str,
+        speaker2_role: str,
+        speaker1_gender: str,
+        speaker2_gender: str,
+        podcast_name: str,
+        target_duration: int,
+        additional_instructions: str,
+        episode_id: str = None,
+        content_analysis: str = None,
+        content_type: str = 'general',
+        content_metrics: Dict[str, Any] = None,
+        podcast_config: Dict[str, Any] = None
+    ) -> _PromptParts:
+        """Build the conversation script generation prompt with clean content and adaptive instructions"""
+        
+        # Get voice information for this episode
+        voice_info = ""
+        if episode_id:
+            # Get distinct voices that will be used for both speakers
+            # NOTE: Using generic role names to match TTS client expectations
+            speaker1_voice, speaker2_voice = self._distinct_voices(
+                language=language,
+                speaker1_gender=speaker1_gender,
+                speaker2_gender=speaker2_gender,
+                speaker1_role=speaker1_role,  # Use actual role names for consistency
+                speaker2_role=speaker2_role,  # Use actual role names for consistency
+                episode_id=episode_id,
+                randomize_speaker2=True
+            )
+            
+            voice_info = f"""
+VOICE SELECTION FOR THIS EPISODE:
+- {speaker1_role} will use voice: {speaker1_voice} (consistent across episodes)
+- {speaker2_role} will use voice: {speaker2_voice} (unique to this episode)
 
-⚠️ **CRITICAL: NO SPEAKER NAMES IN CONTENT**
-- The speaker role "{speaker1_role}" is ONLY for identifying who speaks in the script format
-- DO NOT invent names for the speaker (no "יובל", "רונית", "Michael", "Sarah", etc.)
-- DO NOT include greetings with names (no "שלום יובל", "Hi Michael")
-- DO NOT use placeholder names like "[שם]", "[name]", "___"
-- Keep the delivery natural and direct without personal names
+This voice information should influence the conversation style and personality traits."""
 
-**TTS MARKUP FOR EXPRESSIVE MONOLOGUE DELIVERY:**
-Use markup strategically to enhance natural delivery:
+        # Get the specific role from content analysis or fallback to configured role
+        actual_speaker2_role = content_analysis.get('specific_role', speaker2_role) if content_analysis else speaker2_role
 
-1. **Timing and Rhythm** (use sparingly):
-   - [pause] - For significant topic transitions or dramatic moments
-   - [extremely fast] - For excited lists or rapid-fire facts
+        # Content analysis information
+        content_info = ""
+        if content_analysis:
+            analysis_content_type = content_analysis.get('content_type', 'general')
+            content_info = f"""
+CONTENT ANALYSIS:
+- Content Type: {analysis_content_type}
+- Specific Speaker Role: {actual_speaker2_role}
+- Role Description: {content_analysis.get('role_description', 'Expert in the field')}
+- Analysis Confidence: {content_analysis.get('confidence', 0.5):.2f}
+- Selection Reasoning: {content_analysis.get('reasoning', 'Dynamic role selection based on content')}
 
-   Examples:
-   - "That's incredible! [pause] Let me explain why."
-   - "אז מה שקורה פה זה..." (natural flow, no pause needed)
+The {actual_speaker2_role} should demonstrate expertise as: {content_analysis.get('role_description', 'an expert in the field')}.
+Focus on insights and analysis that match this specific expertise area within {analysis_content_type} topics."""
 
-2. **Emotional Delivery & Tone**:
-   - [excited] - High energy, enthusiastic delivery
-   - [curious] - Inquisitive, exploratory tone
-   - [thoughtful] - Reflective, contemplative pace
-   - [amused] - Light, humorous tone
+        # Topic analysis and conversation structure
+        topic_structure_info = ""
+        topic_analysis = podcast_config.get('topic_analysis', {}) if podcast_config else {}
+        if topic_analysis and topic_analysis.get('topics'):
+            topics = topic_analysis.get('topics', [])
+            structure = topic_analysis.get('conversation_structure', 'linear')
+            transition_style = topic_analysis.get('transition_style', 'natural')
 
-   Examples:
-   - "{speaker1_role}: [excited] You won't believe what happened next!"
-   - "{speaker1_role}: [thoughtful] Well, when you think about it..."
-   - "[amused] I know, it sounds crazy, right?"
+            topic_list = "\n".join([
+                f"   {i+1}. {t['topic_name']} (importance: {t['importance']}, duration: {t['suggested_duration']})"
+                for i, t in enumerate(topics)
+            ])
 
-3. **Emphasis and Stress**:
-   - [emphasis]text[/emphasis] - Stress important words
-   - Use for: numbers, key terms, surprising facts
+            topic_structure_info = f"""
+CONVERSATION STRUCTURE & TOPICS:
 
-   Examples:
-   - "This affected [emphasis]millions[/emphasis] of users"
-   - "The [emphasis]most important[/emphasis] thing to understand"
-   - "זה השפיע על [emphasis]מיליוני[/emphasis] משתמשים"
+Identified Topics ({len(topics)} topics):
+{topic_list}
 
-4. **Natural Speech Patterns** (use very sparingly):
-   - Occasional filler words: "you know", "I mean" (1-2 per topic maximum)
-   - Conversational connectors: "by the way", "speaking of which"
+Recommended Structure: {structure}
+- {STRUCTURE_DESCRIPTIONS.get(structure, 'Cover topics naturally')}
 
-   Examples:
-   - "So, what I found interesting was..." (direct)
-   - "Yeah, I mean, that's exactly what happened" (minimal filler)
-   - "אז מה שמעניין זה..." (clean)
+Transition Style: {transition_style}
+- {MULTI_SPEAKER_TRANSITION_GUIDANCE.get(transition_style, 'Use natural transitions')}
 
-5. **Content-Specific Markup**:
-   {f"- **News Content**: [emphasis] for breaking news, [pause] before major announcements" if content_type == 'news' else ""}
-   {f"- **Technology Content**: [thoughtful] for complex explanations, [excited] for innovations" if content_type == 'technology' else ""}
-   {f"- **Entertainment Content**: [amused] for funny moments, [excited] for dramatic reveals" if content_type == 'entertainment' else ""}
-   {f"- **Finance Content**: [emphasis] on numbers, [pause] before key statistics" if content_type == 'finance' else ""}
+TOPIC COVERAGE GUIDELINES:
+1. **High Importance Topics**: Spend 40-50% of conversation time, multiple exchanges, deep dive
+2. **Medium Importance Topics**: Spend 25-35% of time, adequate coverage
+3. **Low Importance Topics**: Spend 10-20% of time, brief mentions or weave into other topics
 
-**SCRIPT REQUIREMENTS FOR AUTHENTIC MONOLOGUE:**
+TRANSITION TECHNIQUES:
+- **Between High Topics**: Use [pause long], build excitement: "Now, here's something really interesting..."
+- **To Medium Topics**: Natural segues: "Speaking of that...", "This reminds me of..."
+- **Brief Topics**: Quick mentions: "By the way, there's also...", "Oh, and..."
+- **Thematic Links**: Find connections: "What's interesting is how this relates to..."
 
-1. **Language & Style**: Write entirely in {language} with conversational, unscripted-sounding tone
+PACING:
+- Start with high-energy opening on most important topic
+- Vary energy levels throughout - don't stay at one intensity
+- Build to exciting moments when appropriate
+- End with strong takeaway or call-to-action
 
-2. **Natural Imperfections** (use strategically, not excessively):
-   - Occasional self-corrections: "This happened in 2023... no wait, 2024"
-   - Minimal fillers: "you know", "I mean" (1-2 per major section)
-   - Hebrew equivalents: "אז", "בעצם" (use naturally)
+Remember: The conversation should feel like a natural discussion, not a checklist!
+"""
 
-3. **Engagement Dynamics**:
-   - Speak TO the audience, not AT them
-   - Use "you" to create connection
-   - Ask rhetorical questions: "What do you think happened?", "How would you react?"
-   - Share personal reactions: "I was surprised...", "This really struck me..."
+        # Extract channel information for natural naming (joined once, shared with the content block)
+        channels = clean_content.summary.get('channels', [])
+        channels_joined = ', '.join(channels) if channels else None
+        channel_context = f" (discussing content from {channels_joined})" if channels else ""
 
-4. **Pacing and Energy** (maintain dynamic, engaging tempo):
-   - Start with high energy in opening
-   - Keep pace brisk and engaging
-   - Use [extremely fast] sparingly for excited moments
-   - Use [thoughtful] for complex topics
-   - Build to exciting moments with energy
+        # Add adaptive instructions based on content metrics
+        adaptive_instructions = _format_adaptive_instructions(MULTI_SPEAKER_ADAPTIVE_TEMPLATES, content_metrics)
 
-5. **Content Integration**:
-   - Weave facts naturally, don't list them
-   - Use analogies and examples
-   - Connect topics with natural transitions
-   - Reference earlier points: "As I mentioned earlier..."
+        # Static scaffold first, then the optional episode sections and the episode body
+        static_prefix = MULTI_SPEAKER_PROMPT_SCAFFOLD.format(
+            language=language,
+            speaker1_role=speaker1_role,
+            speaker1_gender=speaker1_gender,
+            actual_speaker2_role=actual_speaker2_role,
+            speaker2_gender=speaker2_gender,
+            content_type_markup=CONTENT_TYPE_MARKUP.get(content_type, ""),
+        )
+        parts = [
+            EPISODE_PROMPT_HEADER,
+            content_info, "\n\n",
+            topic_structure_info, "\n\n",
+            voice_info, "\n\n",
+            adaptive_instructions,
+            MULTI_SPEAKER_PROMPT_EPISODE_BODY.format(
+                podcast_name=podcast_name,
+                language=language,
+                target_duration=target_duration,
+                channel_context=channel_context,
+                formatted_content=self._format_clean_content_for_prompt(clean_content, channels_joined),
+                additional_instructions=additional_instructions,
+            ),
+        ]
+        return _PromptParts(static_prefix, "".join(parts))
 
-6. **TTS Markup Integration** (strategic use):
-   - Apply markup naturally - quality over quantity
-   - Use 1-2 emotion tags per major thought
-   - Prioritize [excited], [thoughtful], [emphasis]
-   - Use [pause] rarely - only for major transitions
+    def _build_single_speaker_prompt(
+        self,
+        clean_content: _ContentView,
+        language: str,
+        speaker1_role: str,
+        speaker1_gender: str,
+        podcast_name: str,
+        target_duration: int,
+        additional_instructions: str,
+        episode_id: str = None,
+        content_analysis: str = None,
+        content_type: str = 'general',
+        content_metrics: Dict[str, Any] = None,
+        podcast_config: Dict[str, Any] = None
+    ) -> _PromptParts:
+        """Build the single-speaker monologue script generation prompt with adaptive instructions"""
 
-**CONTENT TO DISCUSS:**
-{self._format_clean_content_for_prompt(clean_content)}
+        # Get voice information for this episode
+        voice_info = ""
+        if episode_id:
+            # Get voice for speaker1 only
+            speaker1_voice, _ = self._distinct_voices(
+                language=language,
+                speaker1_gender=speaker1_gender,
+                speaker2_gender='male',  # dummy, won't be used
+                speaker1_role=speaker1_role,
+                speaker2_role='Unused',  # dummy
+                episode_id=episode_id,
+                randomize_speaker2=False
+            )
 
-{additional_instructions}
+            voice_info = f"""
+VOICE SELECTION FOR THIS EPISODE:
+- {speaker1_role} will use voice: {speaker1_voice} (consistent voice)
 
-**OUTPUT FORMAT:**
-Provide ONLY the monologue script with embedded TTS markup. No explanations or metadata.
-Use this format (the role is an IDENTIFIER ONLY, not a name to be spoken):
+This voice information should influence the delivery style and personality traits."""
 
-{speaker1_role}: [excited] Opening statement that grabs attention...
-{speaker1_role}: [pause] Now, let me explain why this matters...
-{speaker1_role}: [emphasis]Key point[/emphasis] that you need to understand...
-{speaker1_role}: [thoughtful] When you think about it, what's really happening here is...
+        # Content analysis information
+        content_info = ""
+        if content_analysis:
+            analysis_content_type = content_analysis.get('content_type', 'general')
+            content_info = f"""
+CONTENT ANALYSIS:
+- Content Type: {analysis_content_type}
+- Role Description: {content_analysis.get('role_description', 'Expert in the field')}
+- Analysis Confidence: {content_analysis.get('confidence', 0.5):.2f}
+- Selection Reasoning: {content_analysis.get('reasoning', 'Dynamic role selection based on content')}
 
-REMEMBER: The script content should NEVER include the speaker's name or invented names. The role ({speaker1_role}) is only a format marker.
+The {speaker1_role} should demonstrate expertise as: {content_analysis.get('role_description', 'an expert in the field')}.
+Focus on insights and analysis that match this specific expertise area within {analysis_content_type} topics."""
 
----
+        # Topic analysis and conversation structure
+        topic_structure_info = ""
+        topic_analysis = podcast_config.get('topic_analysis', {}) if podcast_config else {}
+        if topic_analysis and topic_analysis.get('topics'):
+            topics = topic_analysis.get('topics', [])
+            structure = topic_analysis.get('conversation_structure', 'linear')
+            transition_style = topic_analysis.get('transition_style', 'natural')
 
-**EXAMPLES OF NATURAL MONOLOGUE PATTERNS:**
+            topic_list = "\n".join([
+                f"   {i+1}. {t['topic_name']} (importance: {t['importance']}, duration: {t['suggested_duration']})"
+                for i, t in enumerate(topics)
+            ])
 
-Example 1 - Engaging Opening (English):
-{speaker1_role}: [excited] Okay, so you won't believe what happened today in the tech world!
-{speaker1_role}: [pause] I'm talking about something that's going to change how we think about artificial intelligence.
-{speaker1_role}: [curious] Now, you might be wondering, what makes this so special?
+            topic_structure_info = f"""
+MONOLOGUE STRUCTURE & TOPICS:
 
-Example 2 - Thoughtful Explanation (English):
-{speaker1_role}: [thoughtful] Let me break this down for you, because it's actually more interesting than it sounds.
-{speaker1_role}: Think of it this way... imagine you're trying to solve a really complex puzzle.
-{speaker1_role}: [emphasis]The key insight[/emphasis] here is that the traditional approach just doesn't work anymore.
+Identified Topics ({len(topics)} topics):
+{topic_list}
 
-Example 3 - Natural Hebrew Monologue:
-{speaker1_role}: [excited] אוקיי, אז לא תאמינו מה קרה היום בעולם הטכנולוגיה!
-{speaker1_role}: [pause] אני מדבר על משהו שעומד לשנות את הדרך שבה אנחנו חושבים על בינה מלאכותית.
-{speaker1_role}: [curious] עכשיו, אתם בטח שואלים את עצמכם, מה כל כך מיוחד בזה?
+Recommended Structure: {structure}
+- {STRUCTURE_DESCRIPTIONS.get(structure, 'Cover topics naturally')}
 
-Example 4 - Building Narrative:
-{speaker1_role}: So here's where things get really interesting...
-{speaker1_role}: [pause] Remember what I said earlier about the pattern we were seeing?
-{speaker1_role}: [excited] Well, it turns out that [emphasis]everything[/emphasis] connects back to that!
+Transition Style: {transition_style}
+- {SINGLE_SPEAKER_TRANSITION_GUIDANCE.get(transition_style, 'Use natural transitions')}
 
-Example 5 - Rhetorical Engagement:
-{speaker1_role}: [curious] Now, you might be thinking, "Why should I care about this?"
-{speaker1_role}: Great question! Let me tell you exactly why this matters to you.
-{speaker1_role}: [emphasis]The reality[/emphasis] is that this affects every single one of us.
+TOPIC COVERAGE GUIDELINES FOR MONOLOGUE:
+1. **High Importance Topics**: Spend 40-50% of time, deep dive with thorough exploration
+2. **Medium Importance Topics**: Spend 25-35% of time, adequate coverage
+3. **Low Importance Topics**: Spend 10-20% of time, brief mentions or weave into other topics
 
-KEY PATTERNS TO EMULATE:
-- Open with energy and intrigue
-- Speak directly to the audience using "you"
-- Use rhetorical questions for engagement
-- Layer in emotional markers authentically
-- Use [pause] only for major transitions (1-2 per topic)
-- Keep delivery tight and focused - avoid excessive filler
-- Vary sentence length and structure
-- Build momentum through the narrative
+MONOLOGUE TRANSITION TECHNIQUES:
+- **Between High Topics**: Use [pause], build anticipation: "Now, here's something really interesting..."
+- **To Medium Topics**: Natural segues: "This reminds me of...", "Let me explain..."
+- **Brief Topics**: Quick mentions: "By the way...", "Oh, and another thing..."
+- **Thematic Links**: Find connections: "What's interesting is how this relates to..."
 
-Now, create the monologue script following ALL the guidelines above:
+PACING FOR SOLO DELIVERY:
+- Start with high-energy opening to grab attention
+- Vary energy levels throughout - don't stay at one intensity
+- Use rhetorical questions to engage the audience
+- Build to exciting moments when appropriate
+- End with strong takeaway or call-to-action
+
+Remember: Keep the monologue engaging and conversational, as if speaking directly to a friend!
 """
 
-        return monologue_prompt
+        # Extract channel information (joined once, shared with the content block)
+        channels = clean_content.summary.get('channels', [])
+        channels_joined = ', '.join(channels) if channels else None
+        channel_context = f" (discussing content from {channels_joined})" if channels else ""
+
+        # Add adaptive instructions based on content metrics (CRITICAL - same logic as multi-speaker)
+        adaptive_instructions = _format_adaptive_instructions(SINGLE_SPEAKER_ADAPTIVE_TEMPLATES, content_metrics)
+
+        # Static scaffold first, then the optional episode sections and the episode body
+        static_prefix = SINGLE_SPEAKER_PROMPT_SCAFFOLD.format(
+            language=language,
+            speaker1_role=speaker1_role,
+            speaker1_gender=speaker1_gender,
+            content_type_markup=CONTENT_TYPE_MARKUP.get(content_type, ""),
+        )
+        parts = [
+            EPISODE_PROMPT_HEADER,
+            content_info, "\n\n",
+            topic_structure_info, "\n\n",
+            voice_info, "\n\n",
+            adaptive_instructions,
+            SINGLE_SPEAKER_PROMPT_EPISODE_BODY.format(
+                podcast_name=podcast_name,
+                language=language,
+                target_duration=target_duration,
+                channel_context=channel_context,
+                formatted_content=self._format_clean_content_for_prompt(clean_content, channels_joined),
+                additional_instructions=additional_instructions,
+            ),
+        ]
+        return _PromptParts(static_prefix, "".join(parts))
 
     def _validate_script_content(self, script: str) -> None:
         """
         Validate that the script doesn't contain placeholder text, invented names, or incomplete content
 
         Args:
-            script: The generated script text
+            script: The generated script text (or a streamed window of it)
 
         Raises:
-            Exception: If placeholder text or problematic patterns are detected
+            ScriptPlaceholderError: If placeholder text or problematic patterns are detected
         """
-        # Common placeholder patterns in Hebrew and English
-        placeholder_patterns = [
-            "שם המשפחה",  # family name in Hebrew
-            "שם פרטי",     # first name in Hebrew
-            "[שם האורח]",  # name placeholder
-            "[שם]",        # name placeholder
-            "[insert",     # common bracket placeholders
-            "[name]",      # name placeholder
-            "[family name]", # family name placeholder
-            "[first name]", # first name placeholder
-            "___",         # underscores for filling
-            "וכו'",        # Hebrew etc. (often indicates incomplete content)
-            "TBD",         # To Be Determined
-            "TODO",        # TODO items
-            "<placeholder>", # XML-style placeholders
-            "{name}",      # Template-style placeholders
-            "{family}",    # Template-style placeholders
-        ]
-
-        script_lower = script.lower()
-
-        for pattern in placeholder_patterns:
-            if pattern.lower() in script_lower:
-                logger.error(f"[GEMINI_SCRIPT] Detected placeholder pattern: '{pattern}' in script")
-                raise Exception(f"Script contains placeholder text: '{pattern}'. This indicates incomplete generation. Please regenerate.")
-
-        logger.debug("[GEMINI_SCRIPT] Script validation passed - no obvious placeholders detected")
+        # Single scan for all placeholder patterns
+        match = _PLACEHOLDER_RE.search(script)
+        if match:
+            pattern = match.group(0)
+            logger.error("[GEMINI_SCRIPT] Detected placeholder pattern: '%s' in script", pattern)
+            raise ScriptPlaceholderError(f"Script contains placeholder text: '{pattern}'. This indicates incomplete generation. Please regenerate.")
     
-    def _format_clean_content_for_prompt(self, clean_content: Dict[str, Any]) -> str:
+    def _format_clean_content_for_prompt(self, clean_content: _ContentView, channels_joined: Optional[str] = None) -> str:
         """
         Format clean content into readable text for the AI prompt
         
         Args:
-            clean_content: Clean content with messages and summary
+            clean_content: Content view with messages and summary
+            channels_joined: The summary's channels already joined with ', ' (computed if not given)
             
         Returns:
             Formatted content string for AI processing
         """
-        messages = clean_content.get('messages', [])
-        summary = clean_content.get('summary', {})
+        messages, summary = clean_content
         
         if not messages:
             return "No content available for discussion."
         
-        # Build formatted content
-        formatted_parts = []
-        
         # Add summary info
         total_messages = summary.get('total_messages', len(messages))
-        channels = summary.get('channels', [])
-        
-        if channels:
-            channel_info = f"from {', '.join(channels)}" if len(channels) > 1 else f"from {channels[0]}"
-        else:
-            channel_info = "from various sources"
+        if channels_joined is None:
+            channels = summary.get('channels', [])
+            channels_joined = ', '.join(channels) if channels else None
         
-        formatted_parts.append(f"Summary: {total_messages} messages {channel_info}")
-        formatted_parts.append("")  # Empty line
+        channel_info = f"from {channels_joined}" if channels_joined is not None else "from various sources"
         
-        # Add messages with chronological order
-        for i, message in enumerate(messages, 1):
-            date_part = ""
-            if 'date' in message:
-                try:
-                    # Extract just date (without time) for readability
-                    date_str = message['date'].split('T')[0]
-                    date_part = f" ({date_str})"
-                except:
-                    pass
-            
-            channel_part = ""
-            if 'channel' in message:
-                channel_part = f" [{message['channel']}]"
-            
-            text = message.get('text', '').strip()
-            if text:
-                formatted_parts.append(f"{i}.{date_part}{channel_part} {text}")
-        
-        return '\n'.join(formatted_parts)
+        # Summary line, empty line, then messages in chronological order (numbered by position)
+        return '\n'.join(chain(
+            (f"Summary: {total_messages} messages {channel_info}", ""),
+            (
+                f"{i}.{self._format_message_label(message)} {text}"
+                for i, message in enumerate(messages, 1)
+                if (text := message.get('text', '').strip())
+            ),
+        ))
+    
+    @staticmethod
+    def _format_message_label(message: Dict[str, Any]) -> str:
+        """Date (without time, for readability) and channel label for a prompt message line"""
+        date = message.get('date')
+        date_part = f" ({date.partition('T')[0]})" if isinstance(date, str) else ""
+        channel_part = f" [{message['channel']}]" if 'channel' in message else ""
+        return f"{date_part}{channel_part}"
 
 
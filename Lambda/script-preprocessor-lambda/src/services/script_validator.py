@@ -3,11 +3,62 @@ Script Validator Service
 Validates generated scripts against source content for quality and accuracy
 """
 import re
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, Iterable, List, Set
+
+import ahocorasick
+
 from shared.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Keywords that indicate topics (matched as lowercase substrings in content and script)
+TOPIC_INDICATORS = (
+    # Hebrew political/military
+    'טראמפ', 'נתניהו', 'ביידן', 'חמאס', 'עזה', 'לבנון', 'איראן', 'חיזבאללה',
+    'צה"ל', 'צהל', 'ממשלה', 'כנסת', 'חטופים',
+    # English political/military
+    'trump', 'netanyahu', 'biden', 'hamas', 'gaza', 'lebanon', 'iran', 'hezbollah',
+    'idf', 'government', 'hostages',
+    # Geographic locations
+    'ירושלים', 'תל אביב', 'תל-אביב', 'jerusalem', 'telaviv',
+    'קטאר', 'מצרים', 'טורקיה', 'qatar', 'egypt', 'turkey',
+    # Cultural/social
+    'אירוויזיון', 'eurovision', 'משט', 'flotilla',
+    # Technology
+    'ai', 'בינה מלאכותית', 'טכנולוגיה', 'technology'
+)
+
+
+def _build_topic_automaton() -> ahocorasick.Automaton:
+    """Build one Aho-Corasick automaton over the lowercased topic indicators"""
+    automaton = ahocorasick.Automaton()
+    for indicator in TOPIC_INDICATORS:
+        indicator = indicator.lower()
+        automaton.add_word(indicator, indicator)
+    automaton.make_automaton()
+    return automaton
+
+
+_TOPIC_AUTOMATON = _build_topic_automaton()
+
+# Tokenization: TTS markup (applied in this order, within a line) and words
+_BRACKET_MARKUP_RE = re.compile(r'\[.*?\]')
+_ANGLE_MARKUP_RE = re.compile(r'<.*?>')
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Common words (and TTS markup / role names) never counted as potential hallucinations
+_COMMON_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'של', 'את', 'על', 'עם', 'כי', 'גם', 'או', 'אבל', 'ב', 'ל', 'מ', 'ה',
+    'pause', 'short', 'medium', 'long', 'break', 'emphasis', 'laughing',
+    'host', 'expert', 'analyst', 'speaker', 'welcome', 'thank', 'thanks'
+})
+
+
+def _find_topics(text_lower: str) -> Set[str]:
+    """Topic indicators present in an already-lowercased text (single scan)"""
+    return {indicator for _, indicator in _TOPIC_AUTOMATON.iter(text_lower)}
+
 
 class ScriptValidator:
     """Validates script quality and coverage"""
@@ -46,21 +97,16 @@ class ScriptValidator:
 
         # 3. Detect potential hallucinations
         script_words = set(ScriptValidator._tokenize(generated_script))
-        content_words = set()
-        for msg in messages:
-            content_words.update(ScriptValidator._tokenize(msg.get('text', '')))
+        content_words = ScriptValidator._tokenize_bulk(msg.get('text', '') for msg in messages)
 
         # Words in script but not in content (potential hallucinations)
         # Filter out common words
-        common_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'של', 'את', 'על', 'עם', 'כי', 'גם', 'או', 'אבל', 'ב', 'ל', 'מ', 'ה',
-            'pause', 'short', 'medium', 'long', 'break', 'emphasis', 'laughing',
-            'host', 'expert', 'analyst', 'speaker', 'welcome', 'thank', 'thanks'
+        unique_to_script = {
+            w for w in script_words if w not in content_words and w not in _COMMON_WORDS
         }
-        unique_to_script = script_words - content_words - common_words
 
-        hallucination_risk = len(unique_to_script) / len(script_words) if script_words else 0
+        script_word_count = len(script_words)
+        hallucination_risk = len(unique_to_script) / script_word_count if script_word_count else 0
 
         # 4. Calculate overall quality score
         # Ratio match (40%), Coverage (40%), Low hallucination risk (20%)
@@ -117,73 +163,36 @@ class ScriptValidator:
     @staticmethod
     def _extract_topics(messages: List[Dict]) -> Set[str]:
         """Extract key topics from messages using keyword matching"""
-        topics = set()
-
-        # Priority keywords that indicate topics
-        topic_indicators = [
-            # Hebrew political/military
-            'טראמפ', 'נתניהו', 'ביידן', 'חמאס', 'עזה', 'לבנון', 'איראן', 'חיזבאללה',
-            'צה"ל', 'צהל', 'ממשלה', 'כנסת', 'חטופים',
-            # English political/military
-            'trump', 'netanyahu', 'biden', 'hamas', 'gaza', 'lebanon', 'iran', 'hezbollah',
-            'idf', 'government', 'hostages',
-            # Geographic locations
-            'ירושלים', 'תל אביב', 'תל-אביב', 'jerusalem', 'telaviv',
-            'קטאר', 'מצרים', 'טורקיה', 'qatar', 'egypt', 'turkey',
-            # Cultural/social
-            'אירוויזיון', 'eurovision', 'משט', 'flotilla',
-            # Technology
-            'ai', 'בינה מלאכותית', 'טכנולוגיה', 'technology'
-        ]
-
-        for msg in messages:
-            text = msg.get('text', '').lower()
-            for indicator in topic_indicators:
-                if indicator.lower() in text:
-                    topics.add(indicator.lower())
-
-        return topics
+        # One scan over all messages; no indicator contains a newline, so matches can't span messages
+        return _find_topics('\n'.join(msg.get('text', '') for msg in messages).lower())
 
     @staticmethod
     def _extract_topics_from_script(script: str) -> Set[str]:
         """Extract topics from generated script"""
-        script_lower = script.lower()
-        topics = set()
-
-        topic_indicators = [
-            # Hebrew
-            'טראמפ', 'נתניהו', 'ביידן', 'חמאס', 'עזה', 'לבנון', 'איראן', 'חיזבאללה',
-            'צה"ל', 'צהל', 'ממשלה', 'כנסת', 'חטופים',
-            # English
-            'trump', 'netanyahu', 'biden', 'hamas', 'gaza', 'lebanon', 'iran', 'hezbollah',
-            'idf', 'government', 'hostages',
-            # Geographic
-            'ירושלים', 'תל אביב', 'תל-אביב', 'jerusalem', 'telaviv',
-            'קטאר', 'מצרים', 'טורקיה', 'qatar', 'egypt', 'turkey',
-            # Cultural
-            'אירוויזיון', 'eurovision', 'משט', 'flotilla',
-            # Technology
-            'ai', 'בינה מלאכותית', 'טכנולוגיה', 'technology'
-        ]
-
-        for indicator in topic_indicators:
-            if indicator.lower() in script_lower:
-                topics.add(indicator.lower())
-
-        return topics
+        return _find_topics(script.lower())
 
     @staticmethod
     def _tokenize(text: str) -> List[str]:
         """Simple tokenization for word extraction"""
         # Remove TTS markup
-        text = re.sub(r'\[.*?\]', '', text)
-        text = re.sub(r'<.*?>', '', text)
+        text = _BRACKET_MARKUP_RE.sub('', text)
+        text = _ANGLE_MARKUP_RE.sub('', text)
         # Remove punctuation and extract words
-        words = re.findall(r'\b\w+\b', text.lower())
+        words = _WORD_RE.findall(text.lower())
         # Filter out very short words (likely not meaningful)
         words = [w for w in words if len(w) >= 3]
         return words
 
+    @staticmethod
+    def _tokenize_bulk(texts: Iterable[str]) -> Set[str]:
+        """
+        Distinct words of many texts in one tokenization pass
+
+        The texts are joined with newlines; markup patterns don't match across lines and
+        a newline is a word boundary, so the result equals the union of per-text tokens.
+        """
+        return set(ScriptValidator._tokenize('\n'.join(texts)))
+
     @staticmethod
     def create_validation_summary(validation_report: Dict[str, Any]) -> str:
         """
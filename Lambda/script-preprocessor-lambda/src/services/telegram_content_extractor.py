@@ -3,6 +3,8 @@ Telegram Content Extractor Service
 Centralized content extraction from Telegram data with clean, focused output
 """
 
+import re
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from shared.utils.logging import get_logger
@@ -10,6 +12,21 @@ from shared.utils.datetime_utils import now_utc, to_iso_utc
 
 logger = get_logger(__name__)
 
+# Local date and time of an ISO timestamp (timezone suffix ignored for sorting)
+_ISO_CORE_RE = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?')
+
+
+@lru_cache(maxsize=4096)
+def _parse_sort_date(date_str: str) -> Optional[datetime]:
+    """Naive datetime for sorting, or None if the string isn't an ISO timestamp (memoized)"""
+    match = _ISO_CORE_RE.match(date_str)
+    if not match:
+        return None
+    try:
+        return datetime.fromisoformat(match.group(0))
+    except ValueError:
+        return None
+
 
 class TelegramContentExtractor:
     """Unified service for extracting clean content from Telegram data"""
@@ -161,15 +178,16 @@ class TelegramContentExtractor:
     def _sort_messages_by_date(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Sort messages by date, with error handling"""
         try:
+            # Fallback for unparseable dates: current time (naive, like the parsed dates)
+            fallback_date = now_utc().replace(tzinfo=None)
+            
             def parse_date_for_sorting(message):
                 try:
-                    date_str = message.get('date', '')
-                    # Remove timezone info for sorting (basic approach)
-                    date_clean = date_str.split('+')[0].split('T')[0] + 'T' + date_str.split('T')[1].split('+')[0]
-                    return datetime.fromisoformat(date_clean)
-                except:
-                    # Fallback: use current time
-                    return now_utc()
+                    # Timezone info is ignored for sorting (basic approach)
+                    return _parse_sort_date(message.get('date', '')) or fallback_date
+                except TypeError:
+                    # Non-string date
+                    return fallback_date
             
             return sorted(messages, key=parse_date_for_sorting)
         
@@ -252,8 +270,19 @@ class TelegramContentExtractor:
         Returns:
             Combined text content as string
         """
-        clean_content = self.extract_clean_content(telegram_data)
+        return self.content_text_from_clean(self.extract_clean_content(telegram_data))
+    
+    @staticmethod
+    def content_text_from_clean(clean_content: Dict[str, Any]) -> str:
+        """
+        Combine the message texts of already-extracted clean content into one string
         
+        Args:
+            clean_content: Output of extract_clean_content
+            
+        Returns:
+            Combined text content as string (same as extract_content_text_only)
+        """
         text_parts = []
         for message in clean_content.get('messages', []):
             text = message.get('text', '').strip()
@@ -17,6 +17,12 @@ logger.setLevel(logging.INFO)
 # Cache secrets
 _secrets_cache = None
 
+# Notification key -> recipients field inside that notification
+RECIPIENT_FIELDS = {
+    'bounce': 'bouncedRecipients',
+    'complaint': 'complainedRecipients',
+}
+
 def get_secrets():
     """Retrieve secrets from AWS Secrets Manager"""
     global _secrets_cache
@@ -42,15 +48,17 @@ def get_db_connection():
 
     return psycopg2.connect(db_url)
 
+def get_notification_type(message: Dict[str, Any]) -> Optional[str]:
+    """Return the notification key ('bounce' / 'complaint') present in the message"""
+    return next((key for key in RECIPIENT_FIELDS if key in message), None)
+
 def extract_recipient_email(message: Dict[str, Any]) -> Optional[str]:
     """Extract recipient email from SNS message"""
     try:
-        if 'bounce' in message:
-            recipients = message['bounce'].get('bouncedRecipients', [])
-        elif 'complaint' in message:
-            recipients = message['complaint'].get('complainedRecipients', [])
-        else:
+        notification_type = get_notification_type(message)
+        if notification_type is None:
             return None
+        recipients = message[notification_type].get(RECIPIENT_FIELDS[notification_type], [])
 
         if recipients and len(recipients) > 0:
             return recipients[0].get('emailAddress')
@@ -123,6 +131,12 @@ def handle_complaint(conn, message: Dict[str, Any], email: str, user_id: str):
             WHERE id::text = %s::text
         """, (user_id,))
 
+# Notification key -> handler (new notification types only need an entry here)
+NOTIFICATION_HANDLERS = {
+    'bounce': handle_bounce,
+    'complaint': handle_complaint,
+}
+
 def lambda_handler(event, context):
     """
     Lambda handler for SNS notifications from SES
@@ -138,6 +152,11 @@ def lambda_handler(event, context):
             # Parse SNS message
             sns_message = json.loads(record['Sns']['Message'])
 
+            handler = NOTIFICATION_HANDLERS.get(get_notification_type(sns_message))
+            if handler is None:
+                logger.warning("Unknown message type")
+                continue
+
             # Extract email address
             email = extract_recipient_email(sns_message)
             if not email:
@@ -151,13 +170,7 @@ def lambda_handler(event, context):
                 continue
 
             # Handle bounce or complaint
-            if 'bounce' in sns_message:
-                handle_bounce(conn, sns_message, email, user_id)
-            elif 'complaint' in sns_message:
-                handle_complaint(conn, sns_message, email, user_id)
-            else:
-                logger.warning("Unknown message type")
-                continue
+            handler(conn, sns_message, email, user_id)
 
             conn.commit()
             logger.info(f"Successfully processed notification for {email}")
@@ -2,23 +2,63 @@
 S3 client for Podcasto Lambda functions
 Unified version combining both script-preprocessor and audio-generation implementations
 """
+import gzip
 import os
 import re
 import time
 import json
+import threading
 import boto3
-from typing import Optional, Dict, Any
+from io import BytesIO
+from typing import Optional, Dict, Any, Union
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from shared.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Connection pool sized for concurrent uploads (botocore default is 10). Uploads are
+# additionally retried by S3Client._execute_with_retry, so botocore's own retries stay
+# at the standard 3 attempts without client-side rate limiting.
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 3, 'mode': 'standard'}
+)
+
+# Multipart settings for large uploads (audio, media): 8MB parts uploaded in parallel
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=int(os.environ.get('S3_UPLOAD_MAX_CONCURRENCY', '10')),
+    use_threads=True
+)
+
+# One boto3 S3 client per container, shared by every S3 consumer
+_shared_s3_client = None
+_shared_s3_client_lock = threading.Lock()
+
+
+def get_shared_s3_client():
+    """
+    Get the process-wide boto3 S3 client, creating it on first use
+
+    boto3 clients are thread-safe, so a single client (and its connection
+    pool) is reused across handlers, threads and warm invocations.
+    """
+    global _shared_s3_client
+    if _shared_s3_client is None:
+        with _shared_s3_client_lock:
+            if _shared_s3_client is None:
+                _shared_s3_client = boto3.client('s3', config=S3_CLIENT_CONFIG)
+    return _shared_s3_client
+
 class S3Client:
     """Client for uploading and downloading files from S3"""
 
     def __init__(self):
-        self.s3_client = boto3.client('s3')
+        self.s3_client = get_shared_s3_client()
         self.bucket_name = os.environ.get('S3_BUCKET_NAME', 'podcasto-podcasts')
         self.max_retries = 3
         self.retry_delay = 1  # seconds
@@ -82,14 +122,17 @@ class S3Client:
                     # S3 metadata keys must be strings, values must be strings
                     s3_metadata[f'conversion_{key}'] = str(value)
 
-            # Upload to S3 with retry logic
+            # Upload to S3 with retry logic (multipart with parallel parts for large files)
             def upload_op():
-                self.s3_client.put_object(
-                    Bucket=self.bucket_name,
-                    Key=s3_key,
-                    Body=audio_buffer,
-                    ContentType=content_type,
-                    Metadata=s3_metadata
+                self.s3_client.upload_fileobj(
+                    BytesIO(audio_buffer),
+                    self.bucket_name,
+                    s3_key,
+                    ExtraArgs={
+                        'ContentType': content_type,
+                        'Metadata': s3_metadata
+                    },
+                    Config=S3_TRANSFER_CONFIG
                 )
 
             self._execute_with_retry("upload_audio", upload_op)
@@ -140,7 +183,8 @@ class S3Client:
                 self.s3_client.upload_file(
                     file_path,
                     self.bucket_name,
-                    s3_key
+                    s3_key,
+                    Config=S3_TRANSFER_CONFIG
                 )
 
             self._execute_with_retry("upload_file", upload_op)
@@ -157,19 +201,22 @@ class S3Client:
 
     def upload_transcript(
         self,
-        transcript_content: str,
+        transcript_content: Union[str, bytes],
         podcast_id: str,
         episode_id: str,
-        filename: str
+        filename: str,
+        compress: bool = False
     ) -> Optional[str]:
         """
         Upload transcript content to S3
 
         Args:
-            transcript_content: The transcript text content
+            transcript_content: The transcript text content (str, or UTF-8 encoded bytes)
             podcast_id: The podcast ID
             episode_id: The episode ID
             filename: Name of the transcript file
+            compress: Store the body gzip-encoded (ContentEncoding: gzip);
+                read_from_url decodes it transparently
 
         Returns:
             S3 URL of uploaded transcript or None if failed
@@ -180,19 +227,38 @@ class S3Client:
 
             logger.info(f"[S3] Uploading transcript to s3://{self.bucket_name}/{s3_key}")
 
-            # Upload transcript content to S3 with retry logic
+            body = transcript_content if isinstance(transcript_content, bytes) else transcript_content.encode('utf-8')
+            extra_args = {
+                'ContentType': 'text/plain',
+                'Metadata': {
+                    'podcast_id': podcast_id,
+                    'episode_id': episode_id,
+                    'content_type': 'podcast_transcript'
+                }
+            }
+            if compress:
+                body = gzip.compress(body, compresslevel=3)
+                extra_args['ContentType'] = 'text/plain; charset=utf-8'
+                extra_args['ContentEncoding'] = 'gzip'
+
+            # Upload transcript content to S3 with retry logic; large bodies (e.g. clean
+            # content of busy channels) go multipart with parallel parts
             def upload_op():
-                self.s3_client.put_object(
-                    Bucket=self.bucket_name,
-                    Key=s3_key,
-                    Body=transcript_content.encode('utf-8'),
-                    ContentType='text/plain',
-                    Metadata={
-                        'podcast_id': podcast_id,
-                        'episode_id': episode_id,
-                        'content_type': 'podcast_transcript'
-                    }
-                )
+                if len(body) >= S3_TRANSFER_CONFIG.multipart_threshold:
+                    self.s3_client.upload_fileobj(
+                        BytesIO(body),
+                        self.bucket_name,
+                        s3_key,
+                        ExtraArgs=extra_args,
+                        Config=S3_TRANSFER_CONFIG
+                    )
+                else:
+                    self.s3_client.put_object(
+                        Bucket=self.bucket_name,
+                        Key=s3_key,
+                        Body=body,
+                        **extra_args
+                    )
 
             self._execute_with_retry("upload_transcript", upload_op)
 
@@ -269,7 +335,11 @@ class S3Client:
 
         try:
             response = self.s3_client.get_object(Bucket=bucket, Key=key)
-            content = response['Body'].read().decode('utf-8')
+            body = response['Body'].read()
+            # boto3 does not undo Content-Encoding, so gzip-stored artefacts are decoded here
+            if response.get('ContentEncoding') == 'gzip':
+                body = gzip.decompress(body)
+            content = body.decode('utf-8')
             logger.info(f"[S3] Successfully read {len(content)} characters from {s3_url}")
             return content
         except ClientError as e:
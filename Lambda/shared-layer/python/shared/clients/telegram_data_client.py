@@ -3,19 +3,29 @@ Telegram Data Client for accessing Telegram content from S3
 """
 import json
 import os
-from typing import Dict, Any, Optional
-import boto3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, NamedTuple, Optional
+import orjson
 from botocore.exceptions import ClientError
 
+from shared.clients.s3_client import get_shared_s3_client
 from shared.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+
+class TelegramDataSummary(NamedTuple):
+    """Result of a single inspection pass over Telegram data"""
+    is_valid: bool
+    total_messages: int
+    structure: str
+
+
 class TelegramDataClient:
     """Client for retrieving Telegram data from S3"""
     
     def __init__(self):
-        self.s3_client = boto3.client('s3')
+        self.s3_client = get_shared_s3_client()
         self.bucket_name = os.environ.get('S3_BUCKET_NAME', 'podcasto-podcasts')
         
     def get_telegram_data(
@@ -49,16 +59,17 @@ class TelegramDataClient:
                 Key=s3_key
             )
             
-            # Read and parse JSON content
-            content = response['Body'].read().decode('utf-8')
-            telegram_data = json.loads(content)
+            # Read and parse JSON content (orjson parses UTF-8 bytes directly,
+            # avoiding a second full-size str copy of the payload)
+            content = response['Body'].read()
+            telegram_data = orjson.loads(content)
             
-            # Validate and log data structure
-            if self.validate_telegram_data(telegram_data):
-                message_count = self._count_messages(telegram_data)
+            # Validate, count and describe in a single pass over the payload
+            summary = self._inspect(telegram_data)
+            if summary.is_valid:
                 logger.info(f"[TELEGRAM_DATA] Successfully retrieved data for episode {episode_id}")
-                logger.info(f"[TELEGRAM_DATA] Data structure: {self._describe_structure(telegram_data)}")
-                logger.info(f"[TELEGRAM_DATA] Total messages: {message_count}")
+                logger.info(f"[TELEGRAM_DATA] Data structure: {summary.structure}")
+                logger.info(f"[TELEGRAM_DATA] Total messages: {summary.total_messages}")
             else:
                 logger.warning(f"[TELEGRAM_DATA] Retrieved data for episode {episode_id} but structure validation failed")
                 logger.warning(f"[TELEGRAM_DATA] Data keys: {list(telegram_data.keys()) if isinstance(telegram_data, dict) else type(telegram_data)}")
@@ -123,15 +134,34 @@ class TelegramDataClient:
         """
         Try alternative S3 paths for backward compatibility
         """
+        episode_prefix = f"podcasts/{podcast_id}/{episode_id}/"
         alternative_paths = [
-            f"podcasts/{podcast_id}/{episode_id}/telegram_data.json",
+            f"{episode_prefix}telegram_data.json",
             f"podcasts/{podcast_id}/telegram_data.json",
             f"telegram/{podcast_id}/{episode_id}.json",
             f"data/podcasts/{podcast_id}/{episode_id}/telegram.json",
             f"telegram_data/{podcast_id}_{episode_id}.json"
         ]
         
+        # One ListObjectsV2 call answers every candidate under the episode folder
+        exists: Dict[str, bool] = {}
+        listed_keys = self._list_keys(episode_prefix)
+        if listed_keys is not None:
+            for path in alternative_paths:
+                if path.startswith(episode_prefix):
+                    exists[path] = path in listed_keys
+        
+        # The episode-folder path has top priority, so a listing hit skips probing;
+        # otherwise probe the rest concurrently (one RTT instead of one per path)
+        to_probe = [path for path in alternative_paths if path not in exists]
+        if to_probe and not any(exists.values()):
+            with ThreadPoolExecutor(max_workers=len(to_probe)) as executor:
+                exists.update(zip(to_probe, executor.map(self._key_exists, to_probe)))
+        
+        # Fetch the highest-priority path that exists
         for path in alternative_paths:
+            if not exists.get(path):
+                continue
             try:
                 logger.info(f"[TELEGRAM_DATA] Trying alternative path: {path}")
                 
@@ -140,8 +170,8 @@ class TelegramDataClient:
                     Key=path
                 )
                 
-                content = response['Body'].read().decode('utf-8')
-                telegram_data = json.loads(content)
+                content = response['Body'].read()
+                telegram_data = orjson.loads(content)
                 
                 logger.info(f"[TELEGRAM_DATA] Found data at alternative path: {path}")
                 return telegram_data
@@ -156,6 +186,36 @@ class TelegramDataClient:
         logger.warning(f"[TELEGRAM_DATA] No Telegram data found for episode {episode_id}")
         return None
     
+    def _list_keys(self, prefix: str) -> Optional[set]:
+        """
+        List object keys directly under a prefix (sub-folders such as images/
+        are collapsed by the delimiter) with a single ListObjectsV2 call
+        
+        Returns:
+            Set of keys, or None if the listing failed (callers fall back to probing)
+        """
+        try:
+            response = self.s3_client.list_objects_v2(
+                Bucket=self.bucket_name,
+                Prefix=prefix,
+                Delimiter='/',
+                MaxKeys=100
+            )
+            return {obj['Key'] for obj in response.get('Contents', [])}
+        except ClientError as e:
+            logger.warning(f"[TELEGRAM_DATA] Could not list {prefix}: {e}")
+            return None
+    
+    def _key_exists(self, key: str) -> bool:
+        """Check whether an S3 key exists using a HEAD request"""
+        try:
+            self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('404', 'NoSuchKey', 'NotFound'):
+                logger.warning(f"[TELEGRAM_DATA] Error accessing {key}: {e}")
+            return False
+    
     def validate_telegram_data(self, data: Any) -> bool:
         """
         Validate that Telegram data has the expected structure
@@ -166,81 +226,66 @@ class TelegramDataClient:
         Returns:
             True if valid, False otherwise
         """
+        return self._inspect(data).is_valid
+    
+    def _inspect(self, data: Any) -> TelegramDataSummary:
+        """
+        Validate, count messages and describe the structure of Telegram data
+        in one traversal of its channels/arrays
+        
+        Args:
+            data: The Telegram data to inspect
+            
+        Returns:
+            TelegramDataSummary with validity, total message count and description
+        """
         if not isinstance(data, dict):
             logger.warning("[TELEGRAM_DATA] Data is not a dictionary")
-            return False
-        
-        # Check for different valid structures
-        has_results = 'results' in data
-        has_messages = 'messages' in data
+            return TelegramDataSummary(False, 0, f"unexpected type {type(data).__name__}")
         
-        if not has_results and not has_messages:
-            # Look for any array that might contain messages
-            for key, value in data.items():
-                if isinstance(value, list) and value and isinstance(value[0], dict):
-                    if any(field in value[0] for field in ['text', 'message', 'content']):
-                        logger.info(f"[TELEGRAM_DATA] Found messages in '{key}' field")
-                        return True
-            logger.warning("[TELEGRAM_DATA] No valid message structure found")
-            return False
-            
         # Validate results structure (channel-based)
-        if has_results:
+        if 'results' in data:
             results = data['results']
             if not isinstance(results, dict):
                 logger.warning("[TELEGRAM_DATA] 'results' is not a dictionary")
-                return False
-                
-            # Check that at least one channel has messages
+                return TelegramDataSummary(False, 0, "invalid 'results' field")
+            
+            channels = []
             total_messages = 0
             for channel, messages in results.items():
+                channels.append(channel)
                 if isinstance(messages, list):
                     total_messages += len(messages)
-                    
+            structure = f"channel-based ({len(channels)} channels: {channels})"
+            
+            # Check that at least one channel has messages
             if total_messages == 0:
                 logger.warning("[TELEGRAM_DATA] No messages found in any channel")
-                return False
+                return TelegramDataSummary(False, 0, structure)
             
-            logger.info(f"[TELEGRAM_DATA] Validated results structure: {len(results)} channels, {total_messages} total messages")
-            return True
-                    
+            logger.info(f"[TELEGRAM_DATA] Validated results structure: {len(channels)} channels, {total_messages} total messages")
+            return TelegramDataSummary(True, total_messages, structure)
+        
         # Validate direct messages structure
-        if has_messages:
+        if 'messages' in data:
             messages = data['messages']
             if isinstance(messages, list) and len(messages) > 0:
                 logger.info(f"[TELEGRAM_DATA] Validated direct messages structure: {len(messages)} messages")
-                return True
-            else:
-                logger.warning("[TELEGRAM_DATA] 'messages' field is empty or not a list")
-                return False
-                
-        return False
-    
-    def _count_messages(self, data: Dict[str, Any]) -> int:
-        """Count total messages in telegram data"""
-        total = 0
+                return TelegramDataSummary(True, len(messages), "direct messages array")
+            logger.warning("[TELEGRAM_DATA] 'messages' field is empty or not a list")
+            return TelegramDataSummary(False, 0, "direct messages array")
         
-        if 'results' in data:
-            for channel, messages in data['results'].items():
-                if isinstance(messages, list):
-                    total += len(messages)
-        elif 'messages' in data:
-            if isinstance(data['messages'], list):
-                total = len(data['messages'])
-        else:
-            # Count messages in any array field
-            for key, value in data.items():
-                if isinstance(value, list):
-                    total += len(value)
-                    
-        return total
-    
-    def _describe_structure(self, data: Dict[str, Any]) -> str:
-        """Describe the structure of telegram data"""
-        if 'results' in data:
-            channels = list(data['results'].keys())
-            return f"channel-based ({len(channels)} channels: {channels})"
-        elif 'messages' in data:
-            return "direct messages array"
-        else:
-            return f"custom structure with keys: {list(data.keys())}" 
\ No newline at end of file
+        # Look for any array that might contain messages
+        is_valid = False
+        total_messages = 0
+        for key, value in data.items():
+            if not isinstance(value, list):
+                continue
+            total_messages += len(value)
+            if not is_valid and value and isinstance(value[0], dict):
+                if any(field in value[0] for field in ['text', 'message', 'content']):
+                    logger.info(f"[TELEGRAM_DATA] Found messages in '{key}' field")
+                    is_valid = True
+        if not is_valid:
+            logger.warning("[TELEGRAM_DATA] No valid message structure found")
+        return TelegramDataSummary(is_valid, total_messages, f"custom structure with keys: {list(data.keys())}")
@@ -71,6 +71,7 @@ class EpisodeTracker:
         """
         try:
             now = now_utc()
+            now_iso = to_iso_utc(now)
             self._stage_start_times[f"{episode_id}:{stage}"] = now
 
             # Insert processing log
@@ -78,9 +79,9 @@ class EpisodeTracker:
                 'episode_id': episode_id,
                 'stage': stage.value,
                 'status': StageStatus.STARTED.value,
-                'started_at': to_iso_utc(now),
+                'started_at': now_iso,
                 'metadata': metadata or {},
-                'created_at': to_iso_utc(now)
+                'created_at': now_iso
             }
 
             result = self.supabase.client.table('episode_processing_logs').insert(log_entry).execute()
@@ -92,12 +93,12 @@ class EpisodeTracker:
             # Update episode current_stage and processing_started_at
             episode_update = {
                 'current_stage': stage.value,
-                'last_stage_update': to_iso_utc(now)
+                'last_stage_update': now_iso
             }
 
             # Set processing_started_at only on first stage
             if stage == ProcessingStage.TELEGRAM_QUEUED or stage == ProcessingStage.CREATED:
-                episode_update['processing_started_at'] = to_iso_utc(now)
+                episode_update['processing_started_at'] = now_iso
 
             self.supabase.client.table('episodes').update(episode_update).eq('id', episode_id).execute()
 
@@ -127,6 +128,7 @@ class EpisodeTracker:
         """
         try:
             now = now_utc()
+            now_iso = to_iso_utc(now)
 
             # Calculate duration if we have a start time
             start_key = f"{episode_id}:{stage}"
@@ -150,7 +152,7 @@ class EpisodeTracker:
                 log_id = existing_logs.data[0]['id']
                 update_data = {
                     'status': StageStatus.COMPLETED.value,
-                    'completed_at': to_iso_utc(now),
+                    'completed_at': now_iso,
                     'duration_ms': duration_ms
                 }
                 if metadata:
@@ -166,20 +168,20 @@ class EpisodeTracker:
                     'episode_id': episode_id,
                     'stage': stage.value,
                     'status': StageStatus.COMPLETED.value,
-                    'completed_at': to_iso_utc(now),
+                    'completed_at': now_iso,
                     'duration_ms': duration_ms,
                     'metadata': metadata or {},
-                    'created_at': to_iso_utc(now)
+                    'created_at': now_iso
                 }
                 self.supabase.client.table('episode_processing_logs').insert(log_entry).execute()
 
             # Add to stage_history
-            self._add_to_stage_history(episode_id, stage.value, StageStatus.COMPLETED.value, duration_ms)
+            self._add_to_stage_history(episode_id, stage.value, StageStatus.COMPLETED.value, duration_ms, now_iso)
 
             # Update episode
             episode_update = {
                 'current_stage': stage.value,
-                'last_stage_update': to_iso_utc(now)
+                'last_stage_update': now_iso
             }
             self.supabase.client.table('episodes').update(episode_update).eq('id', episode_id).execute()
 
@@ -211,6 +213,7 @@ class EpisodeTracker:
         """
         try:
             now = now_utc()
+            now_iso = to_iso_utc(now)
 
             # Calculate duration if we have a start time
             start_key = f"{episode_id}:{stage}"
@@ -243,7 +246,7 @@ class EpisodeTracker:
                         'status': StageStatus.FAILED.value,
                         'error_message': error_message,
                         'error_details': details,
-                        'completed_at': to_iso_utc(now),
+                        'completed_at': now_iso,
                         'duration_ms': duration_ms
                     })\
                     .eq('id', log_id)\
@@ -256,14 +259,14 @@ class EpisodeTracker:
                     'status': StageStatus.FAILED.value,
                     'error_message': error_message,
                     'error_details': details,
-                    'completed_at': to_iso_utc(now),
+                    'completed_at': now_iso,
                     'duration_ms': duration_ms,
-                    'created_at': to_iso_utc(now)
+                    'created_at': now_iso
                 }
                 self.supabase.client.table('episode_processing_logs').insert(log_entry).execute()
 
             # Add to stage_history
-            self._add_to_stage_history(episode_id, stage.value, StageStatus.FAILED.value, duration_ms)
+            self._add_to_stage_history(episode_id, stage.value, StageStatus.FAILED.value, duration_ms, now_iso)
 
             # Determine failed stage variant (telegram_failed, script_failed, audio_failed)
             failed_stage = self._get_failed_stage_variant(stage)
@@ -272,7 +275,7 @@ class EpisodeTracker:
             episode_update = {
                 'status': 'failed',
                 'current_stage': failed_stage,
-                'last_stage_update': now.isoformat()
+                'last_stage_update': now_iso
             }
             self.supabase.client.table('episodes').update(episode_update).eq('id', episode_id).execute()
 
@@ -288,9 +291,10 @@ class EpisodeTracker:
         episode_id: str,
         stage: str,
         status: str,
-        duration_ms: Optional[int] = None
+        duration_ms: Optional[int] = None,
+        timestamp: Optional[str] = None
     ) -> None:
-        """Add an entry to episode's stage_history array"""
+        """Add an entry to episode's stage_history array (timestamp: ISO UTC, defaults to now)"""
         try:
             # Fetch current stage_history
             episode = self.supabase.client.table('episodes')\
@@ -307,7 +311,7 @@ class EpisodeTracker:
             history_entry = {
                 'stage': stage,
                 'status': status,
-                'timestamp': to_iso_utc(now_utc())
+                'timestamp': timestamp or to_iso_utc(now_utc())
             }
             if duration_ms is not None:
                 history_entry['duration_ms'] = duration_ms
@@ -32,6 +32,20 @@ SHIN_YEMANIT = '\u05c1'
 SHIN_SMALIT = '\u05c2'
 DAGESH = '\u05bc'
 
+# Static parts of every Dicta request (built once, shared across calls)
+DICTA_HEADERS = {
+    'content-type': 'text/plain;charset=UTF-8'
+}
+DICTA_OPTIONS = {
+    "task": "nakdan",
+    "genre": "modern",
+    "addmorph": True,
+    "keepqq": False,
+    "nodageshdefmem": False,
+    "patachma": False,
+    "keepmetagim": True,
+}
+
 
 class HebrewNiqqudProcessor:
     """Hebrew text processor for adding niqqud (diacritical marks)"""
@@ -109,8 +123,8 @@ class HebrewNiqqudProcessor:
     def _get_from_cache(self, text: str) -> Optional[str]:
         """Get result from cache if valid"""
         cache_key = self._get_cache_key(text)
-        if cache_key in self._cache:
-            entry = self._cache[cache_key]
+        entry = self._cache.get(cache_key)
+        if entry is not None:
             if self._is_cache_valid(entry):
                 logger.info(f"[NIQQUD] Cache hit for text: {len(text)} characters")
                 return entry['result']
@@ -135,23 +149,11 @@ class HebrewNiqqudProcessor:
         if cached_result is not None:
             return cached_result
         
-        payload = {
-            "task": "nakdan",
-            "genre": "modern",
-            "data": text,
-            "addmorph": True,
-            "keepqq": False,
-            "nodageshdefmem": False,
-            "patachma": False,
-            "keepmetagim": True,
-        }
-        headers = {
-            'content-type': 'text/plain;charset=UTF-8'
-        }
+        payload = {**DICTA_OPTIONS, "data": text}
         
         try:
             logger.info(f"[NIQQUD] Calling Dicta API for text: {len(text)} characters")
-            response = requests.post(self.dicta_url, json=payload, headers=headers, timeout=30)
+            response = requests.post(self.dicta_url, json=payload, headers=DICTA_HEADERS, timeout=30)
             response.raise_for_status()
             
             result = ''.join(self.extract_word(word) for word in response.json())
@@ -8,6 +8,7 @@ to ensure consistency with the Next.js application and database.
 Golden Rule: Store UTC, Display Local, Process UTC
 """
 
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Tuple
 import pytz
@@ -24,6 +25,18 @@ def now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def utc_file_timestamp() -> str:
+    """
+    Get current UTC time as a compact timestamp for file/folder names
+
+    Formats straight from time.gmtime() without building a datetime object.
+
+    Returns:
+        str: Timestamp string (e.g., "20240115_143000")
+    """
+    return time.strftime('%Y%m%d_%H%M%S', time.gmtime())
+
+
 def to_iso_utc(dt: datetime) -> str:
     """
     Convert datetime to ISO format string in UTC
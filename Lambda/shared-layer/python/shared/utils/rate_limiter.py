@@ -25,6 +25,10 @@ def parse_retry_delay(error_message: str, default_delay: int = _DEFAULT_DELAY_SE
     need to scrape the value out. When the value cannot be extracted we fall back
     to *default_delay* (60 seconds by default).
     """
+    # Most errors carry no retry info: a C-level substring check skips the regex
+    # (lowercased because the pattern is case-insensitive)
+    if "retrydelay" not in error_message.lower():
+        return default_delay
     match = _RETRY_DELAY_PATTERN.search(error_message)
     return int(match.group(1)) if match else default_delay
 
@@ -38,11 +42,14 @@ class TokenBucketRateLimiter:
     This is *blocking* – the caller will wait until a token is available.
     """
 
+    # Shortest wait between refill checks while the bucket is exactly empty
+    _MIN_WAIT_SECONDS = 0.001
+
     def __init__(self, max_tokens: int, refill_period: int):
         self._capacity = max_tokens
         self._tokens = max_tokens
         self._refill_period = refill_period  # seconds
-        self._lock = threading.Lock()
+        self._cv = threading.Condition(threading.Lock())
         self._last_refill = time.monotonic()
 
     def _refill(self) -> None:
@@ -52,6 +59,8 @@ class TokenBucketRateLimiter:
 
         For 9 tokens per 60 seconds: adds 1 token every 6.67 seconds
         This prevents burst traffic and better matches Google's rate limiting behavior.
+
+        Caller must hold ``self._cv``.
         """
         now = time.monotonic()
         elapsed = now - self._last_refill
@@ -59,22 +68,23 @@ class TokenBucketRateLimiter:
         # Continuous refill: add tokens proportionally to elapsed time
         # This prevents burst traffic by distributing tokens evenly over time
         if elapsed > 0:
-            with self._lock:
-                # Calculate tokens to add: (elapsed_seconds / refill_period) * capacity
-                # Example: For 9 tokens/60s, after 6.67s we add ~1 token
-                tokens_to_add = (elapsed / self._refill_period) * self._capacity
+            # Calculate tokens to add: (elapsed_seconds / refill_period) * capacity
+            # Example: For 9 tokens/60s, after 6.67s we add ~1 token
+            tokens_to_add = (elapsed / self._refill_period) * self._capacity
 
-                # Add tokens but don't exceed capacity (prevent token accumulation)
-                self._tokens = min(self._capacity, self._tokens + tokens_to_add)
-                self._last_refill = now
+            # Add tokens but don't exceed capacity (prevent token accumulation)
+            self._tokens = min(self._capacity, self._tokens + tokens_to_add)
+            self._last_refill = now
 
     def acquire(self) -> None:
         """Block until a token is available."""
-        while True:
-            self._refill()
-            with self._lock:
+        with self._cv:
+            while True:
+                self._refill()
                 if self._tokens > 0:
                     self._tokens -= 1
                     return
-            # No tokens available – sleep a bit to avoid busy-waiting.
-            time.sleep(0.1) 
\ No newline at end of file
+                # No tokens available – wait (lock released) exactly until the
+                # continuous refill brings the bucket back above zero.
+                wait = -self._tokens * self._refill_period / self._capacity
+                self._cv.wait(timeout=max(wait, self._MIN_WAIT_SECONDS)) 
\ No newline at end of file
@@ -12,7 +12,7 @@ from src.message_processor import MessageProcessor
 from src.media_handler import MediaHandler
 from src.clients.telegram_client import TelegramClientWrapper
 from shared.clients.s3_client import S3Client
-from shared.utils.datetime_utils import now_utc
+from shared.utils.datetime_utils import utc_file_timestamp
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -26,16 +26,17 @@ class ChannelProcessor:
     for a Telegram channel.
     """
     
-    def __init__(self, config: PodcastConfig):
+    def __init__(self, config: PodcastConfig, s3_client: Optional[S3Client] = None):
         """
         Initialize the ChannelProcessor.
         
         Args:
             config: The podcast configuration
+            s3_client: Optional S3 client to reuse (created if not provided)
         """
         self.config = config
         self.message_processor = MessageProcessor(filtered_domains=config.filtered_domains)
-        self.s3_client = S3Client()
+        self.s3_client = s3_client or S3Client()
         self.media_handler = MediaHandler(self.s3_client)
         self.is_local = False  # Will be set in process()
         self.media_dir = "/tmp/media"
@@ -98,7 +99,7 @@ class ChannelProcessor:
                 return self._create_empty_result()
             
             # Create timestamp for consistent folder structure
-            timestamp = now_utc().strftime("%Y%m%d_%H%M%S")
+            timestamp = utc_file_timestamp()
             
             # Use the episode ID from config if available, otherwise generate a new one
             # This is crucial for ensuring the episode ID is consistent throughout the pipeline
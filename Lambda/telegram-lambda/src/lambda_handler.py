@@ -12,11 +12,32 @@ from src.channel_processor import ChannelProcessor
 from src.result_formatter import ResultFormatter
 from src.clients.sqs_client import SQSClient
 from shared.clients.supabase_client import SupabaseClient
+from shared.clients.s3_client import S3Client
 from src.utils.logging import get_logger, log_event, log_error
 from shared.services.episode_tracker import EpisodeTracker, ProcessingStage
 
 logger = get_logger(__name__)
 
+# Clients reused across warm invocations (Lambda container reuse)
+_clients: Dict[str, Any] = {}
+
+
+def _get_clients() -> Dict[str, Any]:
+    """
+    Lazily create the AWS/Supabase clients once per container.
+
+    Keeps boto3 and Supabase HTTP connection pools warm between invocations
+    instead of rebuilding them (and redoing TLS handshakes) on every request.
+    """
+    if not _clients:
+        supabase_client = SupabaseClient()
+        _clients['sqs'] = SQSClient()
+        _clients['s3'] = S3Client()
+        _clients['supabase'] = supabase_client
+        _clients['tracker'] = EpisodeTracker(supabase_client)
+    return _clients
+
+
 def _get_podcast_format_from_db(db_config: Dict[str, Any]) -> str:
     """
     Fallback: Gets the podcast format from database config.
@@ -44,10 +65,11 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         log_event(logger, event)
         logger.info("Starting Telegram collector Lambda function")
         
-        # Initialize clients
-        sqs_client = SQSClient()
-        supabase_client = SupabaseClient()
-        tracker = EpisodeTracker(supabase_client)
+        # Reuse clients from previous warm invocations
+        clients = _get_clients()
+        sqs_client = clients['sqs']
+        supabase_client = clients['supabase']
+        tracker = clients['tracker']
 
         # Parse configuration from event
         config_manager = ConfigManager(event)
@@ -76,7 +98,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     )
 
                 # Create channel processor
-                processor = ChannelProcessor(config)
+                processor = ChannelProcessor(config, s3_client=clients['s3'])
 
                 # Process channels
                 loop = asyncio.get_event_loop()
@@ -13,6 +13,16 @@ from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Directories already created in this container (survives warm invocations)
+_ensured_dirs: set = set()
+
+
+def _ensure_dir(path: str) -> None:
+    """Create a directory once per container, skipping the syscall on repeat calls."""
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
 
 class MediaHandler:
     """
@@ -42,7 +52,7 @@ class MediaHandler:
         self.download_semaphore = asyncio.Semaphore(5)
         
         # Create media directory if it doesn't exist
-        os.makedirs(self.media_dir, exist_ok=True)
+        _ensure_dir(self.media_dir)
     
     def set_context(self, podcast_id: str, episode_id: str, media_types: List[str] = None):
         """
@@ -60,7 +70,7 @@ class MediaHandler:
         
         # Create podcast-specific media directory using consistent folder structure
         self.podcast_media_dir = os.path.join(self.media_dir, "podcasts", podcast_id, episode_id)
-        os.makedirs(self.podcast_media_dir, exist_ok=True)
+        _ensure_dir(self.podcast_media_dir)
         
         logger.info(f"Media handler context set: podcast_id={podcast_id}, episode_id={episode_id}, media_types={self.media_types}")
     
@@ -4,6 +4,7 @@ Logging utilities for the Telegram collector Lambda function.
 import logging
 import json
 import os
+from functools import lru_cache
 from typing import Dict, Any, Optional
 
 # Configure logging
@@ -46,6 +47,13 @@ def get_logger(name: str) -> logging.Logger:
     return logger
 
 
+@lru_cache(maxsize=256)
+def _is_sensitive_key(key: str) -> bool:
+    """Check (and memoize) whether a key name matches one of the sensitive keys."""
+    lowered = key.lower()
+    return any(sensitive_key in lowered for sensitive_key in SENSITIVE_KEYS)
+
+
 def mask_sensitive_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Mask sensitive data in a dictionary.
@@ -63,7 +71,7 @@ def mask_sensitive_data(data: Dict[str, Any]) -> Dict[str, Any]:
     for key, value in data.items():
         if isinstance(value, dict):
             masked_data[key] = mask_sensitive_data(value)
-        elif isinstance(key, str) and any(sensitive_key in key.lower() for sensitive_key in SENSITIVE_KEYS):
+        elif isinstance(key, str) and _is_sensitive_key(key):
             masked_data[key] = '***MASKED***'
         else:
             masked_data[key] = value
@@ -80,11 +88,15 @@ def log_event(logger: logging.Logger, event: Dict[str, Any], level: str = 'info'
         event: The event to log
         level: The log level to use
     """
+    # Skip masking and serialization entirely when the level is filtered out
+    if not logger.isEnabledFor(getattr(logging, level.upper(), logging.INFO)):
+        return
+    
     masked_event = mask_sensitive_data(event)
     log_message = json.dumps(masked_event, indent=2)
     
     log_method = getattr(logger, level.lower(), logger.info)
-    log_method(f"Event: {log_message}")
+    log_method("Event: %s", log_message)
 
 
 def log_error(logger: logging.Logger, error: Exception, context: Optional[Dict[str, Any]] = None) -> None: